@@ -1,9 +1,5 @@
 from __future__ import annotations
 
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
-
 from systems_th import Network
 from systems_th.components import Pipe, CoreChannel, OrificePlate, Separator, Turbine, Condenser, Pump, Heater, Mixer
 from systems_th.solver import SolveOptions
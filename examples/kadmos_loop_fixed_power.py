@@ -52,11 +52,6 @@ Fixed quantities
 
 from __future__ import annotations
 
-import math
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
-
 from systems_th import Network
 from systems_th.components import (
     Pipe, CoreChannel, OrificePlate, Separator,
@@ -64,6 +59,13 @@ from systems_th.components import (
 )
 from systems_th.solver import SolveOptions
 
+# Orifice plate: N_HOLES holes of D_HOLE; open area N_HOLES * pi * D_HOLE**2 / 4 [m²]
+N_HOLES = 50
+D_HOLE = 0.04
+A_HOLES = 0.06283185307179587
+# Core exit to orifice plate: 3 ft [m]
+RISER_LENGTH = 0.9144
+
 
 def main():
     # -------------------------------------------------------------------------
@@ -77,10 +79,8 @@ def main():
     # -------------------------------------------------------------------------
     # Orifice / mixing-plate geometry
     # -------------------------------------------------------------------------
-    n_holes  = 50
-    D_hole   = 0.04                                   # hole diameter [m]
     Cd_plate = 0.61                                   # discharge coefficient (sharp-edged)
-    A_holes  = n_holes * math.pi * D_hole**2 / 4.0   # total open area [m²]
+    A_holes  = A_HOLES                                # total open area [m²]
 
     # -------------------------------------------------------------------------
     # Mass-flow guesses
@@ -129,7 +129,7 @@ def main():
     # Short riser from core exit to orifice plate: 3 ft vertically
     post_core = Pipe(
         "PostCorePipe",
-        L=3 * 0.3048, D=1.2, eps=1e-5, K=0.0, dz=3 * 0.3048,
+        L=RISER_LENGTH, D=1.2, eps=1e-5, K=0.0, dz=RISER_LENGTH,
         two_phase_friction="homogeneous",
         include_acceleration=True,
     )
@@ -260,7 +260,7 @@ def main():
     print(nw.summary())
     print(f"\nPrescribed core power     : {Q_core:.3e} W")
     print(f"Prescribed core inlet flow: {m_core:.1f} kg/s")
-    print(f"Mixing plate              : {n_holes} holes × ø{D_hole*1e3:.1f} mm"
+    print(f"Mixing plate              : {N_HOLES} holes × ø{D_HOLE*1e3:.1f} mm"
           f"  (Cd={Cd_plate}, A_open={A_holes*1e4:.2f} cm²)")
     print("\nSolving...\n")
 
@@ -0,0 +1,42 @@
+"""Optional Numba support.
+
+``njit`` compiles the decorated function with :func:`numba.njit` when Numba is installed
+and is a transparent no-op otherwise, so kernels always have a pure-Python fallback.
+Kernels must therefore stick to the Numba-compatible subset (scalars, NumPy arrays, math).
+
+Kernels are declared with explicit signatures and ``cache=True``: they are compiled at
+import rather than on first call, and the machine code is written to ``__pycache__``
+(or ``NUMBA_CACHE_DIR``), so later imports load it in milliseconds.
+:mod:`systems_th._precompile` imports and exercises all of them to fill that cache.
+
+Set ``SYSTEMS_TH_JIT=0`` to skip Numba even when it is installed (short scripts that
+would not amortize a cold compile, or debugging the Python fallback).
+"""
+
+from __future__ import annotations
+
+import os
+
+JIT_ENABLED = os.environ.get("SYSTEMS_TH_JIT", "1") != "0"
+
+_numba_njit = None
+HAVE_NUMBA = False
+if JIT_ENABLED:
+    try:
+        from numba import njit as _numba_njit  # type: ignore
+        HAVE_NUMBA = True
+    except ImportError:  # pragma: no cover - depends on environment
+        pass
+
+
+def njit(*args, **kwargs):
+    """Drop-in for ``numba.njit`` usable with or without arguments."""
+    if HAVE_NUMBA:
+        return _numba_njit(*args, **kwargs)
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+
+    def decorator(func):
+        return func
+
+    return decorator
@@ -0,0 +1,113 @@
+"""Warm the Numba on-disk cache for all compiled kernels.
+
+Run once after installing (``systems-th-precompile`` or ``python -m systems_th._precompile``)
+so that no solve pays the compilation latency. Without Numba this only checks that the
+kernels import.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from ._jit import HAVE_NUMBA
+
+
+def _kernels() -> List[Tuple[str, Callable, tuple]]:
+    """``(name, kernel, dummy arguments)`` for every compiled kernel."""
+    from .components.area_change import _area_change_residuals
+    from .components.condenser import _condenser_residuals
+    from .components.orifice import _orifice_residuals
+    from .components.pipe import _pipe_dp, _pipe_dp_grad, _pipe_residuals
+    from .correlations.friction import (
+        haaland_friction_factor,
+        haaland_friction_factor_rough,
+        haaland_friction_factor_rough_grad,
+        haaland_roughness,
+    )
+    from .correlations.heat_transfer import _htc_dittus_boelter
+    from .correlations.pressure_drop import (
+        _chisholm_C,
+        _dp_acceleration_same_area,
+        _dp_form_loss,
+        _dp_friction_chisholm_core,
+        _dp_friction_form_homogeneous,
+        _dp_friction_homogeneous,
+        _dp_gravity,
+        _phi_l2_chisholm,
+    )
+    from .props._if97 import (
+        T_ph_liquid,
+        T_ph_vapour,
+        T_sat_p_if97,
+        is_valid_ph,
+        sat_h_l_v_if97,
+        thermo_ph_liquid,
+        thermo_ph_vapour,
+    )
+    from .props.saturation import SAT_FIELDS, sat_lookup
+
+    # (D, Haaland roughness, L/D, K, 1/A, g*dz) and (rho, mu, rho_in, rho_out, dp_fric, homogeneous)
+    consts = (0.02, 1e-4, 50.0, 0.5, 3000.0, 9.81)
+    props = (900.0, 1e-4, 900.0, 880.0, 0.0, True)
+    res = np.zeros(4)
+    basis = np.zeros(4)
+    return [
+        ("haaland_roughness", haaland_roughness, (1e-4,)),
+        ("haaland_friction_factor_rough", haaland_friction_factor_rough, (1e5, 1e-5)),
+        ("haaland_friction_factor_rough_grad", haaland_friction_factor_rough_grad, (1e5, 1e-5)),
+        ("haaland_friction_factor", haaland_friction_factor, (1e5, 1e-4)),
+        ("_htc_dittus_boelter", _htc_dittus_boelter, (1000.0, 0.02, 1e-4, 4200.0, 0.6, 0.4)),
+        ("_dp_form_loss", _dp_form_loss, (5e5, 1.0 / 900.0, 1.0)),
+        ("_dp_gravity", _dp_gravity, (900.0, 1.0)),
+        ("_dp_acceleration_same_area", _dp_acceleration_same_area, (5e5, 1.0 / 900.0, 1.0 / 800.0)),
+        ("_dp_friction_homogeneous", _dp_friction_homogeneous, (1000.0, 5e5, 1.0 / 900.0, 1e-4, 10.0, 0.1, 1e-4)),
+        ("_dp_friction_form_homogeneous", _dp_friction_form_homogeneous,
+         (1000.0, 5e5, 1.0 / 900.0, 1e-4, 10.0, 0.1, 1e-4, 1.0)),
+        ("_chisholm_C", _chisholm_C, (1e5, 1e4)),
+        ("_phi_l2_chisholm", _phi_l2_chisholm, (0.1, 740.0, 36.0, 9e-5, 1.9e-5, 1e5, 1e4)),
+        ("_dp_friction_chisholm_core", _dp_friction_chisholm_core,
+         (10.0, 0.1, 740.0, 36.0, 9e-5, 1.9e-5, 10.0, 0.1, 1e-4, 0.01)),
+        ("_pipe_dp", _pipe_dp, (1.0,) + props + consts),
+        ("_pipe_dp_grad", _pipe_dp_grad, (1.0,) + props[:4] + consts),
+        ("_pipe_residuals", _pipe_residuals, (1.0, 1.0, 7e6, 1e6, 6.9e6, 1e6, 0.0) + props + consts + (res, basis)),
+        ("_orifice_residuals", _orifice_residuals, (1.0, 7e6, 1e6, 900.0, 1.0, 6.9e6, 1e6, 10.0, 0.0, res, basis)),
+        ("_area_change_residuals", _area_change_residuals,
+         (1.0, 7e6, 1e6, 1.0, 6.9e6, 1e6, 900.0, 900.0, 1.0, 0.5, 0.5, 0.0, res, basis)),
+        ("_condenser_residuals", _condenser_residuals, (1.0, 1.0, 7e6, 1e6, 7e6, 1e6, res, basis)),
+        ("T_sat_p_if97", T_sat_p_if97, (7e6,)),
+        ("sat_h_l_v_if97", sat_h_l_v_if97, (7e6,)),
+        ("is_valid_ph", is_valid_ph, (7e6, 1.2e6)),
+        ("T_ph_liquid", T_ph_liquid, (7e6, 1.2e6)),
+        ("T_ph_vapour", T_ph_vapour, (7e6, 2.9e6)),
+        ("thermo_ph_liquid", thermo_ph_liquid, (7e6, 1.2e6)),
+        ("thermo_ph_vapour", thermo_ph_vapour, (7e6, 2.9e6)),
+        ("sat_lookup", sat_lookup, (np.array([1e5, 1e6]), np.ones((len(SAT_FIELDS), 2)), 5e5, np.zeros(len(SAT_FIELDS)))),
+    ]
+
+
+def precompile() -> Dict[str, float]:
+    """Import and call every kernel once; return the seconds spent per kernel.
+
+    Importing compiles (or loads from cache) the eagerly typed kernels; the dummy calls
+    check that each loaded kernel actually runs.
+    """
+    timings: Dict[str, float] = {}
+    for name, kernel, args in _kernels():
+        t0 = time.perf_counter()
+        kernel(*args)
+        timings[name] = time.perf_counter() - t0
+    return timings
+
+
+def main() -> None:
+    timings = precompile()
+    print(f"numba: {'yes' if HAVE_NUMBA else 'no (pure-Python kernels)'}")
+    for name, dt in timings.items():
+        print(f"  {name:30s} {dt * 1e3:9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
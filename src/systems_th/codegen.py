@@ -0,0 +1,80 @@
+"""Fuse all component residuals into one generated function.
+
+At ``Network.prepare`` time every component is asked for Python source via
+``Component._residual_source(bind)``; the blocks are concatenated into a single
+``_F(props, r, b)`` that writes the whole unscaled residual vector and its scale bases.
+Parameters and precomputed constants are baked in as literals, and Variables bound to the network
+state array are read from one ``x = X.tolist()`` gather at the top of the function
+(other objects are bound as globals), so an evaluation is one call without
+per-component dispatch or attribute lookups.
+Components returning None are called through their ``write_residuals``.
+
+Property calls stay Python-level (IAPWS97 is not Numba-compilable), so the generated
+function is not JIT-compiled.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from .components.base import Component
+from .variable import Variable
+
+
+class _Binder:
+    """Assign stable global names to objects referenced by generated code."""
+
+    def __init__(self, state: Optional[np.ndarray] = None):
+        self.namespace: Dict[str, Any] = {}
+        self._names: Dict[int, str] = {}
+        self.state = state
+
+    def __call__(self, obj: Any, prefix: str = "o") -> str:
+        key = id(obj)
+        if key not in self._names:
+            name = f"{prefix}{len(self._names)}"
+            self._names[key] = name
+            self.namespace[name] = obj
+        return self._names[key]
+
+    def value(self, var: Variable) -> str:
+        """Expression for the current value of ``var``."""
+        if self.state is not None and var._store is self.state:
+            return f"x[{var.idx}]"
+        return f"{self(var, 'v')}.value"
+
+
+def residual_source(
+    components: List[Component], state: Optional[np.ndarray] = None
+) -> tuple[str, Dict[str, Any]]:
+    """Source of the fused residual function and the namespace it needs.
+
+    ``state`` is the network state array the Variables are bound to (if any).
+    """
+    bind = _Binder(state)
+    lines = ["def _F(props, r, b):", "    rho_ph = props.rho_ph"]
+    if state is not None:
+        bind.namespace["X"] = state
+        lines.append("    x = X.tolist()")
+    for comp in components:
+        lines.append(f"    # {type(comp).__name__} {comp.name!r}")
+        block = comp._residual_source(bind)
+        if block is None:
+            w = bind(comp.write_residuals, "w")
+            s = bind(comp._res, "r")
+            sb = bind(comp._basis, "b")
+            lines.append(f"    {w}(props, {s}, {sb})")
+        else:
+            lines.extend("    " + line for line in block)
+    lines.append("")
+    return "\n".join(lines), bind.namespace
+
+
+def compile_residuals(
+    components: List[Component], state: Optional[np.ndarray] = None
+) -> Callable[[Any, np.ndarray, np.ndarray], None]:
+    src, namespace = residual_source(components, state)
+    exec(compile(src, "<systems_th fused residuals>", "exec"), namespace)
+    return namespace["_F"]
@@ -1,7 +1,7 @@
 from .base import Component
 from .boundary import Source, Sink
 from .pipe import Pipe
-from .core import CoreChannel
+from .core import CoreChannel, CoreChannelArray
 from .orifice import OrificePlate
 from .separator import Separator
 from .turbine import Turbine
@@ -17,6 +17,7 @@ __all__ = [
     "Sink",
     "Pipe",
     "CoreChannel",
+    "CoreChannelArray",
     "OrificePlate",
     "Separator",
     "Turbine",
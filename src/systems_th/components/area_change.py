@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import Tuple
+
+import numpy as np
 
 from .base import Component
-from ..equation import Equation
+from .._jit import njit
+from ..props.derivatives import rho_ph_partials
 
 
-@dataclass
+@dataclass(slots=True)
 class AreaChange(Component):
     """Sudden area change (expansion/contraction), isenthalpic.
 
@@ -44,11 +47,32 @@ class AreaChange(Component):
     K: float = 0.0
     dz: float = 0.0
 
-    def equations(self, props) -> List[Equation]:
+    # Constants derived in _precompute. Disabled terms get zero coefficients so the
+    # residual is branch-free: dp_total = m^2*(form/rho_in + acc_out/rho_out - acc_in/rho_in)
+    # + rho_in*g*dz
+    _form_coef: float = field(default=0.0, init=False, repr=False, compare=False)
+    _acc_in: float = field(default=0.0, init=False, repr=False, compare=False)
+    _acc_out: float = field(default=0.0, init=False, repr=False, compare=False)
+    _g_dz: float = field(default=0.0, init=False, repr=False, compare=False)
+
+    def _precompute(self) -> None:
+        inv_A_in_sq = 1.0 / (self.A_in * self.A_in) if self.A_in > 0 else 0.0
+        acc_ok = self.A_in > 0 and self.A_out > 0
+        self._form_coef = 0.5 * self.K * inv_A_in_sq
+        self._acc_in = inv_A_in_sq if acc_ok else 0.0
+        self._acc_out = 1.0 / (self.A_out * self.A_out) if acc_ok else 0.0
+        self._g_dz = 9.80665 * self.dz
+
+    def _equation_names(self) -> Tuple[str, ...]:
+        return ("mass", "h_isenthalpic", "dp")
+
+    def residual_floors(self) -> Tuple[float, ...]:
+        return (1.0, 1e5, 1e5)
+
+    def write_residuals(self, props, res: np.ndarray, basis: np.ndarray) -> None:
         inc = self._req_in("in")
         out = self._req_out("out")
 
-        m = inc.m.value
         p_in = inc.p.value
         h_in = inc.h.value
         p_out = out.p.value
@@ -57,25 +81,76 @@ class AreaChange(Component):
         rho_in = props.rho_ph(p_in, h_in)
         rho_out = props.rho_ph(p_out, h_out)
 
-        # Form loss (use inlet velocity head)
-        if self.A_in <= 0 or rho_in <= 0:
-            dp_form = 0.0
-        else:
-            G_in = m / self.A_in
-            dp_form = self.K * (G_in ** 2) / (2.0 * rho_in)
-
-        # Acceleration term with area change
-        if rho_in <= 0 or rho_out <= 0 or self.A_in <= 0 or self.A_out <= 0:
-            dp_acc = 0.0
-        else:
-            dp_acc = (m ** 2) * (1.0 / (rho_out * self.A_out ** 2) - 1.0 / (rho_in * self.A_in ** 2))
+        _area_change_residuals(
+            inc.m.value, p_in, h_in, out.m.value, p_out, h_out, rho_in, rho_out,
+            self._form_coef, self._acc_in, self._acc_out, self._g_dz, res, basis,
+        )
 
-        dp_grav = rho_in * 9.80665 * self.dz  # use inlet density for gravity term
-
-        dp_total = dp_form + dp_acc + dp_grav
+    def _residual_source(self, bind):
+        inc = self._req_in("in")
+        out = self._req_out("out")
+        o = self._offset
+        return [
+            f"m = {bind.value(inc.m)}",
+            f"p_in = {bind.value(inc.p)}",
+            f"h_in = {bind.value(inc.h)}",
+            f"p_out = {bind.value(out.p)}",
+            f"h_out = {bind.value(out.h)}",
+            "rho_in = rho_ph(p_in, h_in)",
+            "rho_out = rho_ph(p_out, h_out)",
+            f"dp_total = m * m * ({self._form_coef!r} / rho_in + {self._acc_out!r} / rho_out"
+            f" - {self._acc_in!r} / rho_in) + rho_in * {self._g_dz!r}",
+            f"r[{o}] = {bind.value(out.m)} - m",
+            f"r[{o + 1}] = h_out - h_in",
+            f"r[{o + 2}] = (p_in - p_out) - dp_total",
+            f"b[{o}] = m",
+            f"b[{o + 1}] = h_in",
+            f"b[{o + 2}] = p_in",
+        ]
+
+    def jacobian_entries(self, props):
+        inc = self._req_in("in")
+        out = self._req_out("out")
 
-        eqs: List[Equation] = []
-        eqs.append(Equation(f"{self.name}.mass", out.m.value - m, scale=max(1.0, abs(m))))
-        eqs.append(Equation(f"{self.name}.h_isenthalpic", out.h.value - h_in, scale=max(1e5, abs(h_in))))
-        eqs.append(Equation(f"{self.name}.dp", (p_in - p_out) - dp_total, scale=max(1e5, abs(p_in))))
-        return eqs
+        m = inc.m.value
+        p_in = inc.p.value
+        h_in = inc.h.value
+        rho_in, drhoi_dp, drhoi_dh = rho_ph_partials(props, p_in, h_in)
+        rho_out, drhoo_dp, drhoo_dh = rho_ph_partials(props, out.p.value, out.h.value)
+
+        # d(dp_total)/d(m, rho_in, rho_out)
+        c_in = self._form_coef - self._acc_in
+        d_m = 2.0 * m * (c_in / rho_in + self._acc_out / rho_out)
+        d_rhoi = -m * m * c_in / rho_in**2 + self._g_dz
+        d_rhoo = -m * m * self._acc_out / rho_out**2
+
+        m_scale = max(1.0, abs(m))
+        h_scale = max(1e5, abs(h_in))
+        p_scale = max(1e5, abs(p_in))
+        return [
+            (0, out.m, 1.0 / m_scale),
+            (0, inc.m, -1.0 / m_scale),
+            (1, out.h, 1.0 / h_scale),
+            (1, inc.h, -1.0 / h_scale),
+            (2, inc.m, -d_m / p_scale),
+            (2, inc.p, (1.0 - d_rhoi * drhoi_dp) / p_scale),
+            (2, inc.h, -d_rhoi * drhoi_dh / p_scale),
+            (2, out.p, (-1.0 - d_rhoo * drhoo_dp) / p_scale),
+            (2, out.h, -d_rhoo * drhoo_dh / p_scale),
+        ]
+
+
+@njit("void(f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8[:], f8[:])", cache=True)
+def _area_change_residuals(
+    m, p_in, h_in, m_out, p_out, h_out, rho_in, rho_out, form_coef, acc_in, acc_out, g_dz, res, basis,
+):
+    # Form loss on the inlet velocity head, K*G_in^2/(2*rho_in), plus the acceleration
+    # term m^2*(1/(rho_out*A_out^2) - 1/(rho_in*A_in^2)) and inlet-density gravity
+    dp_total = m * m * (form_coef / rho_in + acc_out / rho_out - acc_in / rho_in) + rho_in * g_dz
+
+    res[0] = m_out - m
+    res[1] = h_out - h_in
+    res[2] = (p_in - p_out) - dp_total
+    basis[0] = m
+    basis[1] = h_in
+    basis[2] = p_in
@@ -1,24 +1,63 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from ..connection import Connection
 from ..equation import Equation
 from ..variable import Variable
 
 
-@dataclass
+@dataclass(slots=True)
 class Component:
     """Base class for all components.
 
     Components expose *ports* (inlets/outlets) and contribute residual equations.
+
+    Subclasses implement three methods:
+
+    - ``write_residuals(props, res, basis)`` writes *unscaled* residuals as plain floats
+      into a preallocated slice of the network residual vector, and the quantity each
+      residual is scaled by into ``basis`` (solver hot path).
+    - ``residual_floors()`` returns the constant lower bound of each scale; the network
+      applies ``residual / fmax(floor, |basis|)`` to the whole vector in one pass. Rows
+      with a constant scale leave ``basis`` at zero and return the scale as floor.
+    - ``_equation_names()`` returns the local equation names, in the same order. Full
+      names (``describe_equations``) are built once and cached; they are only needed for
+      reporting, so the hot path never constructs names or :class:`Equation` objects.
+
+    ``equations(props)`` (named :class:`Equation` objects, cold path) is derived from these.
+    Components overriding only ``equations`` are still supported via a fallback.
     """
 
     name: str
     inlets: Dict[str, Connection] = field(default_factory=dict)
     outlets: Dict[str, Connection] = field(default_factory=dict)
 
+    # Slice of the network residual vector owned by this component (set by Network.prepare)
+    _res: np.ndarray = field(
+        default_factory=lambda: np.empty(0), init=False, repr=False, compare=False
+    )
+    _offset: int = field(default=0, init=False, repr=False, compare=False)
+    # Matching slice of the network's scale-basis vector (set by Network.prepare)
+    _basis: np.ndarray = field(
+        default_factory=lambda: np.empty(0), init=False, repr=False, compare=False
+    )
+    # (name, local names, full names) cache for describe_equations
+    _names_cache: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._precompute()
+
+    def _precompute(self) -> None:
+        """Refresh constants derived from parameters.
+
+        Called at construction and again by ``Network.prepare`` so parameters edited
+        between solves are picked up. Override to hoist work out of the residual hot path.
+        """
+
     def connect_inlet(self, port: str, conn: Connection) -> None:
         self.inlets[port] = conn
 
@@ -29,10 +68,106 @@ class Component:
         # Override to include internal variables.
         return []
 
-    def equations(self, props) -> List[Equation]:
-        # Override in subclasses.
+    def _equation_names(self) -> Tuple[str, ...]:
+        # Override in subclasses (local names, e.g. "mass").
         raise NotImplementedError
 
+    def _legacy_equations(self) -> bool:
+        return type(self).equations is not Component.equations
+
+    def describe_equations(self) -> Tuple[str, ...]:
+        """Full equation names (``"<component>.<equation>"``), cached."""
+        local = self._equation_names()
+        cache = self._names_cache
+        if cache is None or cache[0] != self.name or cache[1] != local:
+            prefix = self.name + "."
+            cache = (self.name, local, tuple(prefix + n for n in local))
+            self._names_cache = cache
+        return cache[2]
+
+    def equations(self, props) -> List[Equation]:
+        """Named residuals with their scales (cold path: diagnostics/reporting).
+
+        Refreshes the ``_precompute`` constants first, so parameters edited since the
+        last ``Network.prepare`` are picked up.
+        """
+        self._precompute()
+        names = self.describe_equations()
+        res = np.empty(len(names), dtype=float)
+        basis = np.zeros(len(names), dtype=float)
+        self.write_residuals(props, res, basis)
+        scales = np.fmax(np.asarray(self.residual_floors(), dtype=float), np.abs(basis))
+        return [Equation(n, float(r), float(sc)) for n, r, sc in zip(names, res, scales)]
+
+    def n_equations(self, props) -> int:
+        if self._legacy_equations():
+            return len(self.equations(props))
+        return len(self.describe_equations())
+
+    def bind_slots(self, offset: int, residual: np.ndarray, basis: np.ndarray) -> None:
+        """Bind this component to its (view) slices of the network residual and
+        scale-basis vectors."""
+        self._offset = offset
+        self._res = residual
+        self._basis = basis
+
+    def write_residuals(self, props, res: np.ndarray, basis: np.ndarray) -> None:
+        """Write unscaled residuals into ``res`` and their scale bases into ``basis``."""
+        if not self._legacy_equations():
+            raise NotImplementedError
+        # Fallback: already scaled residuals over a unit scale (basis 0, floor 1)
+        for i, eq in enumerate(self.equations(props)):
+            res[i] = eq.residual / (eq.scale if eq.scale != 0 else 1.0)
+
+    def residual_floors(self) -> Sequence[float]:
+        """Lower bound of each residual scale (evaluated once by ``Network.prepare``).
+
+        The default (unit floors over the bound slice) suits the ``equations`` fallback.
+        """
+        return (1.0,) * len(self._res)
+
+    def jacobian_entries(self, props) -> Optional[List[Tuple[int, Variable, float]]]:
+        """Analytic Jacobian of the scaled residuals, as ``(local_row, variable, value)``.
+
+        Entries are ``d(residual)/d(variable) / scale``; scales may be treated as
+        constants (row scaling only, exact at the solution) or differentiated too, to
+        match finite differences everywhere. Entries for fixed variables are ignored by
+        the solver. Return None (default) to have the solver finite-difference the rows.
+        """
+        return None
+
+    def _residual_source(self, bind) -> Optional[List[str]]:
+        """Source lines writing this component's residuals into ``r[offset:]`` and
+        their scale bases into ``b[offset:]`` (as ``write_residuals``).
+
+        Used by :mod:`systems_th.codegen` to fuse all components into one function.
+        ``bind(obj)`` returns a global name for an object referenced by the code and
+        ``bind.value(var)`` an expression for a Variable's value. Return None (default)
+        to be called via ``write_residuals``.
+        """
+        return None
+
+    def port_variables(self) -> List[Variable]:
+        """Connection state variables on all ports plus internal variables."""
+        vars_ = []
+        for conn in list(self.inlets.values()) + list(self.outlets.values()):
+            vars_.extend(conn.variables())
+        vars_.extend(self.variables())
+        return vars_
+
+    def sparsity(self, props) -> List[Tuple[int, Variable]]:
+        """Structural Jacobian nonzeros as ``(local_row, variable)``.
+
+        When ``jacobian_entries`` is provided the pairs must come in the same order as its
+        entries (the default derives them from it). Otherwise every row is assumed to
+        depend on every port and internal variable.
+        """
+        entries = self.jacobian_entries(props)
+        if entries is not None:
+            return [(row, var) for row, var, _ in entries]
+        vars_ = self.port_variables()
+        return [(row, var) for row in range(self.n_equations(props)) for var in vars_]
+
     def _req_in(self, port: str) -> Connection:
         if port not in self.inlets:
             raise KeyError(f"{self.name}: inlet '{port}' not connected")
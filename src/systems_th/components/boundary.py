@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional, List
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+import numpy as np
 
 from .base import Component
-from ..equation import Equation
 
 
-@dataclass
+@dataclass(slots=True)
 class Source(Component):
     """Boundary condition source: sets outlet state if values are provided."""
 
@@ -15,30 +16,108 @@ class Source(Component):
     p: Optional[float] = None
     h: Optional[float] = None
 
-    def equations(self, props) -> List[Equation]:
+    # Constant residual scales derived in _precompute (one per imposed value)
+    _scales: Tuple[float, ...] = field(default=(), init=False, repr=False, compare=False)
+
+    def _precompute(self) -> None:
+        self._scales = _fixed_scales((self.m_dot, 1.0), (self.p, 1e5), (self.h, 1e5))
+
+    def _equation_names(self) -> Tuple[str, ...]:
+        names: Tuple[str, ...] = ()
+        if self.m_dot is not None:
+            names += ("m_out",)
+        if self.p is not None:
+            names += ("p_out",)
+        if self.h is not None:
+            names += ("h_out",)
+        return names
+
+    def residual_floors(self) -> Tuple[float, ...]:
+        # Constant scales: the basis stays zero, so the floor is the scale
+        return self._scales
+
+    def write_residuals(self, props, res: np.ndarray, basis: np.ndarray) -> None:
         out = self._req_out("out")
-        eqs: List[Equation] = []
+        i = 0
         if self.m_dot is not None:
-            eqs.append(Equation(f"{self.name}.m_out", out.m.value - self.m_dot, scale=max(1.0, abs(self.m_dot))))
+            res[i] = out.m.value - self.m_dot
+            i += 1
         if self.p is not None:
-            eqs.append(Equation(f"{self.name}.p_out", out.p.value - self.p, scale=max(1e5, abs(self.p))))
+            res[i] = out.p.value - self.p
+            i += 1
         if self.h is not None:
-            eqs.append(Equation(f"{self.name}.h_out", out.h.value - self.h, scale=max(1e5, abs(self.h))))
-        return eqs
+            res[i] = out.h.value - self.h
+
+    def _residual_source(self, bind):
+        out = self._req_out("out")
+        lines = []
+        i = self._offset
+        if self.m_dot is not None:
+            lines.append(f"r[{i}] = {bind.value(out.m)} - {self.m_dot!r}")
+            i += 1
+        if self.p is not None:
+            lines.append(f"r[{i}] = {bind.value(out.p)} - {self.p!r}")
+            i += 1
+        if self.h is not None:
+            lines.append(f"r[{i}] = {bind.value(out.h)} - {self.h!r}")
+        return lines
+
+    def jacobian_entries(self, props):
+        out = self._req_out("out")
+        vars_ = [v for v, x in ((out.m, self.m_dot), (out.p, self.p), (out.h, self.h)) if x is not None]
+        return [(i, v, 1.0 / sc) for i, (v, sc) in enumerate(zip(vars_, self._scales))]
 
 
-@dataclass
+@dataclass(slots=True)
 class Sink(Component):
     """Boundary sink: can enforce pressure/enthalpy if provided."""
 
     p: Optional[float] = None
     h: Optional[float] = None
 
-    def equations(self, props) -> List[Equation]:
+    # Constant residual scales derived in _precompute (one per imposed value)
+    _scales: Tuple[float, ...] = field(default=(), init=False, repr=False, compare=False)
+
+    def _precompute(self) -> None:
+        self._scales = _fixed_scales((self.p, 1e5), (self.h, 1e5))
+
+    def _equation_names(self) -> Tuple[str, ...]:
+        names: Tuple[str, ...] = ()
+        if self.p is not None:
+            names += ("p_in",)
+        if self.h is not None:
+            names += ("h_in",)
+        return names
+
+    def residual_floors(self) -> Tuple[float, ...]:
+        return self._scales
+
+    def write_residuals(self, props, res: np.ndarray, basis: np.ndarray) -> None:
+        inc = self._req_in("in")
+        i = 0
+        if self.p is not None:
+            res[i] = inc.p.value - self.p
+            i += 1
+        if self.h is not None:
+            res[i] = inc.h.value - self.h
+
+    def _residual_source(self, bind):
         inc = self._req_in("in")
-        eqs: List[Equation] = []
+        lines = []
+        i = self._offset
         if self.p is not None:
-            eqs.append(Equation(f"{self.name}.p_in", inc.p.value - self.p, scale=max(1e5, abs(self.p))))
+            lines.append(f"r[{i}] = {bind.value(inc.p)} - {self.p!r}")
+            i += 1
         if self.h is not None:
-            eqs.append(Equation(f"{self.name}.h_in", inc.h.value - self.h, scale=max(1e5, abs(self.h))))
-        return eqs
+            lines.append(f"r[{i}] = {bind.value(inc.h)} - {self.h!r}")
+        return lines
+
+    def jacobian_entries(self, props):
+        inc = self._req_in("in")
+        vars_ = [v for v, x in ((inc.p, self.p), (inc.h, self.h)) if x is not None]
+        return [(i, v, 1.0 / sc) for i, (v, sc) in enumerate(zip(vars_, self._scales))]
+
+
+def _fixed_scales(*specs: Tuple[Optional[float], float]) -> Tuple[float, ...]:
+    """max(floor, |value|) for each imposed ``(value, floor)``; None values are skipped."""
+    return tuple(max(floor, abs(v)) for v, floor in specs if v is not None)
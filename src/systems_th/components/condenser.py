@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+import numpy as np
 
 from .base import Component
-from ..equation import Equation
+from .._jit import njit
+from ..props.derivatives import partials_ph
 
 
-@dataclass
+@dataclass(slots=True)
 class Condenser(Component):
     """Condenser enforcing outlet to specified quality (default saturated liquid).
 
@@ -19,23 +22,88 @@ class Condenser(Component):
     x_out: float = 0.0
     p_out: Optional[float] = None  # if set, fixes outlet pressure; otherwise uses p_in - dp
 
-    def equations(self, props) -> List[Equation]:
+    # (p_out, x_out, props, h_px(p_out, x_out)) when p_out is fixed; computed lazily and
+    # recomputed when p_out, x_out or the props backend change (also reset by _precompute)
+    _h_out_fixed: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+
+    def _precompute(self) -> None:
+        self._h_out_fixed = None
+
+    def _outlet_state(self, props, p_in: float) -> tuple[float, float]:
+        if self.p_out is None:
+            p_out = p_in - self.dp
+            return p_out, props.h_px(p_out, self.x_out)
+        key = (self.p_out, self.x_out, props)
+        cached = self._h_out_fixed
+        if cached is None or cached[:2] != key[:2] or cached[2] is not props:
+            cached = self._h_out_fixed = key + (props.h_px(self.p_out, self.x_out),)
+        return self.p_out, cached[3]
+
+    def _equation_names(self) -> Tuple[str, ...]:
+        return ("mass", "p_out", "h_out")
+
+    def residual_floors(self) -> Tuple[float, ...]:
+        return (1.0, 1e5, 1e5)
+
+    def write_residuals(self, props, res: np.ndarray, basis: np.ndarray) -> None:
         inc = self._req_in("in")
         out = self._req_out("out")
 
-        m = inc.m.value
-        p_in = inc.p.value
+        p_out, h_out = self._outlet_state(props, inc.p.value)
 
-        p_out = self.p_out if self.p_out is not None else (p_in - self.dp)
-        h_out = props.h_px(p_out, self.x_out)
+        _condenser_residuals(inc.m.value, out.m.value, out.p.value, out.h.value, p_out, h_out, res, basis)
 
-        eqs: List[Equation] = []
-        eqs.append(Equation(f"{self.name}.mass", out.m.value - m, scale=max(1.0, abs(m))))
-        eqs.append(Equation(f"{self.name}.p_out", out.p.value - p_out, scale=max(1e5, abs(p_out))))
-        eqs.append(Equation(f"{self.name}.h_out", out.h.value - h_out, scale=max(1e5, abs(h_out))))
-        return eqs
+    def _residual_source(self, bind):
+        inc = self._req_in("in")
+        out = self._req_out("out")
+        o = self._offset
+        return [
+            f"m = {bind.value(inc.m)}",
+            f"p_out, h_out = {bind(self._outlet_state, 'f')}(props, {bind.value(inc.p)})",
+            f"r[{o}] = {bind.value(out.m)} - m",
+            f"r[{o + 1}] = {bind.value(out.p)} - p_out",
+            f"r[{o + 2}] = {bind.value(out.h)} - h_out",
+            f"b[{o}] = m",
+            f"b[{o + 1}] = p_out",
+            f"b[{o + 2}] = h_out",
+        ]
+
+    def jacobian_entries(self, props):
+        inc = self._req_in("in")
+        out = self._req_out("out")
+
+        if self.p_out is not None:
+            p_out, h_out = self._outlet_state(props, inc.p.value)
+            dh_dp = 0.0
+        else:
+            p_out = inc.p.value - self.dp
+            h_out, dh_dp, _ = partials_ph(props.h_px, p_out, self.x_out)
+
+        m_scale = max(1.0, abs(inc.m.value))
+        p_scale = max(1e5, abs(p_out))
+        h_scale = max(1e5, abs(h_out))
+        entries = [
+            (0, out.m, 1.0 / m_scale),
+            (0, inc.m, -1.0 / m_scale),
+            (1, out.p, 1.0 / p_scale),
+            (2, out.h, 1.0 / h_scale),
+        ]
+        if self.p_out is None:
+            entries.append((1, inc.p, -1.0 / p_scale))
+            entries.append((2, inc.p, -dh_dp / h_scale))
+        return entries
 
     def heat_rejected(self) -> float:
         inc = self._req_in("in")
         out = self._req_out("out")
         return inc.m.value * (inc.h.value - out.h.value)
+
+
+@njit("void(f8, f8, f8, f8, f8, f8, f8[:], f8[:])", cache=True)
+def _condenser_residuals(m, m_out, p_out_var, h_out_var, p_out, h_out, res, basis):
+    res[0] = m_out - m
+    res[1] = p_out_var - p_out
+    res[2] = h_out_var - h_out
+    basis[0] = m
+    basis[1] = p_out
+    basis[2] = h_out
@@ -1,15 +1,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
 from .base import Component
-from ..equation import Equation
+from ..correlations.pressure_drop import dp_pipe_vec
+from .pipe import _bind_ports, _dp_args, _hydraulic_consts, _pipe_jacobian, _pipe_residuals, _pipe_source, _read_ports
+from ..props.derivatives import partials_ph
 from ..variable import Variable
-from ..correlations.pressure_drop import dp_pipe
 
 
-@dataclass
+@dataclass(slots=True)
 class CoreChannel(Component):
     """Boiling core channel: heat input + two-phase-aware pressure drop.
 
@@ -51,6 +54,7 @@ class CoreChannel(Component):
     # Two-phase friction model selection
     two_phase_friction: str = "homogeneous"
     include_acceleration: bool = True
+    include_gravity: bool = True
 
     # Optional target exit void fraction (0..1). If set, Q becomes a solver variable unless fixed.
     alpha_out_target: Optional[float] = None
@@ -58,6 +62,25 @@ class CoreChannel(Component):
     # Internal variable for heat input [W]
     Q_var: Variable = field(default_factory=lambda: Variable("core.Q", 1e8, fixed=True, lower=-1e12, upper=1e12))
 
+    # Pipe-model constants (see pipe._hydraulic_consts) with K + bundle + grid losses
+    _A: float = field(default=0.0, init=False, repr=False, compare=False)
+    _homogeneous: bool = field(default=True, init=False, repr=False, compare=False)
+    _dp_consts: tuple = field(default=(), init=False, repr=False, compare=False)
+    # Port state gather (see pipe._bind_ports)
+    _state: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _port_idx: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+
+    def _precompute(self) -> None:
+        K_total = self.K + self.K_bundle + self.n_grids * self.K_grid
+        self._A, self._dp_consts = _hydraulic_consts(
+            self.L, self.D, self.A, self.eps, K_total, self.dz if self.include_gravity else 0.0
+        )
+        self._homogeneous = self.two_phase_friction.lower() != "chisholm"
+
+    def bind_slots(self, offset: int, residual: np.ndarray, basis: np.ndarray) -> None:
+        Component.bind_slots(self, offset, residual, basis)  # zero-arg super() breaks with slots=True
+        _bind_ports(self)
+
     def variables(self) -> List[Variable]:
         return [self.Q_var]
 
@@ -70,59 +93,216 @@ class CoreChannel(Component):
         self.Q_var.value = float(Q_guess_w)
         self.Q_var.unfix()
 
-    def equations(self, props) -> List[Equation]:
+    def _equation_names(self) -> Tuple[str, ...]:
+        if self.alpha_out_target is not None:
+            return ("mass", "energy", "dp", "alpha_out")
+        return ("mass", "energy", "dp")
+
+    def residual_floors(self) -> Tuple[float, ...]:
+        if self.alpha_out_target is not None:
+            return (1.0, 1e5, 1e5, max(1e-2, abs(self.alpha_out_target)))
+        return (1.0, 1e5, 1e5)
+
+    def write_residuals(self, props, res: np.ndarray, basis: np.ndarray) -> None:
+        m, p_in, h_in, m_out, p_out, h_out = _read_ports(self)
+
+        # With a void target the outlet density and void fraction come from one query
+        out_state = props.state_ph(p_out, h_out) if self.alpha_out_target is not None else None
+
+        # Mass, energy (power adds enthalpy) and momentum, as in Pipe
+        _pipe_residuals(
+            m, m_out, p_in, h_in, p_out, h_out, self.Q_var.value,
+            *_dp_args(self, props, m, p_in, h_in, p_out, h_out, None if out_state is None else out_state.rho),
+            res, basis,
+        )
+
+        # Optional void fraction target at outlet
+        if out_state is not None:
+            res[3] = out_state.alpha - self.alpha_out_target  # constant scale (floor, zero basis)
+
+    def _residual_source(self, bind):
+        # Specialized to the current mode (fixed power or void target) at prepare time
+        return _pipe_source(self, bind, bind.value(self.Q_var), self.alpha_out_target)
+
+    def jacobian_entries(self, props):
         inc = self._req_in("in")
         out = self._req_out("out")
+        entries = _pipe_jacobian(self, props, inc, out, self.Q_var.value, self.Q_var)
+        if self.alpha_out_target is not None:
+            _, da_dp, da_dh = partials_ph(props.void_fraction_ph, out.p.value, out.h.value)
+            a_scale = max(1e-2, abs(self.alpha_out_target))
+            entries += [(3, out.p, da_dp / a_scale), (3, out.h, da_dh / a_scale)]
+        return entries
+
+
+# Per-channel parameter of CoreChannelArray: a scalar (broadcast) or one value per channel
+_PerChannel = Union[float, Sequence[float], np.ndarray]
+
+
+@dataclass(slots=True)
+class _Channel:
+    """Pipe-like view of one CoreChannelArray channel, for :func:`_pipe_jacobian`."""
+
+    L: float
+    D: float
+    eps: float
+    include_acceleration: bool
+    _A: float
+    _homogeneous: bool
+    _dp_consts: tuple
+    inc: Any
+    out: Any
+    _state: Optional[np.ndarray] = None
+    _port_idx: Optional[np.ndarray] = None
+
+    def _req_in(self, port: str):
+        return self.inc
+
+    def _req_out(self, port: str):
+        return self.out
 
-        m = inc.m.value
-        p_in = inc.p.value
-        h_in = inc.h.value
 
-        # Mass
-        eqs: List[Equation] = [
-            Equation(f"{self.name}.mass", out.m.value - m, scale=max(1.0, abs(m))),
+@dataclass(slots=True)
+class CoreChannelArray(Component):
+    """N parallel fixed-power core channels (subchannels) evaluated as one component.
+
+    Channel ``i`` has inlet port ``'in{i}'`` and outlet port ``'out{i}'`` and contributes
+    the mass/energy/dp rows of a fixed-power :class:`CoreChannel`. Geometry, losses and
+    powers are given per channel (scalars broadcast to ``n``) and stored as arrays, so
+    all residuals come from one gather of the port states and one :func:`dp_pipe_vec`
+    pass instead of N scalar component calls.
+
+    Exit void fraction targets are not supported; use :class:`CoreChannel` for those.
+    """
+
+    n: int = 1
+
+    # Per-channel geometry / hydraulics (scalar or length-n)
+    L: _PerChannel = 4.0
+    D: _PerChannel = 0.08
+    A: _PerChannel = 0.30
+    eps: _PerChannel = 1e-5
+    dz: _PerChannel = 4.0
+
+    # Per-channel losses
+    K: _PerChannel = 0.0
+    K_bundle: _PerChannel = 0.0
+    K_grid: _PerChannel = 0.0
+    n_grids: _PerChannel = 0
+
+    # Per-channel heat input [W]
+    Q: _PerChannel = 0.0
+
+    two_phase_friction: str = "homogeneous"
+    include_acceleration: bool = True
+    include_gravity: bool = True
+
+    # Parameters as float arrays of length n (set in _precompute)
+    _L: np.ndarray = field(default_factory=lambda: np.empty(0), init=False, repr=False, compare=False)
+    _D: np.ndarray = field(default_factory=lambda: np.empty(0), init=False, repr=False, compare=False)
+    _A: np.ndarray = field(default_factory=lambda: np.empty(0), init=False, repr=False, compare=False)
+    _eps: np.ndarray = field(default_factory=lambda: np.empty(0), init=False, repr=False, compare=False)
+    _dz: np.ndarray = field(default_factory=lambda: np.empty(0), init=False, repr=False, compare=False)
+    _K_total: np.ndarray = field(default_factory=lambda: np.empty(0), init=False, repr=False, compare=False)
+    _Q: np.ndarray = field(default_factory=lambda: np.empty(0), init=False, repr=False, compare=False)
+    # Per-channel (A, pipe._hydraulic_consts) for the Jacobian
+    _consts: list = field(default_factory=list, init=False, repr=False, compare=False)
+    # Port state gather: state array and (n, 6) indices of in m/p/h, out m/p/h per channel
+    _state: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _port_idx: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+
+    def _precompute(self) -> None:
+        n = int(self.n)
+        if n < 1:
+            raise ValueError(f"{self.name}: CoreChannelArray needs n >= 1")
+
+        def arr(v) -> np.ndarray:
+            return np.ascontiguousarray(np.broadcast_to(np.asarray(v, dtype=float), (n,)))
+
+        self._L, self._D, self._A, self._eps, self._dz, self._Q = map(
+            arr, (self.L, self.D, self.A, self.eps, self.dz, self.Q)
+        )
+        self._K_total = arr(self.K) + arr(self.K_bundle) + arr(self.n_grids) * arr(self.K_grid)
+        dz = self._dz if self.include_gravity else np.zeros(n)
+        self._consts = [
+            _hydraulic_consts(self._L[i], self._D[i], self._A[i], self._eps[i], self._K_total[i], dz[i])
+            for i in range(n)
+        ]
+
+    def bind_slots(self, offset: int, residual: np.ndarray, basis: np.ndarray) -> None:
+        Component.bind_slots(self, offset, residual, basis)  # zero-arg super() breaks with slots=True
+        self._state = self._port_idx = None
+        vars_ = [
+            v
+            for i in range(int(self.n))
+            for conn in (self.inlets.get(f"in{i}"), self.outlets.get(f"out{i}"))
+            if conn is not None
+            for v in (conn.m, conn.p, conn.h)
         ]
+        store = vars_[0]._store if vars_ else None
+        if len(vars_) == 6 * int(self.n) and store is not None and all(v._store is store for v in vars_):
+            self._state = store
+            self._port_idx = np.array([v.idx for v in vars_], dtype=np.intp).reshape(-1, 6)
 
-        # Energy (power adds enthalpy)
-        dh = self.Q_var.value / m if abs(m) > 1e-9 else 0.0
-        h_out_target = h_in + dh
-        eqs.append(Equation(f"{self.name}.energy", out.h.value - h_out_target, scale=max(1e5, abs(h_out_target))))
+    def set_power(self, Q_w) -> None:
+        """Set the per-channel heat input (scalar or length-n) [W]."""
+        self.Q = Q_w
+        self._precompute()
 
-        # Momentum
-        p_out = out.p.value
-        h_out = out.h.value
+    def _ports(self, i: int):
+        return self._req_in(f"in{i}"), self._req_out(f"out{i}")
 
-        K_total = self.K + self.K_bundle + self.n_grids * self.K_grid
+    def _read_ports(self) -> np.ndarray:
+        """``(n, 6)`` array of ``[m_in, p_in, h_in, m_out, p_out, h_out]`` per channel."""
+        idx = self._port_idx
+        if idx is not None and self._state is not None:
+            return self._state[idx]
+        rows = []
+        for i in range(int(self.n)):
+            inc, out = self._ports(i)
+            rows.append([inc.m.value, inc.p.value, inc.h.value, out.m.value, out.p.value, out.h.value])
+        return np.array(rows, dtype=float)
+
+    def _equation_names(self) -> Tuple[str, ...]:
+        return tuple(f"{eq}{i}" for i in range(int(self.n)) for eq in ("mass", "energy", "dp"))
 
-        dp = dp_pipe(
-            m_dot=m,
-            p_in=p_in,
-            h_in=h_in,
-            p_out=p_out,
-            h_out=h_out,
-            props=props,
-            L=self.L,
-            D=self.D,
-            eps=self.eps,
-            K=K_total,
-            dz=self.dz,
-            A=self.A,
+    def residual_floors(self) -> Tuple[float, ...]:
+        return (1.0, 1e5, 1e5) * int(self.n)
+
+    def write_residuals(self, props, res: np.ndarray, basis: np.ndarray) -> None:
+        m, p_in, h_in, m_out, p_out, h_out = self._read_ports().T
+
+        dp = dp_pipe_vec(
+            m, p_in, h_in, p_out, h_out, props,
+            self._L, self._D, self._eps, K=self._K_total, dz=self._dz, A=self._A,
             two_phase_friction=self.two_phase_friction,
             include_acceleration=self.include_acceleration,
-            include_gravity=True,
-        )
+            include_gravity=self.include_gravity,
+        ).total
 
-        eqs.append(Equation(f"{self.name}.dp", (p_in - p_out) - dp.total, scale=max(1e5, abs(p_in))))
+        # Rows per channel: mass, energy (power adds enthalpy), momentum, as in CoreChannel
+        has_m = np.abs(m) > 1e-9
+        h_target = h_in + np.divide(self._Q, m, out=np.zeros_like(m), where=has_m)
+        res3 = res.reshape(-1, 3)
+        basis3 = basis.reshape(-1, 3)
+        res3[:, 0] = m_out - m
+        res3[:, 1] = h_out - h_target
+        res3[:, 2] = (p_in - p_out) - dp
+        basis3[:, 0] = m
+        basis3[:, 1] = h_target
+        basis3[:, 2] = p_in
 
-        # Optional void fraction target at outlet
-        if self.alpha_out_target is not None:
-            alpha_out = props.void_fraction_ph(p_out, h_out)
-            eqs.append(
-                Equation(
-                    f"{self.name}.alpha_out",
-                    alpha_out - self.alpha_out_target,
-                    scale=max(1e-2, abs(self.alpha_out_target)),
-                )
+    def jacobian_entries(self, props) -> List[Tuple[int, Variable, float]]:
+        # Channel i's rows (3i..3i+2) are a fixed-power CoreChannel's, on its own ports only
+        homogeneous = self.two_phase_friction.lower() != "chisholm"
+        idx = self._port_idx
+        entries = []
+        for i in range(int(self.n)):
+            inc, out = self._ports(i)
+            A, consts = self._consts[i]
+            ch = _Channel(
+                self._L[i], self._D[i], self._eps[i], self.include_acceleration, A, homogeneous, consts,
+                inc, out, self._state, None if idx is None else idx[i],
             )
-
-        return eqs
+            entries += [(3 * i + row, v, d) for row, v, d in _pipe_jacobian(ch, props, inc, out, self._Q[i])]
+        return entries
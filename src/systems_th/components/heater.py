@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Optional, Tuple
+
+import numpy as np
 
 from .base import Component
-from ..equation import Equation
+from ..props.derivatives import partials_ph
 
 
-@dataclass
+@dataclass(slots=True)
 class Heater(Component):
     """Simple heater enforcing outlet temperature or outlet enthalpy."""
 
@@ -15,7 +17,13 @@ class Heater(Component):
     T_out: Optional[float] = None
     h_out: Optional[float] = None
 
-    def equations(self, props) -> List[Equation]:
+    def _equation_names(self) -> Tuple[str, ...]:
+        return ("mass", "p_out", "h_out")
+
+    def residual_floors(self) -> Tuple[float, ...]:
+        return (1.0, 1e5, 1e5)
+
+    def write_residuals(self, props, res: np.ndarray, basis: np.ndarray) -> None:
         inc = self._req_in("in")
         out = self._req_out("out")
 
@@ -28,11 +36,67 @@ class Heater(Component):
         p_out = p_in - self.dp
         h_target = self.h_out if self.h_out is not None else props.h_pT(p_out, float(self.T_out))
 
-        eqs: List[Equation] = []
-        eqs.append(Equation(f"{self.name}.mass", out.m.value - m, scale=max(1.0, abs(m))))
-        eqs.append(Equation(f"{self.name}.p_out", out.p.value - p_out, scale=max(1e5, abs(p_out))))
-        eqs.append(Equation(f"{self.name}.h_out", out.h.value - float(h_target), scale=max(1e5, abs(h_target))))
-        return eqs
+        res[0] = out.m.value - m
+        res[1] = out.p.value - p_out
+        res[2] = out.h.value - float(h_target)
+        basis[0] = m
+        basis[1] = p_out
+        basis[2] = h_target
+
+    def _residual_source(self, bind):
+        if self.T_out is None and self.h_out is None:
+            return None  # write_residuals raises the configuration error
+        inc = self._req_in("in")
+        out = self._req_out("out")
+        o = self._offset
+        if self.h_out is not None:
+            h_target = f"{float(self.h_out)!r}"
+        else:
+            h_target = f"props.h_pT(p_out, {float(self.T_out)!r})"
+        return [
+            f"m = {bind.value(inc.m)}",
+            f"p_out = {bind.value(inc.p)} - {float(self.dp)!r}",
+            f"h_target = {h_target}",
+            f"r[{o}] = {bind.value(out.m)} - m",
+            f"r[{o + 1}] = {bind.value(out.p)} - p_out",
+            f"r[{o + 2}] = {bind.value(out.h)} - h_target",
+            f"b[{o}] = m",
+            f"b[{o + 1}] = p_out",
+            f"b[{o + 2}] = h_target",
+        ]
+
+    def jacobian_entries(self, props):
+        if self.T_out is None and self.h_out is None:
+            return None  # finite-differenced rows report the configuration error
+        inc = self._req_in("in")
+        out = self._req_out("out")
+
+        m = inc.m.value
+        p_out = inc.p.value - self.dp
+        if self.h_out is not None:
+            h_target, dh_dp = float(self.h_out), 0.0
+        else:
+            h_target, dh_dp, _ = partials_ph(props.h_pT, p_out, float(self.T_out))
+
+        # Scales follow the state; d(N/s) = (dN - r*ds)/s as in Separator
+        m_scale = max(1.0, abs(m))
+        p_scale = max(1e5, abs(p_out))
+        h_scale = max(1e5, abs(h_target))
+        r_m = (out.m.value - m) / m_scale
+        r_p = (out.p.value - p_out) / p_scale
+        r_h = (out.h.value - h_target) / h_scale
+        dsm = np.sign(m) if abs(m) > 1.0 else 0.0
+        dsp = np.sign(p_out) if abs(p_out) > 1e5 else 0.0
+        dsh = np.sign(h_target) * dh_dp if abs(h_target) > 1e5 else 0.0
+
+        return [
+            (0, out.m, 1.0 / m_scale),
+            (0, inc.m, (-1.0 - r_m * dsm) / m_scale),
+            (1, out.p, 1.0 / p_scale),
+            (1, inc.p, (-1.0 - r_p * dsp) / p_scale),
+            (2, out.h, 1.0 / h_scale),
+            (2, inc.p, (-dh_dp - r_h * dsh) / h_scale),
+        ]
 
     def heat_added(self) -> float:
         inc = self._req_in("in")
@@ -1,35 +1,111 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+import numpy as np
 
 from .base import Component
-from ..equation import Equation
+from ..connection import Connection
 
 
-@dataclass
+@dataclass(slots=True)
 class Mixer(Component):
     """Mix multiple inlet streams into one outlet with pressure equalization."""
 
-    def equations(self, props) -> List[Equation]:
+    # Inlet order and per-inlet state buffers, snapshotted by bind_slots
+    _incs: List[Connection] = field(default_factory=list, init=False, repr=False, compare=False)
+    _m_view: np.ndarray = field(default_factory=lambda: np.empty(0), init=False, repr=False, compare=False)
+    _p_view: np.ndarray = field(default_factory=lambda: np.empty(0), init=False, repr=False, compare=False)
+    _h_view: np.ndarray = field(default_factory=lambda: np.empty(0), init=False, repr=False, compare=False)
+
+    def _equation_names(self) -> Tuple[str, ...]:
+        return tuple("p_eq_" + port for port in self.inlets) + ("mass", "energy")
+
+    def residual_floors(self) -> Tuple[float, ...]:
+        return (1e5,) * len(self.inlets) + (1.0, 1e6)
+
+    def bind_slots(self, offset: int, residual: np.ndarray, basis: np.ndarray) -> None:
+        Component.bind_slots(self, offset, residual, basis)  # zero-arg super() breaks with slots=True
+        self._incs = list(self.inlets.values())
+        k = len(self._incs)
+        self._m_view = np.empty(k, dtype=float)
+        self._p_view = np.empty(k, dtype=float)
+        self._h_view = np.empty(k, dtype=float)
+
+    def _gather(self) -> None:
+        # Also covers ports connected after the last bind
+        if len(self._incs) != len(self.inlets):
+            self.bind_slots(self._offset, self._res, self._basis)
+        for i, inc in enumerate(self._incs):
+            self._m_view[i] = inc.m.value
+            self._p_view[i] = inc.p.value
+            self._h_view[i] = inc.h.value
+
+    def write_residuals(self, props, res: np.ndarray, basis: np.ndarray) -> None:
         out = self._req_out("out")
         if len(self.inlets) < 2:
             raise ValueError(f"{self.name}: Mixer needs at least two inlets")
 
-        eqs: List[Equation] = []
+        self._gather()
+        m_arr = self._m_view
+        n = m_arr.shape[0]
+        m_sum = m_arr.sum()
+        e_sum = m_arr @ self._h_view
 
-        for port, inc in self.inlets.items():
-            eqs.append(
-                Equation(
-                    f"{self.name}.p_eq_{port}",
-                    out.p.value - inc.p.value,
-                    scale=max(1e5, abs(out.p.value)),
-                )
-            )
+        p_out = out.p.value
+        res[:n] = p_out - self._p_view
+        res[n] = out.m.value - m_sum
+        res[n + 1] = out.m.value * out.h.value - e_sum
+        basis[:n] = p_out
+        basis[n] = m_sum
+        basis[n + 1] = e_sum
 
-        m_sum = sum(inc.m.value for inc in self.inlets.values())
-        e_sum = sum(inc.m.value * inc.h.value for inc in self.inlets.values())
+    def _residual_source(self, bind):
+        if len(self.inlets) < 2:
+            return None  # write_residuals raises the configuration error
+        out = self._req_out("out")
+        o = self._offset
+        incs = list(self.inlets.values())
+        n = len(incs)
+        m_terms = [f"{bind.value(inc.m)}" for inc in incs]
+        e_terms = [f"{bind.value(inc.m)} * {bind.value(inc.h)}" for inc in incs]
+        lines = [
+            f"p_out = {bind.value(out.p)}",
+            f"m_out = {bind.value(out.m)}",
+        ]
+        for i, inc in enumerate(incs):
+            lines.append(f"r[{o + i}] = p_out - {bind.value(inc.p)}")
+            lines.append(f"b[{o + i}] = p_out")
+        lines += [
+            f"m_sum = {' + '.join(m_terms)}",
+            f"e_sum = {' + '.join(e_terms)}",
+            f"r[{o + n}] = m_out - m_sum",
+            f"r[{o + n + 1}] = m_out * {bind.value(out.h)} - e_sum",
+            f"b[{o + n}] = m_sum",
+            f"b[{o + n + 1}] = e_sum",
+        ]
+        return lines
+
+    def jacobian_entries(self, props):
+        out = self._req_out("out")
+        self._gather()
+        incs = self._incs
+        n = len(incs)
+        p_scale = max(1e5, abs(out.p.value))
+        m_sum = self._m_view.sum()
+        e_sum = self._m_view @ self._h_view
+        m_scale = max(1.0, abs(m_sum))
+        e_scale = max(1e6, abs(e_sum))
 
-        eqs.append(Equation(f"{self.name}.mass", out.m.value - m_sum, scale=max(1.0, abs(m_sum))))
-        eqs.append(Equation(f"{self.name}.energy", out.m.value * out.h.value - e_sum, scale=max(1e6, abs(e_sum))))
-        return eqs
+        entries = []
+        for i, inc in enumerate(incs):
+            entries.append((i, out.p, 1.0 / p_scale))
+            entries.append((i, inc.p, -1.0 / p_scale))
+            entries.append((n, inc.m, -1.0 / m_scale))
+            entries.append((n + 1, inc.m, -self._h_view[i] / e_scale))
+            entries.append((n + 1, inc.h, -self._m_view[i] / e_scale))
+        entries.append((n, out.m, 1.0 / m_scale))
+        entries.append((n + 1, out.m, out.h.value / e_scale))
+        entries.append((n + 1, out.h, out.m.value / e_scale))
+        return entries
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+import numpy as np
 
 from .base import Component
-from ..equation import Equation
+from .._jit import njit
+from ..props.derivatives import rho_ph_partials
 
 
-@dataclass
+@dataclass(slots=True)
 class OrificePlate(Component):
     """Isenthalpic orifice / flow restriction.
 
@@ -23,31 +26,105 @@ class OrificePlate(Component):
     A: Optional[float] = None
     dz: float = 0.0  # optional elevation change
 
-    def equations(self, props) -> List[Equation]:
+    # Constants derived in _precompute: dp_total = _dp_coef * m^2 / rho + rho * _g_dz
+    _dp_coef: float = field(default=0.0, init=False, repr=False, compare=False)
+    _g_dz: float = field(default=0.0, init=False, repr=False, compare=False)
+    _config_error: str = field(default="", init=False, repr=False, compare=False)
+
+    def _precompute(self) -> None:
+        # The K / Cd model choice is fixed per instance, so fold it into one coefficient
+        self._config_error = ""
+        self._dp_coef = 0.0
+        if self.K is not None:
+            if self.A is None:
+                self._config_error = f"{self.name}: A must be provided when using K-loss model"
+            else:
+                self._dp_coef = 0.5 * float(self.K) / float(self.A) ** 2
+        elif self.Cd is None or self.A is None:
+            self._config_error = f"{self.name}: specify either K or (Cd and A)"
+        else:
+            self._dp_coef = 0.5 / (float(self.Cd) * float(self.A)) ** 2
+        self._g_dz = 9.80665 * self.dz
+
+    def _equation_names(self) -> Tuple[str, ...]:
+        return ("mass", "h_isenthalpic", "dp")
+
+    def residual_floors(self) -> Tuple[float, ...]:
+        return (1.0, 1e5, 1e5)
+
+    def write_residuals(self, props, res: np.ndarray, basis: np.ndarray) -> None:
+        if self._config_error:
+            raise ValueError(self._config_error)
         inc = self._req_in("in")
         out = self._req_out("out")
 
-        m = inc.m.value
         p_in = inc.p.value
         h_in = inc.h.value
         rho = props.rho_ph(p_in, h_in)
 
-        if self.K is not None:
-            if self.A is None:
-                raise ValueError(f"{self.name}: A must be provided when using K-loss model")
-            G = m / self.A
-            dp = float(self.K) * (G ** 2) / (2.0 * rho)
-        else:
-            if self.Cd is None or self.A is None:
-                raise ValueError(f"{self.name}: specify either K or (Cd and A)")
-            v = m / (rho * self.A)
-            dp = (v ** 2) * rho / (2.0 * (float(self.Cd) ** 2))
-
-        dp_g = rho * 9.80665 * self.dz
-        dp_total = dp + dp_g
-
-        eqs: List[Equation] = []
-        eqs.append(Equation(f"{self.name}.mass", out.m.value - m, scale=max(1.0, abs(m))))
-        eqs.append(Equation(f"{self.name}.h_isenthalpic", out.h.value - h_in, scale=max(1e5, abs(h_in))))
-        eqs.append(Equation(f"{self.name}.dp", (p_in - out.p.value) - dp_total, scale=max(1e5, abs(p_in))))
-        return eqs
+        _orifice_residuals(
+            inc.m.value, p_in, h_in, rho, out.m.value, out.p.value, out.h.value,
+            self._dp_coef, self._g_dz, res, basis,
+        )
+
+    def _residual_source(self, bind):
+        if self._config_error:
+            return None  # write_residuals raises the configuration error
+        inc = self._req_in("in")
+        out = self._req_out("out")
+        o = self._offset
+        return [
+            f"m = {bind.value(inc.m)}",
+            f"p_in = {bind.value(inc.p)}",
+            f"h_in = {bind.value(inc.h)}",
+            "rho = rho_ph(p_in, h_in)",
+            f"dp_total = {self._dp_coef!r} * m * m / rho + rho * {self._g_dz!r}",
+            f"r[{o}] = {bind.value(out.m)} - m",
+            f"r[{o + 1}] = {bind.value(out.h)} - h_in",
+            f"r[{o + 2}] = (p_in - {bind.value(out.p)}) - dp_total",
+            f"b[{o}] = m",
+            f"b[{o + 1}] = h_in",
+            f"b[{o + 2}] = p_in",
+        ]
+
+    def jacobian_entries(self, props):
+        if self._config_error:
+            return None
+        inc = self._req_in("in")
+        out = self._req_out("out")
+        c = self._dp_coef
+
+        m = inc.m.value
+        p_in = inc.p.value
+        h_in = inc.h.value
+        rho, drho_dp, drho_dh = rho_ph_partials(props, p_in, h_in)
+
+        # dp_total = c*m^2/rho + rho*g*dz
+        d_m = 2.0 * c * m / rho
+        d_rho = -c * m * m / rho**2 + self._g_dz
+
+        m_scale = max(1.0, abs(m))
+        h_scale = max(1e5, abs(h_in))
+        p_scale = max(1e5, abs(p_in))
+        return [
+            (0, out.m, 1.0 / m_scale),
+            (0, inc.m, -1.0 / m_scale),
+            (1, out.h, 1.0 / h_scale),
+            (1, inc.h, -1.0 / h_scale),
+            (2, inc.m, -d_m / p_scale),
+            (2, inc.p, (1.0 - d_rho * drho_dp) / p_scale),
+            (2, inc.h, -d_rho * drho_dh / p_scale),
+            (2, out.p, -1.0 / p_scale),
+        ]
+
+
+@njit("void(f8, f8, f8, f8, f8, f8, f8, f8, f8, f8[:], f8[:])", cache=True)
+def _orifice_residuals(m, p_in, h_in, rho, m_out, p_out, h_out, dp_coef, g_dz, res, basis):
+    dp_total = dp_coef * m * m / rho + rho * g_dz
+
+    res[0] = m_out - m
+    res[1] = h_out - h_in
+    res[2] = (p_in - p_out) - dp_total
+    basis[0] = m
+    basis[1] = h_in
+    basis[2] = p_in
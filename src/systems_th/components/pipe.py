@@ -1,16 +1,19 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Optional
-
+from dataclasses import dataclass, field
 import math
+from typing import Optional, Tuple
+
+import numpy as np
 
 from .base import Component
-from ..equation import Equation
-from ..correlations.pressure_drop import dp_pipe
+from .._jit import njit
+from ..correlations.friction import haaland_friction_factor_rough, haaland_friction_factor_rough_grad, haaland_roughness
+from ..correlations.pressure_drop import _dp_friction_chisholm
+from ..props.derivatives import rho_ph_partials
 
 
-@dataclass
+@dataclass(slots=True)
 class Pipe(Component):
     """A 1-in/1-out pipe with friction + form loss + gravity + acceleration.
 
@@ -37,6 +40,8 @@ class Pipe(Component):
         "homogeneous" (default) or "chisholm".
     include_acceleration:
         Include acceleration dp term based on inlet/outlet densities.
+    include_gravity:
+        Include the elevation dp term (rho_avg*g*dz).
     """
 
     L: float = 1.0
@@ -48,46 +53,343 @@ class Pipe(Component):
     Q: float = 0.0
     two_phase_friction: str = "homogeneous"
     include_acceleration: bool = True
+    include_gravity: bool = True
 
-    def equations(self, props) -> List[Equation]:
-        inc = self._req_in("in")
-        out = self._req_out("out")
+    # Constants derived in _precompute. A disabled term gets a zero coefficient
+    # (inv_A = 0 without flow area, L_over_D = 0 without friction length, g*dz = 0
+    # without gravity).
+    _A: float = field(default=0.0, init=False, repr=False, compare=False)
+    _homogeneous: bool = field(default=True, init=False, repr=False, compare=False)
+    # (D, (eps/D/3.7)**1.11, L/D, K, 1/A, g*dz): trailing arguments of _pipe_dp
+    _dp_consts: tuple = field(default=(), init=False, repr=False, compare=False)
+    # Port state gather (see _bind_ports): state array, indices of in m/p/h, out m/p/h
+    _state: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _port_idx: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
 
-        m = inc.m.value
-        p_in = inc.p.value
-        h_in = inc.h.value
+    def _precompute(self) -> None:
+        self._A, self._dp_consts = _hydraulic_consts(
+            self.L, self.D, self.A, self.eps, self.K, self.dz if self.include_gravity else 0.0
+        )
+        self._homogeneous = self.two_phase_friction.lower() != "chisholm"
 
-        # Mass
-        eqs: List[Equation] = [
-            Equation(f"{self.name}.mass", out.m.value - m, scale=max(1.0, abs(m))),
-        ]
+    def bind_slots(self, offset: int, residual: np.ndarray, basis: np.ndarray) -> None:
+        Component.bind_slots(self, offset, residual, basis)  # zero-arg super() breaks with slots=True
+        _bind_ports(self)
+
+    def _equation_names(self) -> Tuple[str, ...]:
+        return ("mass", "energy", "dp")
+
+    def residual_floors(self) -> Tuple[float, ...]:
+        return (1.0, 1e5, 1e5)
+
+    def write_residuals(self, props, res: np.ndarray, basis: np.ndarray) -> None:
+        m, p_in, h_in, m_out, p_out, h_out = _read_ports(self)
 
-        # Energy: h_out = h_in + Q/m (adiabatic if Q=0)
-        dh = self.Q / m if abs(m) > 1e-9 else 0.0
-        h_out_target = h_in + dh
-        eqs.append(Equation(f"{self.name}.energy", out.h.value - h_out_target, scale=max(1e5, abs(h_out_target))))
-
-        # Momentum: p_in - p_out = Δp
-        p_out = out.p.value
-        h_out = out.h.value
-
-        dp = dp_pipe(
-            m_dot=m,
-            p_in=p_in,
-            h_in=h_in,
-            p_out=p_out,
-            h_out=h_out,
-            props=props,
-            L=self.L,
-            D=self.D,
-            eps=self.eps,
-            K=self.K,
-            dz=self.dz,
-            A=self.A,
-            two_phase_friction=self.two_phase_friction,
-            include_acceleration=self.include_acceleration,
-            include_gravity=True,
+        _pipe_residuals(
+            m, m_out, p_in, h_in, p_out, h_out, float(self.Q),
+            *_dp_args(self, props, m, p_in, h_in, p_out, h_out), res, basis,
         )
-        eqs.append(Equation(f"{self.name}.dp", (p_in - p_out) - dp.total, scale=max(1e5, abs(p_in))))
 
-        return eqs
+    def _residual_source(self, bind):
+        return _pipe_source(self, bind, repr(float(self.Q)))
+
+    def jacobian_entries(self, props):
+        return _pipe_jacobian(self, props, self._req_in("in"), self._req_out("out"), float(self.Q))
+
+
+def _bind_ports(comp) -> None:
+    """Cache ``comp._state``/``comp._port_idx`` for :func:`_read_ports` (at ``bind_slots``).
+
+    Only when the in/out m, p, h Variables all live in one state array; otherwise
+    (ports missing or unbound) the values are read through the Variables.
+    """
+    comp._state = comp._port_idx = None
+    inc = comp.inlets.get("in")
+    out = comp.outlets.get("out")
+    if inc is None or out is None:
+        return
+    vars_ = (inc.m, inc.p, inc.h, out.m, out.p, out.h)
+    store = vars_[0]._store
+    if store is not None and all(v._store is store for v in vars_):
+        comp._state = store
+        comp._port_idx = np.array([v.idx for v in vars_], dtype=np.intp)
+
+
+def _read_ports(comp) -> list:
+    """``[m_in, p_in, h_in, m_out, p_out, h_out]`` of a pipe-like component, as floats.
+
+    One fancy-indexed gather from the network state array once bound, instead of six
+    ``conn.var.value`` property reads.
+    """
+    idx = comp._port_idx
+    if idx is not None:
+        return comp._state[idx].tolist()
+    inc = comp._req_in("in")
+    out = comp._req_out("out")
+    return [inc.m.value, inc.p.value, inc.h.value, out.m.value, out.p.value, out.h.value]
+
+
+def _hydraulic_consts(L, D, A, eps, K, dz) -> Tuple[float, tuple]:
+    """Flow area (pi*D^2/4 if A is None) and the constant trailing arguments of _pipe_dp."""
+    D = float(D)
+    A = float(A) if A is not None else math.pi * (D ** 2) / 4.0
+    has_fric = D > 0 and L > 0
+    return A, (
+        D,
+        haaland_roughness(float(eps) / D) if D > 0 else 0.0,
+        float(L) / D if has_fric else 0.0,
+        float(K),
+        1.0 / A if A > 0 else 0.0,
+        9.80665 * float(dz),
+    )
+
+
+def _dp_args(
+    comp, props, m: float, p_in: float, h_in: float, p_out: float, h_out: float,
+    rho_out: Optional[float] = None,
+):
+    """Property-dependent arguments of :func:`_pipe_dp` (Python level) + constants.
+
+    ``comp`` is a pipe-like component carrying ``_A``, ``_homogeneous``,
+    ``_dp_consts`` (see :func:`_hydraulic_consts`) and the L, D, eps, include_acceleration
+    parameters.
+    ``rho_out`` may pass an outlet density the caller already has.
+    """
+    # Mid-state for friction, form and gravity (as in dp_pipe)
+    p_avg = 0.5 * (p_in + p_out)
+    h_avg = 0.5 * (h_in + h_out)
+    if comp._homogeneous:
+        state = props.state_ph(p_avg, h_avg)
+        rho_avg, mu_avg = state.rho, state.mu
+        dp_fric = 0.0
+    else:
+        rho_avg = props.rho_ph(p_avg, h_avg)
+        mu_avg = 0.0
+        dp_fric = _dp_friction_chisholm(
+            m, p_avg, h_avg, props, comp.L, comp.D, comp.eps, comp._A, *comp._dp_consts[1:3],
+        )
+    if comp.include_acceleration:
+        rho_in = props.rho_ph(p_in, h_in)
+        if rho_out is None:
+            rho_out = props.rho_ph(p_out, h_out)
+    else:
+        rho_in = rho_out = 0.0
+    return (rho_avg, mu_avg, rho_in, rho_out, dp_fric, comp._homogeneous) + comp._dp_consts
+
+
+def _pipe_source(comp, bind, Q: str, alpha_target: Optional[float] = None) -> list:
+    """Fused-residual source (see ``Component._residual_source``) of a pipe-like component.
+
+    Same computation as ``write_residuals`` via :func:`_dp_args`, but the friction model,
+    the acceleration flag and the optional outlet void target (row 3) are resolved here,
+    so the generated block holds only the branch in use and the constants as literals.
+    ``Q`` is the source expression of the heat input.
+    """
+    inc = comp._req_in("in")
+    out = comp._req_out("out")
+    lines = [
+        f"m = {bind.value(inc.m)}",
+        f"p_in = {bind.value(inc.p)}",
+        f"h_in = {bind.value(inc.h)}",
+        f"p_out = {bind.value(out.p)}",
+        f"h_out = {bind.value(out.h)}",
+        "p_avg = 0.5 * (p_in + p_out)",
+        "h_avg = 0.5 * (h_in + h_out)",
+    ]
+    if comp._homogeneous:
+        lines += ["st = props.state_ph(p_avg, h_avg)", "rho_avg, mu_avg, dp_fric = st.rho, st.mu, 0.0"]
+    else:
+        fric = bind(_dp_friction_chisholm, "f")
+        args = ", ".join(repr(float(v)) for v in (comp.L, comp.D, comp.eps, comp._A) + comp._dp_consts[1:3])
+        lines += [
+            "rho_avg, mu_avg = rho_ph(p_avg, h_avg), 0.0",
+            f"dp_fric = {fric}(m, p_avg, h_avg, props, {args})",
+        ]
+    if alpha_target is not None:
+        lines.append("st_out = props.state_ph(p_out, h_out)")
+    if comp.include_acceleration:
+        lines += [
+            "rho_in = rho_ph(p_in, h_in)",
+            "rho_out = st_out.rho" if alpha_target is not None else "rho_out = rho_ph(p_out, h_out)",
+        ]
+    else:
+        lines.append("rho_in = rho_out = 0.0")
+    consts = ", ".join(repr(c) for c in comp._dp_consts)
+    lines.append(
+        f"{bind(_pipe_residuals, 'k')}(m, {bind.value(out.m)}, p_in, h_in, p_out, h_out, {Q}, rho_avg, mu_avg,"
+        f" rho_in, rho_out, dp_fric, {comp._homogeneous!r}, {consts}, {bind(comp._res, 'r')}, {bind(comp._basis, 'b')})"
+    )
+    if alpha_target is not None:
+        lines.append(f"r[{comp._offset + 3}] = st_out.alpha - {float(alpha_target)!r}")
+    return lines
+
+
+def _dp_gradient(comp, props, m: float, p_in: float, h_in: float, p_out: float, h_out: float):
+    """``(dp, [d/dm, d/dp_in, d/dh_in, d/dp_out, d/dh_out])`` of the homogeneous dp model.
+
+    Closed form in the properties (:func:`_pipe_dp_grad`); only the property partials
+    are differenced: one pair of extra ``state_ph`` calls at the mid-state (rho and mu
+    together) and ``rho_ph_partials`` at the ports when acceleration is included.
+    """
+    p_avg = 0.5 * (p_in + p_out)
+    h_avg = 0.5 * (h_in + h_out)
+    st = props.state_ph(p_avg, h_avg)
+    step_p = 1e-6 * max(1.0, abs(p_avg))
+    step_h = 1e-6 * max(1.0, abs(h_avg))
+    st_p = props.state_ph(p_avg + step_p, h_avg)
+    st_h = props.state_ph(p_avg, h_avg + step_h)
+    if comp.include_acceleration:
+        rho_in, drhoi_dp, drhoi_dh = rho_ph_partials(props, p_in, h_in)
+        rho_out, drhoo_dp, drhoo_dh = rho_ph_partials(props, p_out, h_out)
+    else:
+        rho_in = rho_out = drhoi_dp = drhoi_dh = drhoo_dp = drhoo_dh = 0.0
+
+    dp, d_m, d_rho, d_mu, d_rho_in, d_rho_out = _pipe_dp_grad(
+        m, st.rho, st.mu, rho_in, rho_out, *comp._dp_consts
+    )
+    # Mid-state sensitivities; p_avg and h_avg move by half of each port change
+    mid_p = 0.5 * (d_rho * (st_p.rho - st.rho) + d_mu * (st_p.mu - st.mu)) / step_p
+    mid_h = 0.5 * (d_rho * (st_h.rho - st.rho) + d_mu * (st_h.mu - st.mu)) / step_h
+    return dp, [
+        d_m,
+        mid_p + d_rho_in * drhoi_dp,
+        mid_h + d_rho_in * drhoi_dh,
+        mid_p + d_rho_out * drhoo_dp,
+        mid_h + d_rho_out * drhoo_dh,
+    ]
+
+
+def _pipe_jacobian(comp, props, inc, out, Q: float, Q_var=None):
+    """Jacobian entries of the mass/energy/dp rows written by :func:`_pipe_residuals`.
+
+    Mass and energy rows are closed form. The dp row is analytic for homogeneous
+    friction (:func:`_dp_gradient`); the Chisholm model forward-differences the dp model
+    w.r.t. its five local arguments only. With ``Q_var`` the energy row also gets its
+    derivative w.r.t. the heat input.
+    """
+    m, p_in, h_in, m_out, p_out, h_out = _read_ports(comp)
+    state = [m, p_in, h_in, p_out, h_out]
+
+    if comp._homogeneous:
+        dp0, grad = _dp_gradient(comp, props, *state)
+    else:
+        dp0 = _pipe_dp(m, *_dp_args(comp, props, *state))
+        grad = []
+        for i, x0 in enumerate(state):
+            step = 1e-6 * max(1.0, abs(x0))
+            state[i] = x0 + step
+            grad.append((_pipe_dp(state[0], *_dp_args(comp, props, *state)) - dp0) / step)
+            state[i] = x0
+
+    # Residual scales follow the state (max(floor, |x|)); their derivatives enter via
+    # d(N/s) = (dN - r*ds)/s so the rows match finite differences away from the solution
+    has_m = abs(m) > 1e-9
+    dh = Q / m if has_m else 0.0
+    ddh_dm = -Q / (m * m) if has_m else 0.0
+    ddh_dQ = 1.0 / m if has_m else 0.0
+    h_t = h_in + dh
+
+    m_scale = max(1.0, abs(m))
+    h_scale = max(1e5, abs(h_t))
+    p_scale = max(1e5, abs(p_in))
+    r_m = (m_out - m) / m_scale
+    r_h = (h_out - h_t) / h_scale
+    r_p = ((p_in - p_out) - dp0) / p_scale
+    dsm = np.sign(m) if abs(m) > 1.0 else 0.0
+    dsh = np.sign(h_t) if abs(h_t) > 1e5 else 0.0
+    dsp = np.sign(p_in) if abs(p_in) > 1e5 else 0.0
+
+    entries = [
+        (0, out.m, 1.0 / m_scale),
+        (0, inc.m, (-1.0 - r_m * dsm) / m_scale),
+        (1, out.h, 1.0 / h_scale),
+        (1, inc.h, (-1.0 - r_h * dsh) / h_scale),
+        (1, inc.m, (-ddh_dm - r_h * dsh * ddh_dm) / h_scale),
+    ]
+    if Q_var is not None:
+        entries.append((1, Q_var, (-ddh_dQ - r_h * dsh * ddh_dQ) / h_scale))
+    entries += [
+        (2, inc.m, -grad[0] / p_scale),
+        (2, inc.p, (1.0 - grad[1] - r_p * dsp) / p_scale),
+        (2, inc.h, -grad[2] / p_scale),
+        (2, out.p, (-1.0 - grad[3]) / p_scale),
+        (2, out.h, -grad[4] / p_scale),
+    ]
+    return entries
+
+
+@njit("f8(f8, f8, f8, f8, f8, f8, b1, f8, f8, f8, f8, f8, f8)", cache=True)
+def _pipe_dp(m, rho_avg, mu_avg, rho_in, rho_out, dp_fric, homogeneous, D, rough, L_over_D, K, inv_A, g_dz):
+    # dp_pipe without the property calls: friction (homogeneous, or dp_fric as given)
+    # + form + gravity + acceleration. rho_in = rho_out = 0 disables acceleration.
+    G = m * inv_A
+    half_G2 = 0.5 * G * G
+    if homogeneous:
+        if rho_avg <= 0.0 or mu_avg <= 0.0:
+            dp_fric = 0.0
+        else:
+            f = haaland_friction_factor_rough(G * D / mu_avg, rough)
+            dp_fric = f * L_over_D * half_G2 / rho_avg
+    dp_form = K * half_G2 / rho_avg if rho_avg > 0.0 else 0.0
+    dp_grav = rho_avg * g_dz
+    if rho_in <= 0.0 or rho_out <= 0.0:
+        dp_acc = 0.0
+    else:
+        dp_acc = 2.0 * half_G2 * (1.0 / rho_out - 1.0 / rho_in)
+    return dp_fric + dp_form + dp_grav + dp_acc
+
+
+@njit("UniTuple(f8, 6)(f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8)", cache=True)
+def _pipe_dp_grad(m, rho_avg, mu_avg, rho_in, rho_out, D, rough, L_over_D, K, inv_A, g_dz):
+    # Homogeneous _pipe_dp and its partials w.r.t. m, rho_avg, mu_avg, rho_in, rho_out
+    # (same guards: a guarded-off term contributes neither value nor slope)
+    G = m * inv_A
+    half_G2 = 0.5 * G * G
+    dG2_dm = G * inv_A  # d(half_G2)/dm
+    dp_fric = d_m = d_rho = d_mu = 0.0
+    if rho_avg > 0.0 and mu_avg > 0.0:
+        Re = G * D / mu_avg
+        f, df_dRe = haaland_friction_factor_rough_grad(Re, rough)
+        c = L_over_D / rho_avg
+        dp_fric = f * c * half_G2
+        d_m = c * (df_dRe * D * inv_A / mu_avg * half_G2 + f * dG2_dm)
+        d_mu = -c * df_dRe * Re / mu_avg * half_G2
+        d_rho = -dp_fric / rho_avg
+    dp_form = 0.0
+    if rho_avg > 0.0:
+        dp_form = K * half_G2 / rho_avg
+        d_m += K * dG2_dm / rho_avg
+        d_rho -= dp_form / rho_avg
+    dp_grav = rho_avg * g_dz
+    d_rho += g_dz
+    dp_acc = d_rho_in = d_rho_out = 0.0
+    if rho_in > 0.0 and rho_out > 0.0:
+        dp_acc = 2.0 * half_G2 * (1.0 / rho_out - 1.0 / rho_in)
+        d_m += 2.0 * dG2_dm * (1.0 / rho_out - 1.0 / rho_in)
+        d_rho_in = 2.0 * half_G2 / (rho_in * rho_in)
+        d_rho_out = -2.0 * half_G2 / (rho_out * rho_out)
+    return dp_fric + dp_form + dp_grav + dp_acc, d_m, d_rho, d_mu, d_rho_in, d_rho_out
+
+
+@njit(
+    "void(f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, b1, f8, f8, f8, f8, f8, f8, f8[:], f8[:])",
+    cache=True,
+)
+def _pipe_residuals(
+    m, m_out, p_in, h_in, p_out, h_out, Q,
+    rho_avg, mu_avg, rho_in, rho_out, dp_fric, homogeneous, D, rough, L_over_D, K, inv_A, g_dz, res, basis,
+):
+    # Mass
+    res[0] = m_out - m
+    basis[0] = m
+
+    # Energy: h_out = h_in + Q/m (adiabatic if Q=0)
+    dh = Q / m if abs(m) > 1e-9 else 0.0
+    h_out_target = h_in + dh
+    res[1] = h_out - h_out_target
+    basis[1] = h_out_target
+
+    # Momentum: p_in - p_out = dp
+    dp = _pipe_dp(m, rho_avg, mu_avg, rho_in, rho_out, dp_fric, homogeneous, D, rough, L_over_D, K, inv_A, g_dz)
+    res[2] = (p_in - p_out) - dp
+    basis[2] = p_in
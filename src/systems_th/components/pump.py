@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Optional, Tuple
+
+import numpy as np
 
 from .base import Component
-from ..equation import Equation
+from ..props.derivatives import rho_ph_partials
 
 
-@dataclass
+@dataclass(slots=True)
 class Pump(Component):
     """Pump model with efficiency.
 
@@ -23,7 +25,13 @@ class Pump(Component):
     p_out: Optional[float] = None
     dp: Optional[float] = None
 
-    def equations(self, props) -> List[Equation]:
+    def _equation_names(self) -> Tuple[str, ...]:
+        return ("mass", "p_out", "energy")
+
+    def residual_floors(self) -> Tuple[float, ...]:
+        return (1.0, 1e5, 1e5)
+
+    def write_residuals(self, props, res: np.ndarray, basis: np.ndarray) -> None:
         inc = self._req_in("in")
         out = self._req_out("out")
 
@@ -40,11 +48,77 @@ class Pump(Component):
         dh = (p_out - p_in) / max(1e-9, rho_in * self.eta)
         h_out = h_in + dh
 
-        eqs: List[Equation] = []
-        eqs.append(Equation(f"{self.name}.mass", out.m.value - m, scale=max(1.0, abs(m))))
-        eqs.append(Equation(f"{self.name}.p_out", out.p.value - p_out, scale=max(1e5, abs(p_out))))
-        eqs.append(Equation(f"{self.name}.energy", out.h.value - h_out, scale=max(1e5, abs(h_out))))
-        return eqs
+        res[0] = out.m.value - m
+        res[1] = out.p.value - p_out
+        res[2] = out.h.value - h_out
+        basis[0] = m
+        basis[1] = p_out
+        basis[2] = h_out
+
+    def _residual_source(self, bind):
+        if self.p_out is None and self.dp is None:
+            return None  # write_residuals raises the configuration error
+        inc = self._req_in("in")
+        out = self._req_out("out")
+        o = self._offset
+        p_out = f"{float(self.p_out)!r}" if self.p_out is not None else f"p_in + {float(self.dp)!r}"
+        return [
+            f"m = {bind.value(inc.m)}",
+            f"p_in = {bind.value(inc.p)}",
+            f"h_in = {bind.value(inc.h)}",
+            f"p_out = {p_out}",
+            f"h_out = h_in + (p_out - p_in) / max(1e-9, rho_ph(p_in, h_in) * {float(self.eta)!r})",
+            f"r[{o}] = {bind.value(out.m)} - m",
+            f"r[{o + 1}] = {bind.value(out.p)} - p_out",
+            f"r[{o + 2}] = {bind.value(out.h)} - h_out",
+            f"b[{o}] = m",
+            f"b[{o + 1}] = p_out",
+            f"b[{o + 2}] = h_out",
+        ]
+
+    def jacobian_entries(self, props):
+        if self.p_out is None and self.dp is None:
+            return None  # finite-differenced rows report the configuration error
+        inc = self._req_in("in")
+        out = self._req_out("out")
+
+        m = inc.m.value
+        p_in = inc.p.value
+        h_in = inc.h.value
+        fixed_p = self.p_out is not None
+        p_out = self.p_out if fixed_p else (p_in + float(self.dp))
+
+        rho_in, drho_dp, drho_dh = rho_ph_partials(props, p_in, h_in)
+        denom = max(1e-9, rho_in * self.eta)
+        rise = p_out - p_in
+        h_out = h_in + rise / denom
+        # d(rise/denom) through rho_in (the 1e-9 guard is never active for water)
+        dq = -rise / (denom * rho_in)
+        dh_dh = 1.0 + dq * drho_dh
+        dh_dp = (-1.0 / denom if fixed_p else 0.0) + dq * drho_dp
+
+        # Scales follow the state; d(N/s) = (dN - r*ds)/s as in Separator
+        m_scale = max(1.0, abs(m))
+        p_scale = max(1e5, abs(p_out))
+        h_scale = max(1e5, abs(h_out))
+        r_m = (out.m.value - m) / m_scale
+        r_p = (out.p.value - p_out) / p_scale
+        r_h = (out.h.value - h_out) / h_scale
+        dsm = np.sign(m) if abs(m) > 1.0 else 0.0
+        dsp = np.sign(p_out) if abs(p_out) > 1e5 else 0.0
+        dsh = np.sign(h_out) if abs(h_out) > 1e5 else 0.0
+
+        entries = [
+            (0, out.m, 1.0 / m_scale),
+            (0, inc.m, (-1.0 - r_m * dsm) / m_scale),
+            (1, out.p, 1.0 / p_scale),
+            (2, out.h, 1.0 / h_scale),
+            (2, inc.p, (-dh_dp - r_h * dsh * dh_dp) / h_scale),
+            (2, inc.h, (-dh_dh - r_h * dsh * dh_dh) / h_scale),
+        ]
+        if not fixed_p:
+            entries.append((1, inc.p, (-1.0 - r_p * dsp) / p_scale))
+        return entries
 
     def shaft_power(self) -> float:
         inc = self._req_in("in")
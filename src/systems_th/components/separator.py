@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List
+from typing import Tuple
+
+import numpy as np
 
 from .base import Component
-from ..equation import Equation
+from ..props.derivatives import partials_ph
 
 
-@dataclass
+@dataclass(slots=True)
 class Separator(Component):
     """Steam separator / phase splitter with two outlets.
 
@@ -30,7 +32,13 @@ class Separator(Component):
     x_vap_target: float = 0.999
     x_liq_target: float = 0.001
 
-    def equations(self, props) -> List[Equation]:
+    def _equation_names(self) -> Tuple[str, ...]:
+        return ("p_vap", "p_liq", "h_vap_target", "h_liq_target", "mass", "energy")
+
+    def residual_floors(self) -> Tuple[float, ...]:
+        return (1e5, 1e5, 1e5, 1e5, 1.0, 1e6)
+
+    def write_residuals(self, props, res: np.ndarray, basis: np.ndarray) -> None:
         inc = self._req_in("in")
         vap = self._req_out("vap")
         liq = self._req_out("liq")
@@ -44,18 +52,70 @@ class Separator(Component):
         h_v = props.h_px(p_out, self.x_vap_target)
         h_l = props.h_px(p_out, self.x_liq_target)
 
-        eqs: List[Equation] = []
-        eqs.append(Equation(f"{self.name}.p_vap", vap.p.value - p_out, scale=max(1e5, abs(p_out))))
-        eqs.append(Equation(f"{self.name}.p_liq", liq.p.value - p_out, scale=max(1e5, abs(p_out))))
-        eqs.append(Equation(f"{self.name}.h_vap_target", vap.h.value - h_v, scale=max(1e5, abs(h_v))))
-        eqs.append(Equation(f"{self.name}.h_liq_target", liq.h.value - h_l, scale=max(1e5, abs(h_l))))
-
-        eqs.append(Equation(f"{self.name}.mass", m_in - (vap.m.value + liq.m.value), scale=max(1.0, abs(m_in))))
-        eqs.append(
-            Equation(
-                f"{self.name}.energy",
-                m_in * h_in - (vap.m.value * vap.h.value + liq.m.value * liq.h.value),
-                scale=max(1e6, abs(m_in * h_in)),
-            )
-        )
-        return eqs
+        res[0] = vap.p.value - p_out
+        res[1] = liq.p.value - p_out
+        res[2] = vap.h.value - h_v
+        res[3] = liq.h.value - h_l
+
+        res[4] = m_in - (vap.m.value + liq.m.value)
+        res[5] = m_in * h_in - (vap.m.value * vap.h.value + liq.m.value * liq.h.value)
+
+        basis[0] = p_out
+        basis[1] = p_out
+        basis[2] = h_v
+        basis[3] = h_l
+        basis[4] = m_in
+        basis[5] = m_in * h_in
+
+    def jacobian_entries(self, props):
+        inc = self._req_in("in")
+        vap = self._req_out("vap")
+        liq = self._req_out("liq")
+
+        m_in = inc.m.value
+        h_in = inc.h.value
+        p_out = inc.p.value - self.dp
+
+        h_v, dhv_dp, _ = partials_ph(props.h_px, p_out, self.x_vap_target)
+        h_l, dhl_dp, _ = partials_ph(props.h_px, p_out, self.x_liq_target)
+
+        # Residual scales follow the state (max(floor, |x|)); their derivatives enter via
+        # d(N/s) = (dN - r*ds)/s so the rows match finite differences away from the solution
+        p_scale = max(1e5, abs(p_out))
+        hv_scale = max(1e5, abs(h_v))
+        hl_scale = max(1e5, abs(h_l))
+        m_scale = max(1.0, abs(m_in))
+        e_in = m_in * h_in
+        e_scale = max(1e6, abs(e_in))
+
+        r_pv = (vap.p.value - p_out) / p_scale
+        r_pl = (liq.p.value - p_out) / p_scale
+        r_hv = (vap.h.value - h_v) / hv_scale
+        r_hl = (liq.h.value - h_l) / hl_scale
+        r_m = (m_in - (vap.m.value + liq.m.value)) / m_scale
+        r_e = (e_in - (vap.m.value * vap.h.value + liq.m.value * liq.h.value)) / e_scale
+        dsp = np.sign(p_out) if abs(p_out) > 1e5 else 0.0
+        dshv = np.sign(h_v) * dhv_dp if abs(h_v) > 1e5 else 0.0
+        dshl = np.sign(h_l) * dhl_dp if abs(h_l) > 1e5 else 0.0
+        dsm = np.sign(m_in) if abs(m_in) > 1.0 else 0.0
+        dse = np.sign(e_in) if abs(e_in) > 1e6 else 0.0
+
+        return [
+            (0, vap.p, 1.0 / p_scale),
+            (0, inc.p, (-1.0 - r_pv * dsp) / p_scale),
+            (1, liq.p, 1.0 / p_scale),
+            (1, inc.p, (-1.0 - r_pl * dsp) / p_scale),
+            (2, vap.h, 1.0 / hv_scale),
+            (2, inc.p, (-dhv_dp - r_hv * dshv) / hv_scale),
+            (3, liq.h, 1.0 / hl_scale),
+            (3, inc.p, (-dhl_dp - r_hl * dshl) / hl_scale),
+            (4, inc.m, (1.0 - r_m * dsm) / m_scale),
+            (4, vap.m, -1.0 / m_scale),
+            (4, liq.m, -1.0 / m_scale),
+            (5, inc.m, (1.0 - r_e * dse) * h_in / e_scale),
+            (5, inc.h, (1.0 - r_e * dse) * m_in / e_scale),
+            (5, vap.m, -vap.h.value / e_scale),
+            (5, vap.h, -vap.m.value / e_scale),
+            (5, liq.m, -liq.h.value / e_scale),
+            (5, liq.h, -liq.m.value / e_scale),
+        ]
@@ -1,9 +1,10 @@
 from .friction import haaland_friction_factor
-from .pressure_drop import dp_pipe
+from .pressure_drop import dp_pipe, dp_pipe_vec
 from .heat_transfer import htc_dittus_boelter
 
 __all__ = [
     "haaland_friction_factor",
     "dp_pipe",
+    "dp_pipe_vec",
     "htc_dittus_boelter",
 ]
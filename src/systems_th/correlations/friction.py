@@ -2,12 +2,72 @@ from __future__ import annotations
 
 import math
 
+import numpy as np
 
-def haaland_friction_factor(Re: float, eps_rel: float) -> float:
-    """Haaland explicit approximation for Darcy friction factor."""
-    Re = abs(Re)
+from .._jit import njit
+
+# log10(x) = log2(x) * log10(2); log2 has the cheaper libm path
+_LOG10_2 = 0.30102999566398114
+# log10(e) = 1/ln(10), for d(log10 s)/ds
+_LOG10_E = 0.4342944819032518
+
+
+@njit("float64(float64)", cache=True)
+def haaland_roughness(eps_rel: float) -> float:
+    """Roughness term ``(eps_rel/3.7)**1.11`` of the Haaland formula.
+
+    Constant per pipe, so components evaluate it once and call
+    :func:`haaland_friction_factor_rough` in the residual hot path.
+    """
+    return (eps_rel / 3.7) ** 1.11
+
+
+@njit("float64(float64, float64)", cache=True)
+def haaland_friction_factor_rough(Re: float, rough: float) -> float:
+    """Haaland friction factor from a precomputed :func:`haaland_roughness` term."""
+    Re = math.fabs(Re)
     if Re <= 0.0:
         return 0.0
     if Re < 2300.0:
         return 64.0 / Re
-    return (-1.8 * math.log10((eps_rel / 3.7) ** 1.11 + 6.9 / Re)) ** -2
+    return (-1.8 * _LOG10_2 * math.log2(rough + 6.9 / Re)) ** -2
+
+
+@njit("UniTuple(float64, 2)(float64, float64)", cache=True)
+def haaland_friction_factor_rough_grad(Re: float, rough: float):
+    """``(f, df/dRe)`` of :func:`haaland_friction_factor_rough` (f is even in Re)."""
+    a = math.fabs(Re)
+    if a <= 0.0:
+        return 0.0, 0.0
+    if a < 2300.0:
+        f = 64.0 / a
+        df = -f / a
+    else:
+        s = rough + 6.9 / a
+        u = -1.8 * _LOG10_2 * math.log2(s)
+        f = u ** -2
+        # f = u^-2 with du/da = 1.8 * 6.9 / (ln(10) * s * a^2)
+        df = -2.0 * f / u * (1.8 * 6.9 * _LOG10_E) / (s * a * a)
+    return f, (df if Re > 0.0 else -df)
+
+
+@njit("float64(float64, float64)", cache=True)
+def haaland_friction_factor(Re: float, eps_rel: float) -> float:
+    """Haaland explicit approximation for Darcy friction factor.
+
+    Compiled eagerly (explicit signature) when Numba is installed.
+    """
+    return haaland_friction_factor_rough(Re, haaland_roughness(eps_rel))
+
+
+def haaland_friction_factor_vec(Re, eps_rel) -> np.ndarray:
+    """:func:`haaland_friction_factor` over broadcastable arrays.
+
+    The laminar and zero-flow branches are selected with ``np.where``.
+    """
+    Re = np.abs(np.asarray(Re, dtype=float))
+    eps_rel = np.asarray(eps_rel, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        turb = (-1.8 * np.log10((eps_rel / 3.7) ** 1.11 + 6.9 / Re)) ** -2
+        f = np.where(Re < 2300.0, 64.0 / Re, turb)
+    return np.where(Re > 0.0, f, 0.0)
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import math
 
+from .._jit import njit
+
 
 def htc_dittus_boelter(G: float, D: float, mu: float, cp: float, k: float, n: float = 0.4) -> float:
     """Single-phase turbulent internal convection (Dittus–Boelter).
@@ -30,15 +32,21 @@ def htc_dittus_boelter(G: float, D: float, mu: float, cp: float, k: float, n: fl
     -----
     Valid (roughly): Re > 10^4, 0.7 < Pr < 160, L/D > 10.
     """
-    if D <= 0 or mu <= 0 or k <= 0 or cp <= 0:
+    return _htc_dittus_boelter(G, D, mu, cp, k, n)
+
+
+@njit("float64(float64, float64, float64, float64, float64, float64)", cache=True)
+def _htc_dittus_boelter(G: float, D: float, mu: float, cp: float, k: float, n: float) -> float:
+    # Compiled kernel (no default arguments with an explicit signature); callable from
+    # other njit kernels.
+    if D <= 0.0 or mu <= 0.0 or k <= 0.0 or cp <= 0.0:
         return 0.0
-    Re = abs(G * D / mu)
+    Re = math.fabs(G * D / mu)
     Pr = cp * mu / k
-    if Re < 2300:
-        # Laminar fallback (constant wall temperature, fully developed): Nu=3.66
-        Nu = 3.66
-    else:
-        Nu = 0.023 * (Re ** 0.8) * (Pr ** n)
+    # Laminar fallback (constant wall temperature, fully developed): Nu=3.66.
+    # Conditional expression rather than if/else so the kernel compiles to a select.
+    Nu_turb = 0.023 * (Re ** 0.8) * (Pr ** n)
+    Nu = 3.66 if Re < 2300.0 else Nu_turb
     return Nu * k / D
 
 
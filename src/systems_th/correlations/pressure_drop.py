@@ -1,79 +1,109 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
 import math
+from typing import NamedTuple, Union
 
-from .friction import haaland_friction_factor
+import numpy as np
 
+from .._jit import njit
+from ..props.saturation import SatBundle
+from .friction import haaland_friction_factor_rough, haaland_friction_factor_vec, haaland_roughness
 
-@dataclass(frozen=True)
-class DpBreakdown:
-    dp_fric: float
-    dp_form: float
-    dp_grav: float
-    dp_acc: float
+
+class DpBreakdown(NamedTuple):
+    """Pressure-drop terms [Pa] (a tuple, so building one per dp_pipe call is cheap).
+
+    Floats from :func:`dp_pipe`, arrays over the segments from :func:`dp_pipe_vec`.
+    """
+
+    dp_fric: Union[float, np.ndarray]
+    dp_form: Union[float, np.ndarray]
+    dp_grav: Union[float, np.ndarray]
+    dp_acc: Union[float, np.ndarray]
 
     @property
-    def total(self) -> float:
-        return self.dp_fric + self.dp_form + self.dp_grav + self.dp_acc
+    def total(self) -> Union[float, np.ndarray]:
+        dp_fric, dp_form, dp_grav, dp_acc = self
+        return dp_fric + dp_form + dp_grav + dp_acc
+
+
+_PI_4 = 0.25 * math.pi
 
 
 def _area_from_D(D: float) -> float:
-    return math.pi * (D ** 2) / 4.0
+    return _PI_4 * D * D
 
 
-def _dp_form_loss(m_dot: float, rho: float, K: float, A: float) -> float:
-    if A <= 0 or rho <= 0:
-        return 0.0
-    G = m_dot / A
-    return K * (G ** 2) / (2.0 * rho)
+# The numeric helpers below are Numba kernels (eager signatures) when Numba is installed,
+# so dp_pipe and the Chisholm path make one compiled call per term (homogeneous friction
+# and form loss share one call). dp_pipe evaluates the
+# velocity head G^2/2 and the reciprocal densities once and hands them to every term; a
+# non-positive area or density is passed as a zero, which zeroes the term it guards.
+
 
+@njit("f8(f8, f8, f8)", cache=True)
+def _dp_form_loss(half_G2: float, inv_rho: float, K: float) -> float:
+    return K * half_G2 * inv_rho
 
+
+@njit("f8(f8, f8)", cache=True)
 def _dp_gravity(rho: float, dz: float) -> float:
     return rho * 9.80665 * dz
 
 
-def _dp_acceleration_same_area(m_dot: float, A: float, rho_in: float, rho_out: float) -> float:
-    if A <= 0:
-        return 0.0
-    G = m_dot / A
-    # dp_acc = G^2(1/rho_out - 1/rho_in)
-    if rho_in <= 0 or rho_out <= 0:
+@njit("f8(f8, f8, f8)", cache=True)
+def _dp_acceleration_same_area(half_G2: float, inv_rho_in: float, inv_rho_out: float) -> float:
+    # dp_acc = G^2(1/rho_out - 1/rho_in); zero unless both densities are positive
+    if inv_rho_in <= 0 or inv_rho_out <= 0:
         return 0.0
-    return (G ** 2) * (1.0 / rho_out - 1.0 / rho_in)
+    return 2.0 * half_G2 * (inv_rho_out - inv_rho_in)
 
 
+@njit("f8(f8, f8, f8, f8, f8, f8, f8)", cache=True)
 def _dp_friction_homogeneous(
-    m_dot: float, rho_mix: float, mu_mix: float, L: float, D: float, eps: float, A: float
+    G: float, half_G2: float, inv_rho: float, mu_mix: float, L_over_D: float, D: float, rough: float
 ) -> float:
-    if A <= 0 or D <= 0 or L <= 0 or rho_mix <= 0 or mu_mix <= 0:
+    # Geometry as L/D and the Haaland roughness term (eps/D/3.7)**1.11 (precomputed by callers)
+    if D <= 0 or L_over_D <= 0 or inv_rho <= 0 or mu_mix <= 0:
         return 0.0
-    G = m_dot / A
     # Re = rho*v*D/mu, with v=G/rho => Re = G*D/mu
     Re = abs(G * D / mu_mix)
-    f = haaland_friction_factor(Re, eps / D)
-    return f * (L / D) * (G ** 2) / (2.0 * rho_mix)
+    f = haaland_friction_factor_rough(Re, rough)
+    return f * L_over_D * half_G2 * inv_rho
+
+
+@njit("UniTuple(f8, 2)(f8, f8, f8, f8, f8, f8, f8, f8)", cache=True)
+def _dp_friction_form_homogeneous(
+    G: float, half_G2: float, inv_rho: float, mu_mix: float, L_over_D: float, D: float, rough: float, K: float
+):
+    # (friction, form) of dp_pipe's homogeneous path in one compiled call
+    return (
+        _dp_friction_homogeneous(G, half_G2, inv_rho, mu_mix, L_over_D, D, rough),
+        _dp_form_loss(half_G2, inv_rho, K),
+    )
 
 
+# Chisholm C indexed by 2*(liquid turbulent) + (vapour turbulent): ll, lt, tl, tt
+_CHISHOLM_C = (5.0, 12.0, 12.0, 20.0)
+
+
+@njit("f8(f8, f8)", cache=True)
 def _chisholm_C(Re_l0: float, Re_v0: float) -> float:
-    # Common Chisholm constants based on laminar/turbulent classification
-    l_lam = Re_l0 < 2000.0
-    v_lam = Re_v0 < 2000.0
-    if (not l_lam) and (not v_lam):
-        return 20.0
-    if l_lam and v_lam:
-        return 5.0
-    return 12.0
+    # Common Chisholm constants based on laminar/turbulent classification (Re >= 2000)
+    return _CHISHOLM_C[2 * int(Re_l0 >= 2000.0) + int(Re_v0 >= 2000.0)]
 
 
+@njit("f8(f8, f8, f8, f8, f8, f8, f8)", cache=True)
 def _phi_l2_chisholm(x: float, rho_l: float, rho_v: float, mu_l: float, mu_v: float, Re_l0: float, Re_v0: float) -> float:
     # Lockhart-Martinelli parameter X_tt for turbulent-turbulent baseline
     x = min(max(x, 1e-8), 1.0 - 1e-8)
     if rho_l <= 0 or rho_v <= 0 or mu_l <= 0 or mu_v <= 0:
         return 1.0
-    X_tt = ((1.0 - x) / x) ** 0.9 * (rho_v / rho_l) ** 0.5 * (mu_l / mu_v) ** 0.1
+    # 1/X_tt = ((1-x)/x)^-0.9 (rho_v/rho_l)^-0.5 (mu_l/mu_v)^-0.1, one exp of summed logs
+    inv_X = math.exp(-(0.9 * math.log((1.0 - x) / x) + 0.5 * math.log(rho_v / rho_l) + 0.1 * math.log(mu_l / mu_v)))
     C = _chisholm_C(Re_l0, Re_v0)
-    return 1.0 + C / X_tt + 1.0 / (X_tt ** 2)
+    # 1 + C/X_tt + 1/X_tt^2
+    return 1.0 + inv_X * (C + inv_X)
 
 
 def _dp_friction_chisholm(
@@ -85,6 +115,8 @@ def _dp_friction_chisholm(
     D: float,
     eps: float,
     A: float,
+    rough: float | None = None,
+    L_over_D: float | None = None,
 ) -> float:
     """Two-phase friction dp via Chisholm multiplier on liquid-only dp (dp_lo).
 
@@ -92,27 +124,56 @@ def _dp_friction_chisholm(
       - if x <= 0: return dp_lo (liquid)
       - if x >= 1: return dp_go (vapor), computed similarly
       - else: dp = phi_l^2 * dp_lo
+
+    ``rough`` (the Haaland roughness term, see :func:`haaland_roughness`) and
+    ``L_over_D`` may be passed precomputed.
     """
     if A <= 0 or D <= 0 or L <= 0:
         return 0.0
 
-    x = props.quality_ph(p_pa, h_jkg)
-    rho_l, rho_v = props.sat_rho_l_v(p_pa)
-    mu_l, mu_v = props.sat_mu_l_v(p_pa)
+    # One saturation query supplies the quality (as quality_ph) and the phase properties
+    sat = props.sat_all(p_pa)
+    if h_jkg <= sat.h_l:
+        x = 0.0
+    elif h_jkg >= sat.h_v:
+        x = 1.0
+    else:
+        x = (h_jkg - sat.h_l) / (sat.h_v - sat.h_l)
+    return _dp_friction_chisholm_core(
+        m_dot, x, sat.rho_l, sat.rho_v, sat.mu_l, sat.mu_v,
+        L / D if L_over_D is None else L_over_D, D, haaland_roughness(eps / D) if rough is None else rough, A,
+    )
+
 
+@njit("f8(f8, f8, f8, f8, f8, f8, f8, f8, f8, f8)", cache=True)
+def _dp_friction_chisholm_core(
+    m_dot: float,
+    x: float,
+    rho_l: float,
+    rho_v: float,
+    mu_l: float,
+    mu_v: float,
+    L_over_D: float,
+    D: float,
+    rough: float,
+    A: float,
+) -> float:
+    # Numeric part of _dp_friction_chisholm (A, D, L > 0) from the quality and the
+    # saturated-phase properties
     G = m_dot / A
+    head = L_over_D * 0.5 * G * G
     Re_l0 = abs(G * D / max(mu_l, 1e-12))
     Re_v0 = abs(G * D / max(mu_v, 1e-12))
 
     # liquid-only dp
-    f_l0 = haaland_friction_factor(Re_l0, eps / D)
-    dp_lo = f_l0 * (L / D) * (G ** 2) / (2.0 * max(rho_l, 1e-12))
+    f_l0 = haaland_friction_factor_rough(Re_l0, rough)
+    dp_lo = f_l0 * head / max(rho_l, 1e-12)
 
     if x <= 0.0:
         return dp_lo
     if x >= 1.0:
-        f_v0 = haaland_friction_factor(Re_v0, eps / D)
-        dp_go = f_v0 * (L / D) * (G ** 2) / (2.0 * max(rho_v, 1e-12))
+        f_v0 = haaland_friction_factor_rough(Re_v0, rough)
+        dp_go = f_v0 * head / max(rho_v, 1e-12)
         return dp_go
 
     phi_l2 = _phi_l2_chisholm(x, rho_l, rho_v, mu_l, mu_v, Re_l0, Re_v0)
@@ -135,6 +196,12 @@ def dp_pipe(
     two_phase_friction: str = "homogeneous",
     include_acceleration: bool = True,
     include_gravity: bool = True,
+    rho_avg: float | None = None,
+    mu_avg: float | None = None,
+    rho_in: float | None = None,
+    rho_out: float | None = None,
+    eps_over_D: float | None = None,
+    L_over_D: float | None = None,
 ) -> DpBreakdown:
     """Pressure drop breakdown for a 1D pipe-like element.
 
@@ -142,31 +209,159 @@ def dp_pipe(
     ----------
     two_phase_friction:
         "homogeneous" (default) or "chisholm".
+    rho_avg, mu_avg, rho_in, rho_out:
+        Optional mid-state density/viscosity and inlet/outlet densities the caller has
+        already evaluated; each one given skips the corresponding property call.
+    eps_over_D, L_over_D:
+        Optional precomputed relative roughness and length ratio (constant per pipe).
     """
     if A is None:
         A = _area_from_D(D)
+    if D > 0:
+        eps_over_D = eps / D if eps_over_D is None else eps_over_D
+        L_over_D = L / D if L_over_D is None else L_over_D
+    else:
+        eps_over_D = L_over_D = 0.0
+    # Haaland roughness term, shared by every friction-factor evaluation below
+    rough = haaland_roughness(eps_over_D)
 
     # Use mid-state for friction and form losses
     p_avg = 0.5 * (p_in + p_out)
     h_avg = 0.5 * (h_in + h_out)
 
-    rho_avg = props.rho_ph(p_avg, h_avg)
-    mu_avg = props.mu_ph(p_avg, h_avg)
+    if rho_avg is None or mu_avg is None:
+        state = props.state_ph(p_avg, h_avg)
+        rho_avg = state.rho if rho_avg is None else rho_avg
+        mu_avg = state.mu if mu_avg is None else mu_avg
+
+    G = m_dot / A if A > 0 else 0.0
+    half_G2 = 0.5 * G * G
+    inv_rho_avg = 1.0 / rho_avg if rho_avg > 0 else 0.0
 
     if two_phase_friction.lower() == "chisholm":
-        dp_fric = _dp_friction_chisholm(m_dot, p_avg, h_avg, props, L, D, eps, A)
+        dp_fric = _dp_friction_chisholm(m_dot, p_avg, h_avg, props, L, D, eps, A, rough, L_over_D)
+        dp_form = _dp_form_loss(half_G2, inv_rho_avg, K)
     else:
-        dp_fric = _dp_friction_homogeneous(m_dot, rho_avg, mu_avg, L, D, eps, A)
-
-    dp_form = _dp_form_loss(m_dot, rho_avg, K, A)
+        dp_fric, dp_form = _dp_friction_form_homogeneous(G, half_G2, inv_rho_avg, mu_avg, L_over_D, D, rough, K)
 
     dp_grav = _dp_gravity(rho_avg, dz) if include_gravity else 0.0
 
     if include_acceleration:
-        rho_in = props.rho_ph(p_in, h_in)
-        rho_out = props.rho_ph(p_out, h_out)
-        dp_acc = _dp_acceleration_same_area(m_dot, A, rho_in, rho_out)
+        if rho_in is None:
+            rho_in = props.rho_ph(p_in, h_in)
+        if rho_out is None:
+            rho_out = props.rho_ph(p_out, h_out)
+        dp_acc = _dp_acceleration_same_area(
+            half_G2, 1.0 / rho_in if rho_in > 0 else 0.0, 1.0 / rho_out if rho_out > 0 else 0.0,
+        )
     else:
         dp_acc = 0.0
 
+    return DpBreakdown(dp_fric, dp_form, dp_grav, dp_acc)
+
+
+def _query_points(fn, p: np.ndarray, h: np.ndarray) -> list:
+    # One scalar property query per point (the backends have no array interface)
+    return [fn(a, b) for a, b in zip(p.ravel().tolist(), h.ravel().tolist())]
+
+
+def _rho_points(props, p: np.ndarray, h: np.ndarray) -> np.ndarray:
+    # Densities at all points in one batched call when the backend has rho_ph_vec
+    fn = getattr(props, "rho_ph_vec", None)
+    if fn is not None:
+        return np.asarray(fn(p, h), dtype=float).reshape(p.shape)
+    return np.array(_query_points(props.rho_ph, p, h), dtype=float).reshape(p.shape)
+
+
+def _phi_l2_chisholm_vec(x, rho_l, rho_v, mu_l, mu_v, Re_l0, Re_v0) -> np.ndarray:
+    # _phi_l2_chisholm over arrays: np.clip for the quality clamp, np.where for the guard
+    x = np.clip(x, 1e-8, 1.0 - 1e-8)
+    ok = (rho_l > 0) & (rho_v > 0) & (mu_l > 0) & (mu_v > 0)
+    inv_X = np.exp(-(0.9 * np.log((1.0 - x) / x) + 0.5 * np.log(rho_v / rho_l) + 0.1 * np.log(mu_l / mu_v)))
+    C = np.asarray(_CHISHOLM_C)[2 * (Re_l0 >= 2000.0) + (Re_v0 >= 2000.0)]
+    return np.where(ok, 1.0 + inv_X * (C + inv_X), 1.0)
+
+
+def _dp_friction_chisholm_vec(m_dot, h_jkg, sat: SatBundle, L, D, eps, A) -> np.ndarray:
+    # _dp_friction_chisholm over arrays; ``sat`` holds one array per saturation field.
+    # Callers suppress the divide/invalid warnings of the masked-out entries.
+    x = np.where(
+        h_jkg <= sat.h_l, 0.0, np.where(h_jkg >= sat.h_v, 1.0, (h_jkg - sat.h_l) / (sat.h_v - sat.h_l))
+    )
+    G = m_dot / A
+    head = (L / D) * 0.5 * G * G
+    Re_l0 = np.abs(G * D / np.maximum(sat.mu_l, 1e-12))
+    Re_v0 = np.abs(G * D / np.maximum(sat.mu_v, 1e-12))
+    dp_lo = haaland_friction_factor_vec(Re_l0, eps / D) * head / np.maximum(sat.rho_l, 1e-12)
+    dp_go = haaland_friction_factor_vec(Re_v0, eps / D) * head / np.maximum(sat.rho_v, 1e-12)
+    phi_l2 = _phi_l2_chisholm_vec(x, sat.rho_l, sat.rho_v, sat.mu_l, sat.mu_v, Re_l0, Re_v0)
+    dp = np.where(x <= 0.0, dp_lo, np.where(x >= 1.0, dp_go, phi_l2 * dp_lo))
+    return np.where((A > 0) & (D > 0) & (L > 0), dp, 0.0)
+
+
+def dp_pipe_vec(
+    m_dot,
+    p_in,
+    h_in,
+    p_out,
+    h_out,
+    props,
+    L,
+    D,
+    eps,
+    K=0.0,
+    dz=0.0,
+    A=None,
+    two_phase_friction: str = "homogeneous",
+    include_acceleration: bool = True,
+    include_gravity: bool = True,
+) -> DpBreakdown:
+    """:func:`dp_pipe` over broadcastable arrays of segments (e.g. axial nodes).
+
+    Flow and geometry arguments may be arrays; the returned :class:`DpBreakdown` holds
+    arrays of the broadcast shape. Property queries are made point by point, except the
+    inlet and outlet densities, which go to the backend's ``rho_ph_vec`` in one batch
+    when it has one. The friction, form, gravity and acceleration terms are evaluated
+    with ufuncs, with the scalar guards (non-positive area, length, density) expressed
+    by ``np.where``.
+    The Chisholm friction option makes one saturation query per segment (as the scalar
+    model does) and evaluates the multiplier with ufuncs too.
+    """
+    m, p_in, h_in, p_out, h_out, L, D, eps, K, dz = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (m_dot, p_in, h_in, p_out, h_out, L, D, eps, K, dz))
+    )
+    shape = m.shape
+    A = np.broadcast_to(np.pi * D ** 2 / 4.0 if A is None else np.asarray(A, dtype=float), shape)
+
+    p_avg = 0.5 * (p_in + p_out)
+    h_avg = 0.5 * (h_in + h_out)
+    states = _query_points(props.state_ph, p_avg, h_avg)
+    rho_avg = np.array([st.rho for st in states], dtype=float).reshape(shape)
+    mu_avg = np.array([st.mu for st in states], dtype=float).reshape(shape)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        G = np.where(A > 0, m / A, 0.0)
+        half_G2 = 0.5 * G * G
+        rho_ok = rho_avg > 0
+
+        if two_phase_friction.lower() == "chisholm":
+            sats = [props.sat_all(p) for p in p_avg.ravel().tolist()]
+            sat = SatBundle(*np.moveaxis(np.array(sats, dtype=float).reshape(shape + (-1,)), -1, 0))
+            dp_fric = _dp_friction_chisholm_vec(m, h_avg, sat, L, D, eps, A)
+        else:
+            fric_ok = (A > 0) & (D > 0) & (L > 0) & rho_ok & (mu_avg > 0)
+            f = haaland_friction_factor_vec(G * D / mu_avg, eps / D)
+            dp_fric = np.where(fric_ok, f * (L / D) * half_G2 / rho_avg, 0.0)
+
+        dp_form = np.where((A > 0) & rho_ok, K * half_G2 / rho_avg, 0.0)
+        dp_grav = rho_avg * 9.80665 * dz if include_gravity else np.zeros(shape)
+
+        if include_acceleration:
+            # Inlet and outlet densities in one batch
+            rho_in, rho_out = _rho_points(props, np.stack([p_in, p_out]), np.stack([h_in, h_out]))
+            acc_ok = (A > 0) & (rho_in > 0) & (rho_out > 0)
+            dp_acc = np.where(acc_ok, 2.0 * half_G2 * (1.0 / rho_out - 1.0 / rho_in), 0.0)
+        else:
+            dp_acc = np.zeros(shape)
+
     return DpBreakdown(dp_fric=dp_fric, dp_form=dp_form, dp_grav=dp_grav, dp_acc=dp_acc)
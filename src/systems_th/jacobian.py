@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+from .components.base import Component
+
+
+@dataclass
+class JacobianPattern:
+    """Fixed CSR sparsity pattern of the network Jacobian (rows = equations, cols = free vars).
+
+    Built once per solve by :func:`build_jacobian_pattern`; each Newton iteration only
+    rewrites ``data`` through slot indices precomputed per component.
+    """
+
+    shape: Tuple[int, int]
+    indptr: np.ndarray
+    indices: np.ndarray
+    data: np.ndarray
+    # Row index of every stored entry (expanded indptr), used for dense scatter
+    rows: np.ndarray
+    # (component, entry positions to keep, target slots) for analytic components
+    analytic: List[Tuple[Component, np.ndarray, np.ndarray]]
+    # Target slots of all kept analytic entries, concatenated in ``analytic`` order, so
+    # the analytic values are scattered into ``data`` in one pass
+    analytic_slots: np.ndarray
+    # Components whose rows are finite-differenced
+    fd_components: List[Component]
+    # (column, target slots, residual rows, FD components depending on the column)
+    # for each column touched by an FD component
+    fd_columns: List[Tuple[int, np.ndarray, np.ndarray, List[Component]]]
+    # fd_columns partitioned into structurally orthogonal groups (no FD component depends
+    # on two columns of a group): ([(column, slots, rows), ...], union of components).
+    # All columns of a group are perturbed together and share one evaluation.
+    fd_groups: List[Tuple[List[Tuple[int, np.ndarray, np.ndarray]], List[Component]]]
+
+    @property
+    def nnz(self) -> int:
+        return int(self.indices.size)
+
+    def to_dense(self) -> np.ndarray:
+        J = np.zeros(self.shape, dtype=float)
+        J[self.rows, self.indices] = self.data
+        return J
+
+
+def build_jacobian_pattern(components: List[Component], free_vars, props) -> JacobianPattern:
+    """Collect ``Component.sparsity`` into a CSR pattern and map entries to data slots.
+
+    Components must already be bound to their residual slices (``Network.prepare``).
+    """
+    n_rows = sum(len(c._res) for c in components)
+    n_cols = len(free_vars)
+    stride = max(1, n_cols)
+    col_of = {id(v): j for j, v in enumerate(free_vars)}
+
+    per_comp = []
+    all_keys = []
+    for comp in components:
+        is_analytic = comp.jacobian_entries(props) is not None
+        pairs = comp.sparsity(props)
+        rows = np.array([comp._offset + r for r, _ in pairs], dtype=np.int64)
+        cols = np.array([col_of.get(id(v), -1) for _, v in pairs], dtype=np.int64)
+        keep = np.flatnonzero(cols >= 0)
+        keys = rows[keep] * stride + cols[keep]
+        per_comp.append((comp, is_analytic, keep, keys, rows[keep], cols[keep]))
+        all_keys.append(keys)
+
+    keys = np.unique(np.concatenate(all_keys)) if all_keys else np.empty(0, dtype=np.int64)
+    rows = keys // stride
+    indices = keys % stride
+    indptr = np.searchsorted(rows, np.arange(n_rows + 1)).astype(np.int64)
+
+    analytic = []
+    fd_components = []
+    fd_slots: dict = {}
+    fd_deps: dict = {}
+    for comp, is_analytic, keep, comp_keys, comp_rows, comp_cols in per_comp:
+        slots = np.searchsorted(keys, comp_keys)
+        if is_analytic:
+            analytic.append((comp, keep, slots))
+            continue
+        fd_components.append(comp)
+        for s, r, j in zip(slots, comp_rows, comp_cols):
+            fd_slots.setdefault(int(j), []).append((int(s), int(r)))
+        for j in dict.fromkeys(int(j) for j in comp_cols):
+            fd_deps.setdefault(j, []).append(comp)
+
+    fd_columns = [
+        (
+            j,
+            np.array([s for s, _ in sr], dtype=np.int64),
+            np.array([r for _, r in sr], dtype=np.int64),
+            fd_deps[j],
+        )
+        for j, sr in sorted(fd_slots.items())
+    ]
+
+    return JacobianPattern(
+        shape=(n_rows, n_cols),
+        indptr=indptr,
+        indices=indices,
+        data=np.zeros(keys.size, dtype=float),
+        rows=rows,
+        analytic=analytic,
+        analytic_slots=(
+            np.concatenate([slots for _, _, slots in analytic]) if analytic else np.empty(0, dtype=np.int64)
+        ),
+        fd_components=fd_components,
+        fd_columns=fd_columns,
+        fd_groups=_group_columns(fd_columns),
+    )
+
+
+def _group_columns(fd_columns) -> list:
+    """Greedy (Curtis-Powell-Reid) grouping of FD columns with disjoint component sets.
+
+    Each component's rows then move with at most one perturbed column of a group, so
+    the grouped differences equal the per-column ones.
+    """
+    groups: list = []  # [columns, components, ids of components]
+    for j, slots, rows, comps in fd_columns:
+        ids = {id(c) for c in comps}
+        for cols, members, used in groups:
+            if used.isdisjoint(ids):
+                cols.append((j, slots, rows))
+                members.extend(comps)
+                used.update(ids)
+                break
+        else:
+            groups.append([[(j, slots, rows)], list(comps), ids])
+    return [(cols, members) for cols, members, _ in groups]
@@ -0,0 +1,216 @@
+"""Linear solvers for the Newton step.
+
+The Jacobian keeps the same CSR pattern for a whole solve, so sparse LU solvers can reuse
+their symbolic analysis (ordering) across iterations:
+
+- UMFPACK via ``scikits.umfpack``: symbolic factorization once, numeric per iteration.
+- SciPy SuperLU (``splu``): COLAMD column ordering computed once, reused with
+  ``permc_spec="NATURAL"`` on the pre-permuted matrix.
+- Opt-in restarted GMRES with an incomplete-LU (``spilu``) or algebraic multigrid
+  (``pyamg``, optional) preconditioner that is reused for several Newton steps, for
+  networks too large to factor exactly.
+
+Non-square (over/under-determined) or singular systems fall back to dense least squares.
+"""
+
+from __future__ import annotations
+
+import inspect
+from typing import Optional
+
+import numpy as np
+
+from .jacobian import JacobianPattern
+
+try:
+    import scipy.sparse as _sp
+    import scipy.sparse.linalg as _spla
+    HAVE_SCIPY = True
+except ImportError:  # pragma: no cover - depends on environment
+    _sp = None
+    _spla = None
+    HAVE_SCIPY = False
+
+# SciPy >= 1.12 names the relative tolerance of gmres ``rtol`` (``tol`` before, removed in 1.14)
+_GMRES_RTOL = ("rtol" if HAVE_SCIPY and "rtol" in inspect.signature(_spla.gmres).parameters
+               else "tol")
+
+try:
+    import scikits.umfpack as _umfpack  # type: ignore
+    HAVE_UMFPACK = True
+except ImportError:  # pragma: no cover - depends on environment
+    _umfpack = None
+    HAVE_UMFPACK = False
+
+try:
+    import pyamg as _pyamg  # type: ignore
+    HAVE_PYAMG = True
+except ImportError:  # pragma: no cover - depends on environment
+    _pyamg = None
+    HAVE_PYAMG = False
+
+
+def lstsq_solve(pat: JacobianPattern, rhs: np.ndarray, data: Optional[np.ndarray] = None) -> np.ndarray:
+    J = np.zeros(pat.shape, dtype=float)
+    J[pat.rows, pat.indices] = pat.data if data is None else data
+    dx, *_ = np.linalg.lstsq(J, rhs, rcond=None)
+    return dx
+
+
+class SparseLUSolver:
+    """Sparse LU for square Jacobians sharing one pattern, with symbolic reuse.
+
+    The CSC layout of the pattern (optionally with permuted columns) is computed once,
+    so each factorization only gathers ``data`` into it instead of converting
+    CSR -> CSC and slicing columns every iteration.
+    """
+
+    def __init__(self, pat: JacobianPattern):
+        if not HAVE_SCIPY:
+            raise ImportError("SciPy is required for the sparse linear solver")
+        self.pat = pat
+        self._perm_c: Optional[np.ndarray] = None
+        self._umf = None
+        self._csc = self._csc_layout(pat.indices)
+
+    def _csc_layout(self, cols: np.ndarray):
+        """(gather order, row indices, indptr) of the entries sorted by (col, row)."""
+        pat = self.pat
+        order = np.lexsort((pat.rows, cols))
+        indptr = np.searchsorted(cols[order], np.arange(pat.shape[1] + 1)).astype(np.int64)
+        return order, pat.rows[order], indptr
+
+    def _matrix(self, data: np.ndarray, layout=None):
+        order, indices, indptr = self._csc if layout is None else layout
+        return _sp.csc_matrix((data[order], indices, indptr), shape=self.pat.shape)
+
+    def solve(self, rhs: np.ndarray, data: Optional[np.ndarray] = None) -> np.ndarray:
+        data = self.pat.data if data is None else data
+        if HAVE_UMFPACK:
+            A = self._matrix(data)
+            umf = self._umf
+            if umf is None:
+                umf = self._umf = _umfpack.UmfpackContext("di")
+                umf.symbolic(A)
+            umf.numeric(A)
+            return umf.solve(_umfpack.UMFPACK_A, A, rhs, autoTranspose=True)
+
+        if self._perm_c is None:
+            lu = _spla.splu(self._matrix(data), permc_spec="COLAMD")
+            self._perm_c = lu.perm_c.copy()
+            # Reordered column k is original column perm_c[k] (i.e. A[:, perm_c])
+            self._csc_perm = self._csc_layout(np.argsort(self._perm_c)[self.pat.indices])
+            return lu.solve(rhs)
+        lu = _spla.splu(self._matrix(data, self._csc_perm), permc_spec="NATURAL")
+        x = np.empty_like(rhs)
+        x[self._perm_c] = lu.solve(rhs)
+        return x
+
+
+class GMRESSolver(SparseLUSolver):
+    """Restarted GMRES for square Jacobians with a reusable preconditioner.
+
+    ``preconditioner`` is ``"ilu"`` (incomplete LU, ``spilu``) or ``"amg"`` (a
+    Ruge-Stuben hierarchy applied as one V-cycle; requires pyamg). It is computed on
+    the first solve and reused for ``refresh`` solves (the pattern is fixed and the
+    values drift slowly between Newton steps). When GMRES fails with a reused
+    preconditioner, it is rebuilt once before giving up with a RuntimeError (the
+    caller then falls back to least squares).
+    """
+
+    def __init__(self, pat: JacobianPattern, refresh: int = 5, rtol: float = 1e-10,
+                 drop_tol: float = 1e-4, fill_factor: float = 10.0, preconditioner: str = "ilu"):
+        if preconditioner not in ("ilu", "amg"):
+            raise ValueError(f"Unknown preconditioner '{preconditioner}'")
+        if preconditioner == "amg" and not HAVE_PYAMG:
+            raise ImportError("pyamg is required for preconditioner='amg'")
+        super().__init__(pat)
+        self.preconditioner = preconditioner
+        self.refresh = refresh
+        self.rtol = rtol
+        self.drop_tol = drop_tol
+        self.fill_factor = fill_factor
+        self._M = None
+        # Solves done with the current preconditioner
+        self._age = 0
+
+    def _precondition(self, A) -> None:
+        if self.preconditioner == "amg":
+            self._M = _pyamg.ruge_stuben_solver(A.tocsr()).aspreconditioner(cycle="V")
+        else:
+            ilu = _spla.spilu(A, drop_tol=self.drop_tol, fill_factor=self.fill_factor)
+            self._M = _spla.LinearOperator(A.shape, ilu.solve)
+        self._age = 0
+
+    def _gmres(self, A, rhs: np.ndarray):
+        n = A.shape[0]
+        return _spla.gmres(A, rhs, M=self._M, atol=0.0, restart=min(n, 50), maxiter=n,
+                           **{_GMRES_RTOL: self.rtol})
+
+    def solve(self, rhs: np.ndarray, data: Optional[np.ndarray] = None) -> np.ndarray:
+        A = self._matrix(self.pat.data if data is None else data)
+        if self._M is None or self._age >= self.refresh:
+            self._precondition(A)
+        x, info = self._gmres(A, rhs)
+        if info != 0 and self._age > 0:
+            self._precondition(A)
+            x, info = self._gmres(A, rhs)
+        if info != 0:
+            raise RuntimeError(f"GMRES did not converge (info={info})")
+        self._age += 1
+        return x
+
+
+class LinearSolver:
+    """Select the Newton-step solver for a fixed Jacobian pattern.
+
+    ``method`` is ``"auto"`` (sparse LU when square and SciPy is available, else lstsq),
+    ``"sparse"`` (require sparse LU for square systems), ``"gmres"`` (ILU-preconditioned
+    GMRES for square systems, see :class:`GMRESSolver`) or ``"lstsq"``.
+    ``preconditioner`` (``"ilu"`` or ``"amg"``) only applies to ``"gmres"``.
+
+    ``col_scale`` (one reference magnitude per free variable) applies Jacobi column
+    scaling: ``(J D) dy = rhs`` is solved and ``dx = D dy`` returned, so p [Pa],
+    m [kg/s] and h [J/kg] columns are O(1) in the scaled system.
+    """
+
+    def __init__(self, pat: JacobianPattern, method: str = "auto", col_scale: Optional[np.ndarray] = None,
+                 preconditioner: str = "ilu"):
+        if method not in ("auto", "sparse", "gmres", "lstsq"):
+            raise ValueError(f"Unknown linear solver '{method}'")
+        square = pat.shape[0] == pat.shape[1]
+        if method in ("sparse", "gmres") and not HAVE_SCIPY:
+            raise ImportError(f"SciPy is required for linear_solver='{method}'")
+        use_lu = square and HAVE_SCIPY and method != "lstsq"
+        self.pat = pat
+        self._lu: Optional[SparseLUSolver] = None
+        if use_lu and method == "gmres":
+            self._lu = GMRESSolver(pat, preconditioner=preconditioner)
+        elif use_lu:
+            self._lu = SparseLUSolver(pat)
+        # Column scale expanded onto the stored entries of the pattern
+        self._col_scale = None if col_scale is None else np.asarray(col_scale, dtype=float)
+        self._entry_scale = None if self._col_scale is None else self._col_scale[pat.indices]
+
+    @property
+    def name(self) -> str:
+        if self._lu is None:
+            return "lstsq"
+        if isinstance(self._lu, GMRESSolver):
+            return "gmres"
+        return "umfpack" if HAVE_UMFPACK else "splu"
+
+    def solve(self, rhs: np.ndarray) -> np.ndarray:
+        data = self.pat.data if self._entry_scale is None else self.pat.data * self._entry_scale
+        dy = None
+        if self._lu is not None:
+            try:
+                dy = self._lu.solve(rhs, data)
+                if not np.all(np.isfinite(dy)):
+                    dy = None
+            except RuntimeError:
+                # Singular factor (or GMRES stagnation): fall through to least squares
+                dy = None
+        if dy is None:
+            dy = lstsq_solve(self.pat, rhs, data)
+        return dy if self._col_scale is None else self._col_scale * dy
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
+import numpy as np
+
+from .codegen import compile_residuals
 from .connection import Connection
-from .props import WaterIAPWS, WaterProps
-from .solver import newton_solve, SolveOptions, SolveResult
+from .equation import Equation
+from .jacobian import JacobianPattern, build_jacobian_pattern
+from .props import CachingProps, TabulatedWater, WaterIAPWS, WaterProps
+from .solver import newton_solve, root_solve, SolveOptions, SolveResult, SolverWorkspace
 from .components.base import Component
 
 
@@ -17,6 +22,28 @@ class Network:
     components: List[Component] = field(default_factory=list)
     connections: Dict[str, Connection] = field(default_factory=dict)
 
+    # Preallocated residual buffers (set by prepare): components write unscaled residuals
+    # into _raw and scale bases into _basis; _residual = _raw / fmax(_floor, |_basis|)
+    _raw: np.ndarray = field(default_factory=lambda: np.empty(0), init=False, repr=False)
+    _basis: np.ndarray = field(default_factory=lambda: np.empty(0), init=False, repr=False)
+    _floor: np.ndarray = field(default_factory=lambda: np.empty(0), init=False, repr=False)
+    _scale: np.ndarray = field(default_factory=lambda: np.empty(0), init=False, repr=False)
+    _residual: np.ndarray = field(default_factory=lambda: np.empty(0), init=False, repr=False)
+    # Per-iteration property memo used by evaluate_residuals (set by prepare)
+    _eval_props: Optional[CachingProps] = field(default=None, init=False, repr=False)
+    # CSR Jacobian pattern over the free variables (set by prepare)
+    _jac: Optional[JacobianPattern] = field(default=None, init=False, repr=False)
+    # Fused residual function over all components (set by prepare)
+    _fused: Optional[Callable[[CachingProps, np.ndarray, np.ndarray], None]] = field(default=None, init=False, repr=False)
+    # SoA variable state: values and bounds of all_variables(), free-variable indices
+    # (set by prepare; Variables read/write their value through _x)
+    _x: np.ndarray = field(default_factory=lambda: np.empty(0), init=False, repr=False)
+    _lo: np.ndarray = field(default_factory=lambda: np.empty(0), init=False, repr=False)
+    _hi: np.ndarray = field(default_factory=lambda: np.empty(0), init=False, repr=False)
+    _free_idx: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.intp), init=False, repr=False)
+    # Newton/FD work arrays sized to the residual and free-variable counts (set by prepare)
+    _work: Optional[SolverWorkspace] = field(default=None, init=False, repr=False)
+
     def add_component(self, comp: Component) -> None:
         self.components.append(comp)
 
@@ -53,15 +80,105 @@ class Network:
     def free_variables(self) -> List:
         return [v for v in self.all_variables() if not v.fixed]
 
-    def residuals(self) -> List:
-        eqs = []
+    def equation_names(self) -> List[str]:
+        """Full equation names in residual-vector order (cached per component)."""
+        names: List[str] = []
+        for comp in self.components:
+            names.extend(comp.describe_equations() if not comp._legacy_equations()
+                         else [eq.name for eq in comp.equations(self.props)])
+        return names
+
+    def residuals(self) -> List[Equation]:
+        """Named residuals at the current state (cold path: diagnostics/reporting).
+
+        Each :class:`Equation` carries the unscaled residual and its scale, as returned
+        by ``Component.equations``. The network is prepared first, so edited parameters
+        and a swapped ``props`` backend are picked up; the residuals are then evaluated
+        through the preallocated buffers and paired with the cached equation names.
+        """
+        self.prepare()
+        names = self.equation_names()
+        self.evaluate_residuals()
+        return [Equation(n, float(r), float(sc)) for n, r, sc in zip(names, self._raw, self._scale)]
+
+    def prepare(self) -> None:
+        """Assign each component a fixed slice of a preallocated residual vector and
+        build the Jacobian sparsity pattern.
+
+        Also moves all variable values into one state array (``_x``, with bounds
+        ``_lo``/``_hi``) so the solver packs and clips unknowns vectorized, and collects
+        the constant scale floors (``Component.residual_floors``).
+
+        Called by the solver before iterating; call again after changing topology, fixing
+        or freeing variables, or equation-count-affecting settings
+        (e.g. ``CoreChannel.set_exit_void_fraction``).
+        """
+        self._eval_props = CachingProps(self.props)
+        self._bind_variables()
         for comp in self.components:
-            eqs.extend(comp.equations(self.props))
-        return eqs
+            comp._precompute()
+        counts = [comp.n_equations(self.props) for comp in self.components]
+        n_eq = sum(counts)
+        self._raw = np.zeros(n_eq, dtype=float)
+        self._basis = np.zeros(n_eq, dtype=float)
+        self._floor = np.ones(n_eq, dtype=float)
+        self._scale = np.ones(n_eq, dtype=float)
+        self._residual = np.zeros(n_eq, dtype=float)
+        offset = 0
+        for comp, n in zip(self.components, counts):
+            sl = slice(offset, offset + n)
+            comp.bind_slots(offset, self._raw[sl], self._basis[sl])
+            self._floor[sl] = comp.residual_floors()
+            offset += n
+        self._jac = build_jacobian_pattern(self.components, self.free_variables(), self._eval_props)
+        self._fused = compile_residuals(self.components, self._x)
+        self._work = SolverWorkspace.allocate(n_eq, len(self._free_idx))
+
+    def _bind_variables(self) -> None:
+        vars_ = self.all_variables()
+        x = np.empty(len(vars_), dtype=float)
+        for i, v in enumerate(vars_):
+            v.bind(x, i)
+        self._x = x
+        self._lo = np.array([-np.inf if v.lower is None else v.lower for v in vars_], dtype=float)
+        self._hi = np.array([np.inf if v.upper is None else v.upper for v in vars_], dtype=float)
+        self._free_idx = np.array([i for i, v in enumerate(vars_) if not v.fixed], dtype=np.intp)
+
+    def evaluate_residuals(self, components: Optional[List[Component]] = None) -> np.ndarray:
+        """Evaluate scaled residuals in place; returns the network-owned buffer.
+
+        If ``components`` is given, only their slices are refreshed. Scaling is applied
+        to the whole vector in three ufunc calls instead of per-equation ``max``/``abs``.
+        """
+        props = self._eval_props
+        if components is None and self._fused is not None and props is not None:
+            self._fused(props, self._raw, self._basis)
+        else:
+            for comp in self.components if components is None else components:
+                comp.write_residuals(props, comp._res, comp._basis)
+        scale = np.abs(self._basis, out=self._scale)
+        np.fmax(scale, self._floor, out=scale)
+        return np.divide(self._raw, scale, out=self._residual)
+
+    def clear_property_cache(self) -> None:
+        if self._eval_props is not None:
+            self._eval_props.clear()
+
+    def tabulate_props(self, margin: float = 0.25, **kwargs) -> TabulatedWater:
+        """Replace ``props`` by a :class:`TabulatedWater` table around the current states.
+
+        Opt-in: trades the exact backend for spline interpolation of ``rho_ph``/``h_px``.
+        Call after setting guesses; ``kwargs`` are passed on (e.g. ``n_p``, ``n_h``).
+        """
+        inner = self.props.inner if isinstance(self.props, TabulatedWater) else self.props
+        self.props = TabulatedWater.around_connections(inner, self.connections.values(), margin, **kwargs)
+        return self.props
 
     def solve(self, options: Optional[SolveOptions] = None) -> SolveResult:
         if options is None:
             options = SolveOptions()
+        if options.method != "newton":
+            return root_solve(self, options)
         return newton_solve(self, options)
 
     def summary(self) -> str:
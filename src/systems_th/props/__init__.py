@@ -1,3 +1,8 @@
-from .water_iapws import WaterIAPWS, WaterProps
+from .water_iapws import StateBundle, ThermoBundle, WaterIAPWS, WaterProps
+from .caching import CachingProps
+from .derivatives import partials_ph, rho_ph_partials
+from .tabulated import TabulatedWater
+from .saturation import SatBundle, SaturationTable
+from ._if97 import is_valid_ph, saturation_lines
 
-__all__ = ["WaterIAPWS", "WaterProps"]
+__all__ = ["WaterIAPWS", "WaterProps", "StateBundle", "ThermoBundle", "CachingProps", "TabulatedWater", "SaturationTable", "SatBundle", "saturation_lines", "is_valid_ph", "partials_ph", "rho_ph_partials"]
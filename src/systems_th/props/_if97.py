@@ -0,0 +1,330 @@
+"""IAPWS-IF97 temperature T(p, h) for regions 1 and 2 as compiled kernels.
+
+``T_ph`` through the iapws package builds a full IAPWS97 state (every property,
+transport included) to return one number. These kernels follow the same route as
+iapws for (p, h) inputs -- the backward equation (region 1) or the saturation
+temperature (region 2) as the first guess, then Newton on the forward Gibbs
+equation -- and stop there, so they agree with iapws to the Newton tolerance.
+
+Inputs are SI (Pa, J/kg). Both kernels return NaN outside the part of their region
+they cover (region 1 above 623.15 K, region 2 above 16.53 MPa -- i.e. wherever the
+state could lie in region 3 -- or above 1073.15 K); callers then fall back to iapws.
+They do not check the saturation line: the caller picks the region from h_l/h_v.
+``thermo_ph_liquid`` / ``thermo_ph_vapour`` reuse the same T-solve and add density
+and entropy from the Gibbs equation at (p, T).
+
+:func:`saturation_lines` evaluates the same equations on NumPy arrays for whole
+pressure grids (closed form, no iteration).
+
+Coefficients from IAPWS R7-97(2012), Eqs. 7, 11, 15-17 and 31.
+"""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+from .._jit import njit
+
+# Specific gas constant [kJ/kg/K]
+_R = 0.461526
+# Saturation pressure at 273.15 K and 623.15 K [MPa]
+_P_MIN = 0.000611212677444
+_P_S623 = 16.5291642526
+
+# Region 1 Gibbs free energy (Eq. 7): n, I, J
+# Region 1 backward equation T(p, h) (Eq. 11): n, I, J
+# Region 2 residual part (Eq. 17): n, I, J; ideal-gas part (Eq. 16): n0, J0
+_R1_N = np.array([
+    0.14632971213167, -0.84548187169114, -3.756360367204, 3.3855169168385,
+    -0.95791963387872, 0.15772038513228, -0.016616417199501, 0.00081214629983568,
+    0.00028319080123804, -0.00060706301565874, -0.018990068218419, -0.032529748770505,
+    -0.021841717175414, -5.283835796993e-05, -0.00047184321073267, -0.00030001780793026,
+    4.7661393906987e-05, -4.4141845330846e-06, -7.2694996297594e-16, -3.1679644845054e-05,
+    -2.8270797985312e-06, -8.5205128120103e-10, -2.2425281908e-06, -6.5171222895601e-07,
+    -1.4341729937924e-13, -4.0516996860117e-07, -1.2734301741641e-09, -1.7424871230634e-10,
+    -6.8762131295531e-19, 1.4478307828521e-20, 2.6335781662795e-23, -1.1947622640071e-23,
+    1.8228094581404e-24, -9.3537087292458e-26,
+])
+_B1_N = np.array([
+    -238.72489924521, 404.21188637945, 113.49746881718, -5.8457616048039,
+    -0.0001528548241314, -1.0866707695377e-06, -13.391744872602, 43.211039183559,
+    -54.010067170506, 30.535892203916, -6.5964749423638, 0.0093965400878363,
+    1.157364750534e-07, -2.5858641282073e-05, -4.0644363084799e-09, 6.6456186191635e-08,
+    8.0670734103027e-11, -9.3477771213947e-13, 5.8265442020601e-15, -1.5020185953503e-17,
+])
+_R2_N = np.array([
+    -0.0017731742473213, -0.017834862292358, -0.045996013696365, -0.057581259083432,
+    -0.05032527872793, -3.3032641670203e-05, -0.00018948987516315, -0.0039392777243355,
+    -0.043797295650573, -2.6674547914087e-05, 2.0481737692309e-08, 4.3870667284435e-07,
+    -3.227767723857e-05, -0.0015033924542148, -0.040668253562649, -7.8847309559367e-10,
+    1.2790717852285e-08, 4.8225372718507e-07, 2.2922076337661e-06, -1.6714766451061e-11,
+    -0.0021171472321355, -23.895741934104, -5.905956432427e-18, -1.2621808899101e-06,
+    -0.038946842435739, 1.1256211360459e-11, -8.2311340897998, 1.9809712802088e-08,
+    1.0406965210174e-19, -1.0234747095929e-13, -1.0018179379511e-09, -8.0882908646985e-11,
+    0.10693031879409, -0.33662250574171, 8.9185845355421e-25, 3.0629316876232e-13,
+    -4.2002467698208e-06, -5.9056029685639e-26, 3.7826947613457e-06, -1.2768608934681e-15,
+    7.3087610595061e-29, 5.5414715350778e-17, -9.436970724121e-07,
+])
+_R2_N0 = np.array([
+    -9.6927686500217, 10.086655968018, -0.005608791128302, 0.071452738081455,
+    -0.40710498223928, 1.4240819171444, -4.383951131945, -0.28408632460772,
+    0.021268463753307,
+])
+_R1_I = np.array([
+    0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 3,
+    3, 3, 4, 4, 4, 5, 8, 8, 21, 23, 29, 30, 31, 32,
+], dtype=np.int64)
+_R1_J = np.array([
+    -2, -1, 0, 1, 2, 3, 4, 5, -9, -7, -1, 0, 1, 3, -3, 0, 1, 3, 17, -4,
+    0, 6, -5, -2, 10, -8, -11, -6, -29, -31, -38, -39, -40, -41,
+], dtype=np.int64)
+_B1_I = np.array([
+    0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 2, 2, 3, 3, 4, 5, 6,
+], dtype=np.int64)
+_B1_J = np.array([
+    0, 1, 2, 6, 22, 32, 0, 1, 2, 3, 4, 10, 32, 10, 32, 10, 32, 32, 32, 32,
+], dtype=np.int64)
+_R2_I = np.array([
+    1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 3, 3, 3, 3, 3, 4, 4, 4, 5, 6,
+    6, 6, 7, 7, 7, 8, 8, 9, 10, 10, 10, 16, 16, 18, 20, 20, 20, 21, 22, 23,
+    24, 24, 24,
+], dtype=np.int64)
+_R2_J = np.array([
+    0, 1, 2, 3, 6, 1, 2, 4, 7, 36, 0, 1, 3, 6, 35, 1, 2, 3, 7, 3,
+    16, 35, 0, 11, 25, 8, 36, 13, 4, 10, 14, 29, 50, 57, 20, 35, 48, 21, 53, 39,
+    26, 40, 58,
+], dtype=np.int64)
+_R2_J0 = np.array([
+    0, 1, -5, -4, -3, -2, -1, 2, 3,
+], dtype=np.int64)
+
+
+# Region 4 saturation line (Eq. 31)
+_R4_N = np.array([
+    0.11670521452767e+04, -0.72421316703206e+06, -0.17073846940092e+02,
+    0.12020824702470e+05, -0.32325550322333e+07, 0.14915108613530e+02,
+    -0.48232657361591e+04, 0.40511340542057e+06, -0.23855557567849e+00,
+    0.65017534844798e+03,
+])
+
+_MAX_NEWTON = 50
+
+
+@njit("f8(f8)", cache=True)
+def T_sat_p_if97(p_pa):
+    """Saturation temperature [K] at ``p_pa`` (NaN outside 611.2 Pa - 22.064 MPa)."""
+    P = p_pa * 1e-6
+    if not (_P_MIN <= P <= 22.064):
+        return np.nan
+    n = _R4_N
+    beta = P ** 0.25
+    E = beta * beta + n[2] * beta + n[5]
+    F = n[0] * beta * beta + n[3] * beta + n[6]
+    G = n[1] * beta * beta + n[4] * beta + n[7]
+    D = 2.0 * G / (-F - (F * F - 4.0 * E * G) ** 0.5)
+    return (n[9] + D - ((n[9] + D) ** 2 - 4.0 * (n[8] + n[9] * D)) ** 0.5) / 2.0
+
+
+@njit("UniTuple(f8, 2)(f8, f8)", cache=True)
+def _h_cp_r1(P, T):
+    """Region 1 ``(h [kJ/kg], cp [kJ/kg/K])`` at P [MPa], T [K]."""
+    a = 7.1 - P / 16.53
+    tau = 1386.0 / T
+    b = tau - 1.222
+    gt = 0.0
+    gtt = 0.0
+    for k in range(_R1_N.shape[0]):
+        j = _R1_J[k]
+        t = _R1_N[k] * a ** _R1_I[k] * b ** (j - 2)
+        gt += j * t * b
+        gtt += j * (j - 1) * t
+    # h = R*T*tau*g_tau and cp = -R*tau^2*g_tautau
+    return _R * 1386.0 * gt, -_R * tau * tau * gtt
+
+
+@njit("UniTuple(f8, 2)(f8, f8)", cache=True)
+def _h_cp_r2(P, T):
+    """Region 2 ``(h [kJ/kg], cp [kJ/kg/K])`` at P [MPa], T [K]."""
+    tau = 540.0 / T
+    b = tau - 0.5
+    got = 0.0
+    gott = 0.0
+    for k in range(_R2_N0.shape[0]):
+        j = _R2_J0[k]
+        t = _R2_N0[k] * tau ** (j - 2)
+        got += j * t * tau
+        gott += j * (j - 1) * t
+    for k in range(_R2_N.shape[0]):
+        j = _R2_J[k]
+        t = _R2_N[k] * P ** _R2_I[k] * b ** (j - 2)
+        got += j * t * b
+        gott += j * (j - 1) * t
+    return _R * 540.0 * got, -_R * tau * tau * gott
+
+
+@njit("UniTuple(f8, 2)(f8)", cache=True)
+def sat_h_l_v_if97(p_pa):
+    """Saturated liquid and vapour enthalpy [J/kg] at ``p_pa`` (regions 1/2 at T_sat).
+
+    NaN outside 611.2 Pa - 16.53 MPa (above, the saturation line borders region 3).
+    """
+    P = p_pa * 1e-6
+    if not (_P_MIN <= P <= _P_S623):
+        return np.nan, np.nan
+    T = T_sat_p_if97(p_pa)
+    return _h_cp_r1(P, T)[0] * 1e3, _h_cp_r2(P, T)[0] * 1e3
+
+
+@njit("b1(f8, f8)", cache=True)
+def is_valid_ph(p_pa, h_jkg):
+    """Whether (``p_pa``, ``h_jkg``) lies in the IF97 envelope of regions 1-4.
+
+    611.2 Pa <= p <= 100 MPa and h(p, 273.15 K) <= h <= h(p, 1073.15 K); a cheap check
+    instead of catching the iapws out-of-range error (region 5 counts as outside).
+    """
+    P = p_pa * 1e-6
+    if not (_P_MIN <= P <= 100.0):
+        return False
+    h = h_jkg * 1e-3
+    return _h_cp_r1(P, 273.15)[0] <= h <= _h_cp_r2(P, 1073.15)[0]
+
+
+@njit("f8(f8, f8)", cache=True)
+def T_ph_liquid(p_pa, h_jkg):
+    """Region 1 temperature [K] at (``p_pa``, ``h_jkg``), NaN above 623.15 K."""
+    P = p_pa * 1e-6
+    h = h_jkg * 1e-3
+    # Backward equation (first guess, within ~25 mK)
+    pi = P
+    eta = h / 2500.0 + 1.0
+    T = 0.0
+    for k in range(_B1_N.shape[0]):
+        T += _B1_N[k] * pi ** _B1_I[k] * eta ** _B1_J[k]
+    for _ in range(_MAX_NEWTON):
+        h_T, cp = _h_cp_r1(P, T)
+        dT = (h_T - h) / cp
+        T -= dT
+        if abs(dT) <= 1e-10 * T:
+            break
+    else:
+        return np.nan
+    if not (273.15 <= T <= 623.15):
+        return np.nan
+    return T
+
+
+@njit("f8(f8, f8)", cache=True)
+def T_ph_vapour(p_pa, h_jkg):
+    """Region 2 temperature [K] at (``p_pa``, ``h_jkg``), NaN above 16.53 MPa or 1073.15 K."""
+    P = p_pa * 1e-6
+    h = h_jkg * 1e-3
+    if not (_P_MIN <= P <= _P_S623):
+        return np.nan
+    # Newton from the saturated-vapour temperature
+    T = T_sat_p_if97(p_pa)
+    for _ in range(_MAX_NEWTON):
+        h_T, cp = _h_cp_r2(P, T)
+        dT = (h_T - h) / cp
+        T -= dT
+        if abs(dT) <= 1e-10 * T:
+            break
+    else:
+        return np.nan
+    if not (273.15 <= T <= 1073.15):
+        return np.nan
+    return T
+
+
+@njit("UniTuple(f8, 3)(f8, f8)", cache=True)
+def thermo_ph_liquid(p_pa, h_jkg):
+    """Region 1 ``(T [K], rho [kg/m^3], s [J/kg/K])``; NaNs where ``T_ph_liquid`` is NaN."""
+    T = T_ph_liquid(p_pa, h_jkg)
+    if T != T:
+        return np.nan, np.nan, np.nan
+    P = p_pa * 1e-6
+    pi = P / 16.53
+    a = 7.1 - pi
+    tau = 1386.0 / T
+    b = tau - 1.222
+    g = 0.0
+    gp = 0.0
+    gt = 0.0
+    for k in range(_R1_N.shape[0]):
+        i = _R1_I[k]
+        j = _R1_J[k]
+        t = _R1_N[k] * a ** (i - 1) * b ** (j - 1)
+        g += t * a * b
+        gp -= i * t * b
+        gt += j * t * a
+    # v = pi*g_pi*R*T/p [m^3/kg], s = R*(tau*g_tau - g)
+    v = pi * gp * _R * T / P * 1e-3
+    return T, 1.0 / v, _R * (tau * gt - g) * 1e3
+
+
+@njit("UniTuple(f8, 3)(f8, f8)", cache=True)
+def thermo_ph_vapour(p_pa, h_jkg):
+    """Region 2 ``(T [K], rho [kg/m^3], s [J/kg/K])``; NaNs where ``T_ph_vapour`` is NaN."""
+    T = T_ph_vapour(p_pa, h_jkg)
+    if T != T:
+        return np.nan, np.nan, np.nan
+    P = p_pa * 1e-6
+    tau = 540.0 / T
+    b = tau - 0.5
+    g = np.log(P)
+    gt = 0.0
+    for k in range(_R2_N0.shape[0]):
+        j = _R2_J0[k]
+        t = _R2_N0[k] * tau ** (j - 1)
+        g += t * tau
+        gt += j * t
+    gp = 1.0 / P
+    for k in range(_R2_N.shape[0]):
+        i = _R2_I[k]
+        j = _R2_J[k]
+        t = _R2_N[k] * P ** (i - 1) * b ** (j - 1)
+        g += t * P * b
+        gp += i * t * b
+        gt += j * t * P
+    v = P * gp * _R * T / P * 1e-3
+    return T, 1.0 / v, _R * (tau * gt - g) * 1e3
+
+
+def saturation_lines(p_pa) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """``(T_sat, h_l, h_v, s_l, s_v)`` [K, J/kg, J/kg/K] over an array of pressures.
+
+    T_sat from the region-4 equation, the saturated states from the region 1 and 2
+    forward equations at (p, T_sat), all evaluated on arrays. NaN outside
+    611.2 Pa - 16.53 MPa (above, the saturation line borders region 3).
+    """
+    P = np.asarray(p_pa, dtype=float) * 1e-6
+    P = np.where((P >= _P_MIN) & (P <= _P_S623), P, np.nan)
+    n = _R4_N
+    beta = P ** 0.25
+    E = beta * beta + n[2] * beta + n[5]
+    F = n[0] * beta * beta + n[3] * beta + n[6]
+    G = n[1] * beta * beta + n[4] * beta + n[7]
+    D = 2.0 * G / (-F - np.sqrt(F * F - 4.0 * E * G))
+    T = (n[9] + D - np.sqrt((n[9] + D) ** 2 - 4.0 * (n[8] + n[9] * D))) / 2.0
+
+    # Region 1, terms along the last axis
+    tau = (1386.0 / T)[..., None]
+    a = (7.1 - P / 16.53)[..., None]
+    b = tau - 1.222
+    terms = _R1_N * a ** _R1_I * b ** _R1_J
+    g = terms.sum(axis=-1)
+    gt = (terms * _R1_J / b).sum(axis=-1)
+    h_l = _R * 1386.0 * gt
+    s_l = _R * (tau[..., 0] * gt - g)
+
+    # Region 2: ideal-gas plus residual part
+    tau = (540.0 / T)[..., None]
+    b = tau - 0.5
+    ideal = _R2_N0 * tau ** _R2_J0
+    resid = _R2_N * P[..., None] ** _R2_I * b ** _R2_J
+    g = np.log(P) + ideal.sum(axis=-1) + resid.sum(axis=-1)
+    gt = (ideal * _R2_J0 / tau).sum(axis=-1) + (resid * _R2_J / b).sum(axis=-1)
+    h_v = _R * 540.0 * gt
+    s_v = _R * (tau[..., 0] * gt - g)
+    return T, h_l * 1e3, h_v * 1e3, s_l * 1e3, s_v * 1e3
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+
+@dataclass
+class CachingProps:
+    """Memoizing wrapper around a :class:`WaterProps` backend.
+
+    Within one Newton iteration the finite-difference Jacobian re-evaluates every
+    component once per free variable, but only the components touching the perturbed
+    variable see a new state; all others repeat identical property queries. This
+    wrapper memoizes the hot (p, h)/(p, x) calls so those repeats are dict hits.
+
+    Keys are the exact float arguments (no rounding), so finite-difference
+    perturbations always reach the backend. The solver calls :meth:`clear` at the
+    start of every iteration to bound memory. Every other attribute is forwarded
+    to the wrapped backend.
+
+    Besides ``rho_ph``/``h_px`` the other mixture-property calls of the correlations
+    (``state_ph``, ``mu_ph``, ``k_ph``, ``cp_ph``, ``quality_ph``, ``void_fraction_ph``,
+    ``T_ph``) and the saturation queries (``sat_all``, ``sat_*_l_v``) are memoized, so e.g.
+    the mid-state queries of ``dp_pipe`` are shared between the FD columns that do not
+    move that state.
+    """
+
+    inner: Any
+    _cache: Dict[tuple, Any] = field(default_factory=dict, repr=False)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def _memo(self, name: str, *args: float):
+        key = (name,) + args
+        v = self._cache.get(key)
+        if v is None:
+            v = getattr(self.inner, name)(*args)
+            self._cache[key] = v
+        return v
+
+    def rho_ph(self, p_pa: float, h_jkg: float) -> float:
+        key = ("rho_ph", p_pa, h_jkg)
+        v = self._cache.get(key)
+        if v is None:
+            v = self.inner.rho_ph(p_pa, h_jkg)
+            self._cache[key] = v
+        return v
+
+    def h_px(self, p_pa: float, x: float) -> float:
+        key = ("h_px", p_pa, x)
+        v = self._cache.get(key)
+        if v is None:
+            v = self.inner.h_px(p_pa, x)
+            self._cache[key] = v
+        return v
+
+    def mu_ph(self, p_pa: float, h_jkg: float) -> float:
+        return self._memo("mu_ph", p_pa, h_jkg)
+
+    def k_ph(self, p_pa: float, h_jkg: float) -> float:
+        return self._memo("k_ph", p_pa, h_jkg)
+
+    def cp_ph(self, p_pa: float, h_jkg: float) -> float:
+        return self._memo("cp_ph", p_pa, h_jkg)
+
+    # state_ph and sat_all are queried by every pipe-like component, so like rho_ph they
+    # inline the lookup instead of going through _memo's argument packing and getattr
+    def state_ph(self, p_pa: float, h_jkg: float):
+        key = ("state_ph", p_pa, h_jkg)
+        v = self._cache.get(key)
+        if v is None:
+            v = self.inner.state_ph(p_pa, h_jkg)
+            self._cache[key] = v
+        return v
+
+    def T_ph(self, p_pa: float, h_jkg: float) -> float:
+        return self._memo("T_ph", p_pa, h_jkg)
+
+    def quality_ph(self, p_pa: float, h_jkg: float) -> float:
+        return self._memo("quality_ph", p_pa, h_jkg)
+
+    def void_fraction_ph(self, p_pa: float, h_jkg: float) -> float:
+        return self._memo("void_fraction_ph", p_pa, h_jkg)
+
+    def sat_all(self, p_pa: float):
+        key = ("sat_all", p_pa)
+        v = self._cache.get(key)
+        if v is None:
+            v = self.inner.sat_all(p_pa)
+            self._cache[key] = v
+        return v
+
+    def sat_h_l_v(self, p_pa: float) -> Tuple[float, float]:
+        return self._memo("sat_h_l_v", p_pa)
+
+    def sat_rho_l_v(self, p_pa: float) -> Tuple[float, float]:
+        return self._memo("sat_rho_l_v", p_pa)
+
+    def sat_mu_l_v(self, p_pa: float) -> Tuple[float, float]:
+        return self._memo("sat_mu_l_v", p_pa)
+
+    def rho_ph_vec(self, p_pa, h_jkg) -> np.ndarray:
+        p_arr, h_arr = np.broadcast_arrays(np.asarray(p_pa, dtype=float), np.asarray(h_jkg, dtype=float))
+        rho_ph = self.rho_ph
+        rho = [rho_ph(p, h) for p, h in zip(p_arr.ravel().tolist(), h_arr.ravel().tolist())]
+        return np.array(rho, dtype=float).reshape(p_arr.shape)
+
+    def __getattr__(self, name: str):
+        # Only called for attributes not found on the wrapper itself.
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
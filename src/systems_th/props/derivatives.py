@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from typing import Callable
+
+
+def partials_ph(
+    fn: Callable[[float, float], float], p_pa: float, h_jkg: float, rel_step: float = 1e-6
+) -> tuple[float, float, float]:
+    """Value and forward-difference partials of a property function ``fn(p, h)``.
+
+    Returns ``(f, df/dp, df/dh)``. Steps follow the solver convention
+    ``rel_step * max(1, |x|)``. Also valid for (p, x) functions such as ``h_px``.
+    """
+    f0 = fn(p_pa, h_jkg)
+    dp = rel_step * max(1.0, abs(p_pa))
+    dh = rel_step * max(1.0, abs(h_jkg))
+    df_dp = (fn(p_pa + dp, h_jkg) - f0) / dp
+    df_dh = (fn(p_pa, h_jkg + dh) - f0) / dh
+    return f0, df_dp, df_dh
+
+
+def rho_ph_partials(props, p_pa: float, h_jkg: float) -> tuple[float, float, float]:
+    """``(rho, drho/dp, drho/dh)``, using the backend's own partials when it has them."""
+    fn = getattr(props, "rho_ph_partials", None)
+    if fn is not None:
+        return fn(p_pa, h_jkg)
+    return partials_ph(props.rho_ph, p_pa, h_jkg)
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from bisect import bisect_right
+from importlib.metadata import PackageNotFoundError, version as _dist_version
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .._jit import njit
+
+
+class SatBundle(NamedTuple):
+    """All saturation properties at one pressure (SI units)."""
+
+    h_l: float
+    h_v: float
+    rho_l: float
+    rho_v: float
+    mu_l: float
+    mu_v: float
+    k_l: float
+    k_v: float
+    cp_l: float
+    cp_v: float
+    T_sat: float
+    sigma: float
+
+
+# Columns of a SaturationTable (T_sat and sigma are single-valued)
+SAT_FIELDS: Tuple[str, ...] = SatBundle._fields
+
+
+def sat_bundle_from_states(w_l, w_v) -> SatBundle:
+    """:class:`SatBundle` from saturated liquid/vapour IAPWS97 states (converted to SI)."""
+    return SatBundle(
+        float(w_l.h) * 1e3, float(w_v.h) * 1e3,
+        float(w_l.rho), float(w_v.rho),
+        float(w_l.mu), float(w_v.mu),
+        float(w_l.k), float(w_v.k),
+        float(w_l.cp) * 1e3, float(w_v.cp) * 1e3,
+        float(w_l.T), float(w_l.sigma),
+    )
+
+
+def _iapws_row(IAPWS97, p_pa: float) -> SatBundle:
+    return sat_bundle_from_states(IAPWS97(P=p_pa * 1e-6, x=0.0), IAPWS97(P=p_pa * 1e-6, x=1.0))
+
+
+@dataclass(frozen=True)
+class SaturationTable:
+    """Saturation properties on a log-spaced pressure grid, linearly interpolated in p.
+
+    One array per field (``columns[name]``, see :data:`SAT_FIELDS`) over the grid ``p``.
+    Scalar lookups bisect a list copy of the grid, so a query costs a few hundred
+    nanoseconds instead of two IAPWS97 constructions. Pressures outside the grid
+    return None (callers fall back to the exact backend).
+
+    Compiled kernels use :attr:`arrays` with :func:`sat_lookup` instead, so they can
+    query the table without calling back into Python.
+    """
+
+    p: np.ndarray
+    columns: Dict[str, np.ndarray]
+
+    _p_list: List[float] = field(init=False, repr=False, compare=False)
+    _col_list: Dict[str, List[float]] = field(init=False, repr=False, compare=False)
+    # _col_list values in SAT_FIELDS order
+    _col_seq: Tuple[List[float], ...] = field(init=False, repr=False, compare=False)
+    # Columns stacked in SAT_FIELDS order, shape (len(SAT_FIELDS), len(p))
+    _values: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_p_list", self.p.tolist())
+        object.__setattr__(self, "_col_list", {k: v.tolist() for k, v in self.columns.items()})
+        object.__setattr__(self, "_col_seq", tuple(self._col_list[k] for k in SAT_FIELDS))
+        grid = np.ascontiguousarray(self.p, dtype=float)
+        object.__setattr__(self, "p", grid)
+        object.__setattr__(
+            self, "_values", np.ascontiguousarray(np.stack([self.columns[k] for k in SAT_FIELDS]), dtype=float)
+        )
+
+    @property
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """``(p, values)`` arguments of :func:`sat_lookup` (C-contiguous float arrays)."""
+        return self.p, self._values
+
+    def save(self, path: Path) -> None:
+        """Write the table to ``path`` (``.npz``) atomically: temp file, then rename."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".npz")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, p=self.p, **self.columns)  # type: ignore[arg-type]
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    @classmethod
+    def load(cls, path: Path) -> "SaturationTable":
+        with np.load(path) as f:
+            return cls(p=f["p"], columns={k: np.ascontiguousarray(f[k]) for k in SAT_FIELDS})
+
+    @classmethod
+    def build(cls, p_min: float = 1e3, p_max: float = 21e6, n: int = 4096) -> "SaturationTable":
+        """Evaluate IAPWS97 at ``n`` log-spaced pressures in [p_min, p_max] (Pa)."""
+        from .water_iapws import WaterIAPWS
+
+        IAPWS97 = WaterIAPWS._require_iapws()
+        p = np.geomspace(float(p_min), float(p_max), int(n))
+        values = np.array([_iapws_row(IAPWS97, float(pi)) for pi in p], dtype=float)
+        return cls(p=p, columns={k: np.ascontiguousarray(values[:, i]) for i, k in enumerate(SAT_FIELDS)})
+
+    def _locate(self, p_pa: float) -> Optional[Tuple[int, float]]:
+        grid = self._p_list
+        if not (grid[0] <= p_pa <= grid[-1]):
+            return None
+        i = min(max(bisect_right(grid, p_pa), 1), len(grid) - 1)
+        return i, (p_pa - grid[i - 1]) / (grid[i] - grid[i - 1])
+
+    def value(self, name: str, p_pa: float) -> Optional[float]:
+        loc = self._locate(p_pa)
+        if loc is None:
+            return None
+        i, t = loc
+        c = self._col_list[name]
+        return c[i - 1] + t * (c[i] - c[i - 1])
+
+    def bundle(self, p_pa: float) -> Optional[SatBundle]:
+        """All columns at ``p_pa`` (one bisection)."""
+        loc = self._locate(p_pa)
+        if loc is None:
+            return None
+        i, t = loc
+        return SatBundle(*[c[i - 1] + t * (c[i] - c[i - 1]) for c in self._col_seq])
+
+    def pair(self, name_l: str, name_v: str, p_pa: float) -> Optional[Tuple[float, float]]:
+        loc = self._locate(p_pa)
+        if loc is None:
+            return None
+        i, t = loc
+        a = self._col_list[name_l]
+        b = self._col_list[name_v]
+        return (a[i - 1] + t * (a[i] - a[i - 1]), b[i - 1] + t * (b[i] - b[i - 1]))
+
+
+@njit("b1(f8[::1], f8[:, ::1], f8, f8[::1])", cache=True)
+def sat_lookup(p_grid, values, p_pa, out):
+    """Interpolate every column of a :class:`SaturationTable` at ``p_pa`` into ``out``.
+
+    ``(p_grid, values)`` are :attr:`SaturationTable.arrays`; ``out`` holds one entry per
+    :data:`SAT_FIELDS` name. Returns False (``out`` untouched) outside the grid.
+    """
+    n = p_grid.shape[0]
+    if not (p_grid[0] <= p_pa <= p_grid[n - 1]):
+        return False
+    i = min(max(np.searchsorted(p_grid, p_pa, side="right"), 1), n - 1)
+    t = (p_pa - p_grid[i - 1]) / (p_grid[i] - p_grid[i - 1])
+    for k in range(values.shape[0]):
+        out[k] = values[k, i - 1] + t * (values[k, i] - values[k, i - 1])
+    return True
+
+
+_TABLES: Dict[int, SaturationTable] = {}
+
+
+def _cache_path(n: int) -> Optional[Path]:
+    """On-disk location of the default ``n``-point table, keyed on the iapws version.
+
+    ``$SYSTEMS_TH_CACHE_DIR`` (empty: no disk cache), else ``$XDG_CACHE_HOME/systems_th``
+    or ``~/.cache/systems_th``.
+    """
+    root = os.environ.get("SYSTEMS_TH_CACHE_DIR")
+    if root is None:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+        root = os.path.join(base, "systems_th")
+    if not root:
+        return None
+    try:
+        iapws_version = _dist_version("iapws")  # from metadata: no iapws import on a cache hit
+    except PackageNotFoundError:
+        return None
+    return Path(root) / f"sat_table_{n}_iapws-{iapws_version}.npz"
+
+
+def _load_cached(path: Optional[Path], n: int) -> Optional[SaturationTable]:
+    if path is None or not path.is_file():
+        return None
+    try:
+        table = SaturationTable.load(path)
+    except (OSError, KeyError, ValueError):
+        return None
+    # Reject tables written for another grid
+    if not np.array_equal(table.p, np.geomspace(1e3, 21e6, n)):
+        return None
+    return table
+
+
+def saturation_table(n: int = 4096) -> SaturationTable:
+    """Process-wide default table with ``n`` points.
+
+    Built on first use (a few seconds of IAPWS97 calls) and persisted to the user
+    cache (:func:`_cache_path`), so later processes only load it.
+    """
+    table = _TABLES.get(n)
+    if table is None:
+        path = _cache_path(n)
+        table = _load_cached(path, n)
+        if table is None:
+            table = SaturationTable.build(n=n)
+            if path is not None:
+                try:
+                    table.save(path)
+                except OSError:
+                    pass  # read-only cache location: keep the in-memory table
+        _TABLES[n] = table
+    return table
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional, Tuple
+
+import numpy as np
+
+from .derivatives import partials_ph
+from .water_iapws import StateBundle
+
+
+@dataclass
+class TabulatedWater:
+    """Tabulated interpolation of the hot property calls of a :class:`WaterProps` backend.
+
+    ``rho_ph``, ``mu_ph``, ``quality_ph``, ``void_fraction_ph``, ``state_ph`` and ``h_px``
+    are tabulated (the calls made by the residual hot paths); every other attribute is
+    forwarded to ``inner``.
+
+    - Saturation lines h_l, h_v, rho_l, rho_v (and mu, k, cp of both phases) are cubic
+      splines in p. Inside the dome the HEM mixture formulas of the backend are applied
+      to those splines, so quality, void fraction and ``h_px`` are exact in x.
+    - Subcooled liquid and superheated vapour each get bicubic ``RectBivariateSpline``
+      tables of rho, mu, k and cp in (p, s), where s maps [h_lo, h_l(p)] resp.
+      [h_v(p), h_hi] onto [0, 1]. No table straddles a saturation line, so the property
+      kinks are never interpolated across.
+    - Outside the envelope, or above the last subcritical grid pressure, the exact
+      backend is used.
+
+    Requires SciPy. Build with :meth:`around_connections` (or ``Network.tabulate_props``)
+    to size the envelope from the current connection states.
+    """
+
+    inner: Any
+    p_range: Tuple[float, float]
+    h_range: Tuple[float, float]
+    n_p: int = 60
+    n_h: int = 60  # per single-phase table
+
+    _p_sat_max: float = field(default=0.0, init=False, repr=False)
+    _h_l: Any = field(default=None, init=False, repr=False)
+    _h_v: Any = field(default=None, init=False, repr=False)
+    _rho_l: Any = field(default=None, init=False, repr=False)
+    _rho_v: Any = field(default=None, init=False, repr=False)
+    # mu_l, mu_v, k_l, k_v, cp_l on the saturation lines (one vector-valued spline)
+    _sat_tr: Any = field(default=None, init=False, repr=False)
+    # rho splines of the single-phase tables, and their (mu, k, cp) splines
+    _liq: Any = field(default=None, init=False, repr=False)
+    _vap: Any = field(default=None, init=False, repr=False)
+    _liq_tr: Tuple[Any, ...] = field(default=(), init=False, repr=False)
+    _vap_tr: Tuple[Any, ...] = field(default=(), init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        try:
+            from scipy.interpolate import CubicSpline, RectBivariateSpline
+        except ImportError as e:  # pragma: no cover - depends on environment
+            raise ImportError("SciPy is required for TabulatedWater. Install with: pip install scipy") from e
+
+        p_lo, p_hi = map(float, self.p_range)
+        h_lo, h_hi = map(float, self.h_range)
+        if not (0.0 < p_lo < p_hi and h_lo < h_hi):
+            raise ValueError("TabulatedWater: p_range and h_range must be increasing (p > 0)")
+
+        # Tables only cover subcritical pressures
+        pc = float(getattr(self.inner, "Pc_pa", 22.064e6))
+        p_grid = np.linspace(p_lo, min(p_hi, 0.999 * pc), self.n_p)
+        if p_grid[0] >= p_grid[-1]:
+            return
+        self._p_sat_max = float(p_grid[-1])
+
+        sat = [self.inner.sat_all(float(p)) for p in p_grid]
+        h_l_grid = np.array([b.h_l for b in sat])
+        h_v_grid = np.array([b.h_v for b in sat])
+        self._h_l = CubicSpline(p_grid, h_l_grid)
+        self._h_v = CubicSpline(p_grid, h_v_grid)
+        self._rho_l = CubicSpline(p_grid, [b.rho_l for b in sat])
+        self._rho_v = CubicSpline(p_grid, [b.rho_v for b in sat])
+        self._sat_tr = CubicSpline(p_grid, [(b.mu_l, b.mu_v, b.k_l, b.k_v, b.cp_l) for b in sat])
+
+        s_grid = np.linspace(0.0, 1.0, self.n_h)
+
+        def tables(h_a, h_b, edge, liquid):
+            # rho, mu, k, cp splines over h = h_a + s*(h_b - h_a). Transport nodes on the
+            # saturation line (s = 1 liquid, s = 0 vapour) take the saturation values,
+            # since IAPWS97 has no transport properties exactly on the phase boundary.
+            s_edge = 1.0 if liquid else 0.0
+            nodes = []
+            for p, a, b, e in zip(p_grid, h_a, h_b, edge):
+                row = []
+                for s in s_grid:
+                    h = a + s * (b - a)
+                    tr = e if s == s_edge else tuple(self.inner.state_ph(float(p), h)[1:4])
+                    row.append((self.inner.rho_ph(float(p), h),) + tr)
+                nodes.append(row)
+            st = np.array(nodes)
+            return [RectBivariateSpline(p_grid, s_grid, st[:, :, i], kx=3, ky=3) for i in range(4)]
+
+        if h_lo < h_l_grid.min():
+            edge = [(b.mu_l, b.k_l, b.cp_l) for b in sat]
+            self._liq, *tr = tables(np.full_like(h_l_grid, h_lo), h_l_grid, edge, True)
+            self._liq_tr = tuple(tr)
+        if h_hi > h_v_grid.max():
+            edge = [(b.mu_v, b.k_v, b.cp_v) for b in sat]
+            self._vap, *tr = tables(h_v_grid, np.full_like(h_v_grid, h_hi), edge, False)
+            self._vap_tr = tuple(tr)
+
+    @classmethod
+    def around_connections(
+        cls,
+        inner: Any,
+        connections: Iterable[Any],
+        margin: float = 0.25,
+        **kwargs,
+    ) -> "TabulatedWater":
+        """Table covering all connection (p, h) states, widened by ``margin`` (relative)."""
+        conns = list(connections)
+        if not conns:
+            raise ValueError("TabulatedWater.around_connections: no connections")
+        p = np.array([c.p.value for c in conns], dtype=float)
+        h = np.array([c.h.value for c in conns], dtype=float)
+        p_range = (max(1e3, p.min() * (1.0 - margin)), min(100e6, p.max() * (1.0 + margin)))
+        h_span = max(h.max() - h.min(), 1e5)
+        h_range = (max(1e3, h.min() - margin * h_span), h.max() + margin * h_span)
+        return cls(inner, p_range, h_range, **kwargs)
+
+    def _sat(self, p_pa: float) -> Optional[Tuple[float, float]]:
+        if self._h_l is None or not (self.p_range[0] <= p_pa <= self._p_sat_max):
+            return None
+        return float(self._h_l(p_pa)), float(self._h_v(p_pa))
+
+    def h_px(self, p_pa: float, x: float) -> float:
+        sat = self._sat(p_pa)
+        if sat is None:
+            return self.inner.h_px(p_pa, x)
+        x = max(0.0, min(1.0, float(x)))
+        return (1.0 - x) * sat[0] + x * sat[1]
+
+    def _locate(self, p_pa: float, h_jkg: float):
+        """(region, spline, s, ds/dp, ds/dh); region is 'liq', 'vap', 'dome' or 'exact'."""
+        sat = self._sat(p_pa)
+        h_lo, h_hi = self.h_range
+        if sat is None or not (h_lo <= h_jkg <= h_hi):
+            return "exact", None, 0.0, 0.0, 0.0
+        h_l, h_v = sat
+        if h_l < h_jkg < h_v:
+            return "dome", None, 0.0, 0.0, 0.0
+        if h_jkg <= h_l:
+            if self._liq is None:
+                return "exact", None, 0.0, 0.0, 0.0
+            span = h_l - h_lo
+            s = (h_jkg - h_lo) / span
+            return "liq", self._liq, s, -s / span * float(self._h_l(p_pa, 1)), 1.0 / span
+        if self._vap is None:
+            return "exact", None, 0.0, 0.0, 0.0
+        span = h_hi - h_v
+        s = (h_jkg - h_v) / span
+        return "vap", self._vap, s, (s - 1.0) / span * float(self._h_v(p_pa, 1)), 1.0 / span
+
+    def rho_ph(self, p_pa: float, h_jkg: float) -> float:
+        region, spl, s, _, _ = self._locate(p_pa, h_jkg)
+        if spl is not None:
+            return float(spl.ev(p_pa, s))
+        if region == "dome":
+            h_l, h_v = float(self._h_l(p_pa)), float(self._h_v(p_pa))
+            x = (h_jkg - h_l) / (h_v - h_l)
+            return 1.0 / (x / float(self._rho_v(p_pa)) + (1.0 - x) / float(self._rho_l(p_pa)))
+        return self.inner.rho_ph(p_pa, h_jkg)
+
+    def rho_ph_vec(self, p_pa, h_jkg) -> np.ndarray:
+        """``rho_ph`` for broadcastable arrays of (p, h).
+
+        Points are classified as in :meth:`rho_ph`; each single-phase table and the dome
+        formula are then evaluated once over all of their points. Points outside the
+        envelope go to the backend one by one.
+        """
+        p, h = np.broadcast_arrays(np.asarray(p_pa, dtype=float), np.asarray(h_jkg, dtype=float))
+        out = np.empty(p.shape, dtype=float)
+        rest = np.ones(p.shape, dtype=bool)
+        if self._h_l is not None:
+            h_lo, h_hi = self.h_range
+            inside = (self.p_range[0] <= p) & (p <= self._p_sat_max) & (h_lo <= h) & (h <= h_hi)
+            h_l = self._h_l(p)
+            h_v = self._h_v(p)
+            dome = inside & (h_l < h) & (h < h_v)
+            if dome.any():
+                pd = p[dome]
+                x = (h[dome] - h_l[dome]) / (h_v[dome] - h_l[dome])
+                out[dome] = 1.0 / (x / self._rho_v(pd) + (1.0 - x) / self._rho_l(pd))
+            rest &= ~dome
+            if self._liq is not None:
+                liq = inside & (h <= h_l)
+                out[liq] = self._liq.ev(p[liq], (h[liq] - h_lo) / (h_l[liq] - h_lo))
+                rest &= ~liq
+            if self._vap is not None:
+                vap = inside & (h >= h_v)
+                out[vap] = self._vap.ev(p[vap], (h[vap] - h_v[vap]) / (h_hi - h_v[vap]))
+                rest &= ~vap
+        flat, p_flat, h_flat = out.reshape(-1), p.ravel(), h.ravel()
+        for i in np.flatnonzero(rest).tolist():
+            flat[i] = self.inner.rho_ph(float(p_flat[i]), float(h_flat[i]))
+        return out
+
+    def quality_ph(self, p_pa: float, h_jkg: float) -> float:
+        sat = self._sat(p_pa)
+        if sat is None:
+            return self.inner.quality_ph(p_pa, h_jkg)
+        h_l, h_v = sat
+        return max(0.0, min(1.0, (h_jkg - h_l) / (h_v - h_l)))
+
+    def void_fraction_ph(self, p_pa: float, h_jkg: float) -> float:
+        sat = self._sat(p_pa)
+        if sat is None:
+            return self.inner.void_fraction_ph(p_pa, h_jkg)
+        h_l, h_v = sat
+        x = (h_jkg - h_l) / (h_v - h_l)
+        if x <= 0.0:
+            return 0.0
+        if x >= 1.0:
+            return 1.0
+        vg = x / float(self._rho_v(p_pa))
+        return vg / (vg + (1.0 - x) / float(self._rho_l(p_pa)))
+
+    def mu_ph(self, p_pa: float, h_jkg: float) -> float:
+        return self.state_ph(p_pa, h_jkg).mu
+
+    def rho_ph_partials(self, p_pa: float, h_jkg: float) -> Tuple[float, float, float]:
+        """``(rho, drho/dp, drho/dh)``; spline derivatives in the single-phase tables."""
+        _, spl, s, ds_dp, ds_dh = self._locate(p_pa, h_jkg)
+        if spl is None:
+            return partials_ph(self.rho_ph, p_pa, h_jkg)
+        d_s = float(spl.ev(p_pa, s, dy=1))
+        return (
+            float(spl.ev(p_pa, s)),
+            float(spl.ev(p_pa, s, dx=1)) + d_s * ds_dp,
+            d_s * ds_dh,
+        )
+
+    def state_ph(self, p_pa: float, h_jkg: float):
+        """:class:`StateBundle` from the tables (same mixture rules as the backend)."""
+        region, spl, s, _, _ = self._locate(p_pa, h_jkg)
+        if spl is not None:
+            x = 0.0 if region == "liq" else 1.0
+            mu, k, cp = (float(t.ev(p_pa, s)) for t in (self._liq_tr if region == "liq" else self._vap_tr))
+            return StateBundle(float(spl.ev(p_pa, s)), mu, k, cp, x, x)
+        if region == "dome":
+            h_l, h_v = float(self._h_l(p_pa)), float(self._h_v(p_pa))
+            x = (h_jkg - h_l) / (h_v - h_l)
+            vg = x / float(self._rho_v(p_pa))
+            vl = (1.0 - x) / float(self._rho_l(p_pa))
+            alpha = vg / (vg + vl)
+            mu_l, mu_v, k_l, k_v, cp_l = self._sat_tr(p_pa).tolist()
+            return StateBundle(
+                1.0 / (vg + vl),
+                (1.0 - alpha) * mu_l + alpha * mu_v,
+                (1.0 - alpha) * k_l + alpha * k_v,
+                cp_l,
+                x,
+                alpha,
+            )
+        return self.inner.state_ph(p_pa, h_jkg)
+
+    def __getattr__(self, name: str):
+        # Only called for attributes not found on the wrapper itself.
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
@@ -1,14 +1,42 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from functools import lru_cache
-from typing import Protocol, Tuple
+from dataclasses import dataclass, field
+from typing import Any, Dict, NamedTuple, Optional, Protocol, Tuple, Union
+
+import numpy as np
+
+from ._if97 import (
+    T_ph_liquid, T_ph_vapour, sat_h_l_v_if97, saturation_lines, thermo_ph_liquid, thermo_ph_vapour,
+)
+from .saturation import SatBundle, sat_bundle_from_states, saturation_table
+
+
+class StateBundle(NamedTuple):
+    """Mixture properties at one (p, h) state (SI units, HEM in the dome)."""
+
+    rho: float
+    mu: float
+    k: float
+    cp: float
+    x: float
+    alpha: float
+
+
+class ThermoBundle(NamedTuple):
+    """Thermodynamic state at (p, h) (SI units, HEM in the dome); arrays from thermo_ph_vec."""
+
+    T: Union[float, np.ndarray]
+    x: Union[float, np.ndarray]
+    alpha: Union[float, np.ndarray]
+    s: Union[float, np.ndarray]
+    rho: Union[float, np.ndarray]
 
 
 class WaterProps(Protocol):
     """Water/steam properties interface (SI units)."""
 
     # Saturation helpers
+    def sat_all(self, p_pa: float) -> SatBundle: ...
     def sat_h_l_v(self, p_pa: float) -> tuple[float, float]: ...
     def sat_rho_l_v(self, p_pa: float) -> tuple[float, float]: ...
     def sat_mu_l_v(self, p_pa: float) -> tuple[float, float]: ...
@@ -32,6 +60,7 @@ class WaterProps(Protocol):
     def k_ph(self, p_pa: float, h_jkg: float) -> float: ...
     def cp_ph(self, p_pa: float, h_jkg: float) -> float: ...
     def void_fraction_ph(self, p_pa: float, h_jkg: float) -> float: ...
+    def state_ph(self, p_pa: float, h_jkg: float) -> StateBundle: ...
 
 
 def _round(x: float, nd: int = 8) -> float:
@@ -51,13 +80,49 @@ class WaterIAPWS:
 
     Notes
     -----
-    Uses LRU caching on the expensive IAPWS97 state calls.
+    The expensive IAPWS97 state constructions are cached per instance in plain dicts
+    (a hit is one tuple hash, without LRU recency bookkeeping). Each cache holds up to
+    ``state_cache_size`` states and is emptied when full; ``clear()`` empties them all.
+
+    With ``sat_table=True`` the saturation queries (``sat_all`` and the ``sat_*_l_v``,
+    ``T_sat_p``, ``sigma_sat_p`` accessors derived from it) are interpolated from a
+    :class:`~systems_th.props.saturation.SaturationTable` of ``sat_table_points``
+    log-spaced pressures (1 kPa - 21 MPa; built on first use, ~0.6 ms per point, and
+    persisted to the user cache for later processes). With the default 4096 points the
+    linear interpolation error is below ~1e-6 relative up to 10 MPa and ~1e-4 at 21 MPa,
+    where cp and the vapour properties steepen; nearer the critical point the exact path
+    is used.
+
+    Single-phase ``T_ph`` (and ``thermo_ph``) is solved by the compiled IF97 kernels of
+    :mod:`._if97` (regions 1 and 2 below 16.5 MPa), without building an IAPWS97 state;
+    elsewhere it falls back to iapws.
     """
 
     # Critical pressure of water [Pa] (IAPWS IF97)
     Pc_pa: float = 22.064e6
     # Molar mass [kg/mol]
     molar_mass: float = 0.018015268
+    # Interpolate saturation properties from a pressure table
+    sat_table: bool = False
+    sat_table_points: int = 4096
+    state_cache_size: int = 8192
+
+    # IAPWS97 states keyed by the (P [MPa], second input) pair they were requested at
+    _px: Dict[Tuple[float, float], Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _ph: Dict[Tuple[float, float], Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _ps: Dict[Tuple[float, float], Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _pT: Dict[Tuple[float, float], Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # Saturation bundles keyed by pressure [Pa]
+    _sat: Dict[float, SatBundle] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # Closed-form IF97 (h_l, h_v) keyed by pressure [Pa], None above its range (see sat_h_l_v)
+    _sat_h: Dict[float, Optional[Tuple[float, float]]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def clear(self) -> None:
+        """Drop all cached IAPWS97 states and saturation bundles."""
+        for cache in (self._px, self._ph, self._ps, self._pT, self._sat, self._sat_h):
+            cache.clear()
 
     @staticmethod
     def _require_iapws():
@@ -97,75 +162,111 @@ class WaterIAPWS:
     # Cached IAPWS state calls
     # -------------------------
 
-    @staticmethod
-    @lru_cache(maxsize=8192)
-    def _state_px_cached(P_mpa: float, x: float):
-        IAPWS97 = WaterIAPWS._require_iapws()
-        return IAPWS97(P=_round(P_mpa, 8), x=_round(x, 8))
+    def _build_state(self, cache: Dict[Tuple[float, float], Any], key: Tuple[float, float], **inputs):
+        if len(cache) >= self.state_cache_size:
+            cache.clear()
+        IAPWS97 = self._require_iapws()
+        w = cache[key] = IAPWS97(**inputs)
+        return w
 
-    @staticmethod
-    @lru_cache(maxsize=8192)
-    def _state_ph_cached(P_mpa: float, h_kjkg: float):
-        IAPWS97 = WaterIAPWS._require_iapws()
-        return IAPWS97(P=_round(P_mpa, 8), h=_round(h_kjkg, 6))
+    def _state_px_cached(self, P_mpa: float, x: float):
+        try:
+            return self._px[P_mpa, x]
+        except KeyError:
+            return self._build_state(self._px, (P_mpa, x), P=_round(P_mpa, 8), x=_round(x, 8))
 
-    @staticmethod
-    @lru_cache(maxsize=8192)
-    def _state_ps_cached(P_mpa: float, s_kjkgK: float):
-        IAPWS97 = WaterIAPWS._require_iapws()
-        return IAPWS97(P=_round(P_mpa, 8), s=_round(s_kjkgK, 7))
+    def _state_ph_cached(self, P_mpa: float, h_kjkg: float):
+        try:
+            return self._ph[P_mpa, h_kjkg]
+        except KeyError:
+            return self._build_state(self._ph, (P_mpa, h_kjkg), P=_round(P_mpa, 8), h=_round(h_kjkg, 6))
 
-    @staticmethod
-    @lru_cache(maxsize=8192)
-    def _state_pT_cached(P_mpa: float, T_k: float):
-        IAPWS97 = WaterIAPWS._require_iapws()
-        return IAPWS97(P=_round(P_mpa, 8), T=_round(T_k, 6))
+    def _state_ps_cached(self, P_mpa: float, s_kjkgK: float):
+        try:
+            return self._ps[P_mpa, s_kjkgK]
+        except KeyError:
+            return self._build_state(self._ps, (P_mpa, s_kjkgK), P=_round(P_mpa, 8), s=_round(s_kjkgK, 7))
+
+    def _state_pT_cached(self, P_mpa: float, T_k: float):
+        try:
+            return self._pT[P_mpa, T_k]
+        except KeyError:
+            return self._build_state(self._pT, (P_mpa, T_k), P=_round(P_mpa, 8), T=_round(T_k, 6))
 
     # -------------------------
     # Saturation
     # -------------------------
 
+    def sat_all(self, p_pa: float) -> SatBundle:
+        """Every saturation property at ``p_pa`` in one query (cached per pressure).
+
+        The ``sat_*_l_v``, ``T_sat_p`` and ``sigma_sat_p`` accessors all pluck from
+        this bundle, so one pressure costs two IAPWS97 states (or one table lookup)
+        however many of them a correlation needs.
+        """
+        try:
+            return self._sat[p_pa]
+        except KeyError:
+            pass
+        sat = saturation_table(self.sat_table_points).bundle(p_pa) if self.sat_table else None
+        if sat is None:
+            P = self._pa_to_mpa(p_pa)
+            sat = sat_bundle_from_states(self._state_px_cached(P, 0.0), self._state_px_cached(P, 1.0))
+            h = self._sat_h_if97(p_pa)
+            if h is not None:
+                sat = sat._replace(h_l=h[0], h_v=h[1])
+        if len(self._sat) >= self.state_cache_size:
+            self._sat.clear()
+        self._sat[p_pa] = sat
+        return sat
+
     def T_sat_p(self, p_pa: float) -> float:
-        P = self._pa_to_mpa(p_pa)
-        # saturation line: use x=0.5
-        w = self._state_px_cached(P, 0.5)
-        return float(w.T)
+        return self.sat_all(p_pa).T_sat
 
     def sigma_sat_p(self, p_pa: float) -> float:
-        P = self._pa_to_mpa(p_pa)
-        w = self._state_px_cached(P, 0.5)
-        return float(w.sigma)
+        return self.sat_all(p_pa).sigma
+
+    def _sat_h_if97(self, p_pa: float) -> Optional[Tuple[float, float]]:
+        """Closed-form IF97 ``(h_l, h_v)``; None above 16.53 MPa (both cached per pressure)."""
+        try:
+            return self._sat_h[p_pa]
+        except KeyError:
+            pass
+        h_l, h_v = sat_h_l_v_if97(p_pa)
+        if len(self._sat_h) >= self.state_cache_size:
+            self._sat_h.clear()
+        h = self._sat_h[p_pa] = (h_l, h_v) if h_l == h_l else None  # NaN outside the kernel range
+        return h
 
     def sat_h_l_v(self, p_pa: float) -> tuple[float, float]:
-        P = self._pa_to_mpa(p_pa)
-        w_l = self._state_px_cached(P, 0.0)
-        w_v = self._state_px_cached(P, 1.0)
-        return (self._kjkg_to_jkg(w_l.h), self._kjkg_to_jkg(w_v.h))
+        """Saturated enthalpies; backs ``quality_ph`` and ``h_px``.
+
+        Without ``sat_table`` these come from the IF97 saturation kernel up to 16.53 MPa,
+        so enthalpy-only callers (e.g. the separator's ``h_px``) build no IAPWS97 states;
+        ``sat_all`` carries the same kernel values.
+        """
+        if not self.sat_table:
+            h = self._sat_h_if97(p_pa)
+            if h is not None:
+                return h
+        sat = self.sat_all(p_pa)
+        return (sat.h_l, sat.h_v)
 
     def sat_rho_l_v(self, p_pa: float) -> tuple[float, float]:
-        P = self._pa_to_mpa(p_pa)
-        w_l = self._state_px_cached(P, 0.0)
-        w_v = self._state_px_cached(P, 1.0)
-        return (float(w_l.rho), float(w_v.rho))
+        sat = self.sat_all(p_pa)
+        return (sat.rho_l, sat.rho_v)
 
     def sat_mu_l_v(self, p_pa: float) -> tuple[float, float]:
-        P = self._pa_to_mpa(p_pa)
-        w_l = self._state_px_cached(P, 0.0)
-        w_v = self._state_px_cached(P, 1.0)
-        return (float(w_l.mu), float(w_v.mu))
+        sat = self.sat_all(p_pa)
+        return (sat.mu_l, sat.mu_v)
 
     def sat_k_l_v(self, p_pa: float) -> tuple[float, float]:
-        P = self._pa_to_mpa(p_pa)
-        w_l = self._state_px_cached(P, 0.0)
-        w_v = self._state_px_cached(P, 1.0)
-        return (float(w_l.k), float(w_v.k))
+        sat = self.sat_all(p_pa)
+        return (sat.k_l, sat.k_v)
 
     def sat_cp_l_v(self, p_pa: float) -> tuple[float, float]:
-        P = self._pa_to_mpa(p_pa)
-        w_l = self._state_px_cached(P, 0.0)
-        w_v = self._state_px_cached(P, 1.0)
-        # cp in kJ/kg/K
-        return (float(w_l.cp) * 1e3, float(w_v.cp) * 1e3)
+        sat = self.sat_all(p_pa)
+        return (sat.cp_l, sat.cp_v)
 
     # -------------------------
     # Thermodynamic state
@@ -177,13 +278,17 @@ class WaterIAPWS:
         return self._kjkg_to_jkg(w.h)
 
     def T_ph(self, p_pa: float, h_jkg: float) -> float:
-        x = self.quality_ph(p_pa, h_jkg)
-        if 0.0 < x < 1.0:
+        h_l, h_v = self.sat_h_l_v(p_pa)
+        if h_l < h_jkg < h_v:
             return self.T_sat_p(p_pa)
-        P = self._pa_to_mpa(p_pa)
-        h = self._jkg_to_kjkg(h_jkg)
-        w = self._state_ph_cached(P, h)
-        return float(w.T)
+        return self._T_ph_single(p_pa, h_jkg, h_jkg >= h_v)
+
+    def _T_ph_single(self, p_pa: float, h_jkg: float, vapour: bool) -> float:
+        T = T_ph_vapour(p_pa, h_jkg) if vapour else T_ph_liquid(p_pa, h_jkg)
+        if T == T:
+            return T
+        # NaN: outside the kernels' range (near-critical, region 3 or 5)
+        return float(self._state_ph_cached(self._pa_to_mpa(p_pa), self._jkg_to_kjkg(h_jkg)).T)
 
     def s_ph(self, p_pa: float, h_jkg: float) -> float:
         P = self._pa_to_mpa(p_pa)
@@ -274,3 +379,144 @@ class WaterIAPWS:
         h = self._jkg_to_kjkg(h_jkg)
         w = self._state_ph_cached(P, h)
         return float(w.cp) * 1e3
+
+    def state_ph(self, p_pa: float, h_jkg: float) -> StateBundle:
+        """``rho_ph``, ``mu_ph``, ``k_ph``, ``cp_ph``, ``quality_ph`` and ``void_fraction_ph``
+        in one query: the quality is computed once and then either the saturation bundle
+        or a single IAPWS97 state supplies everything (same values as the accessors)."""
+        x = self.quality_ph(p_pa, h_jkg)
+        if 0.0 < x < 1.0:
+            sat = self.sat_all(p_pa)
+            vg = x / sat.rho_v
+            vl = (1.0 - x) / sat.rho_l
+            alpha = vg / (vg + vl)
+            return StateBundle(
+                1.0 / (vg + vl),
+                (1.0 - alpha) * sat.mu_l + alpha * sat.mu_v,
+                (1.0 - alpha) * sat.k_l + alpha * sat.k_v,
+                sat.cp_l,
+                x,
+                alpha,
+            )
+        # Single phase: x is 0 or 1, and so is the void fraction
+        w = self._state_ph_cached(self._pa_to_mpa(p_pa), self._jkg_to_kjkg(h_jkg))
+        return StateBundle(float(w.rho), float(w.mu), float(w.k), float(w.cp) * 1e3, x, x)
+
+    def _thermo_single(self, p_pa: float, h_jkg: float, vapour: bool) -> Tuple[float, float, float]:
+        """Single-phase ``(T, rho, s)`` from one T-solve (iapws outside the kernels' range)."""
+        T, rho, s = thermo_ph_vapour(p_pa, h_jkg) if vapour else thermo_ph_liquid(p_pa, h_jkg)
+        if T == T:
+            return T, rho, s
+        w = self._state_ph_cached(self._pa_to_mpa(p_pa), self._jkg_to_kjkg(h_jkg))
+        return float(w.T), float(w.rho), self._kjkgK_to_jkgK(w.s)
+
+    def _sat_s_l_v(self, p_pa: float) -> Tuple[float, float]:
+        _, _, _, s_l, s_v = saturation_lines(p_pa)
+        if s_l == s_l:
+            return float(s_l), float(s_v)
+        # Near-critical: saturated IAPWS97 states
+        P = self._pa_to_mpa(p_pa)
+        return (self._kjkgK_to_jkgK(self._state_px_cached(P, 0.0).s),
+                self._kjkgK_to_jkgK(self._state_px_cached(P, 1.0).s))
+
+    def thermo_ph(self, p_pa: float, h_jkg: float) -> ThermoBundle:
+        """``T_ph``, ``quality_ph``, ``void_fraction_ph``, ``s_ph`` and ``rho_ph`` in one query.
+
+        The quality is computed once; single-phase states need one T-solve for all of
+        T, rho and s, dome states only the saturation lines. T, x and alpha equal the
+        single accessors; rho and s agree with iapws to the IF97 kernel tolerance.
+        """
+        x = self.quality_ph(p_pa, h_jkg)
+        if 0.0 < x < 1.0:
+            sat = self.sat_all(p_pa)
+            vg = x / sat.rho_v
+            vl = (1.0 - x) / sat.rho_l
+            s_l, s_v = self._sat_s_l_v(p_pa)
+            return ThermoBundle(sat.T_sat, x, vg / (vg + vl), s_l + x * (s_v - s_l), 1.0 / (vg + vl))
+        T, rho, s = self._thermo_single(p_pa, h_jkg, x >= 1.0)
+        return ThermoBundle(T, x, x, s, rho)
+
+    # -------------------------
+    # Batched (array) queries
+    # -------------------------
+
+    def rho_ph_vec(self, p_pa, h_jkg) -> np.ndarray:
+        """Density for broadcastable arrays of (p, h).
+
+        IAPWS97 has no array interface, so points are evaluated one by one through the
+        cached scalar path; the benefit is a single call site for many states.
+        """
+        p_arr, h_arr = np.broadcast_arrays(np.asarray(p_pa, dtype=float), np.asarray(h_jkg, dtype=float))
+        rho_ph = self.rho_ph
+        rho = [rho_ph(p, h) for p, h in zip(p_arr.ravel().tolist(), h_arr.ravel().tolist())]
+        return np.array(rho, dtype=float).reshape(p_arr.shape)
+
+    def _sat_vec(self, p_arr: np.ndarray) -> SatBundle:
+        """:class:`SatBundle` of arrays shaped like ``p_arr`` (``sat_all`` once per unique p)."""
+        p_unique, inv = np.unique(p_arr, return_inverse=True)
+        rows = np.array([self.sat_all(float(p)) for p in p_unique], dtype=float).reshape(len(p_unique), -1)
+        inv = inv.ravel()
+        return SatBundle(*(rows[inv, k].reshape(p_arr.shape) for k in range(rows.shape[1])))
+
+    def quality_void_ph_vec(self, p_pa, h_jkg) -> Tuple[np.ndarray, np.ndarray]:
+        """``(quality_ph, void_fraction_ph)`` for broadcastable arrays of (p, h).
+
+        The dome algebra runs on arrays; only the saturation states are looked up, once
+        per unique pressure.
+        """
+        p_arr, h_arr = np.broadcast_arrays(np.asarray(p_pa, dtype=float), np.asarray(h_jkg, dtype=float))
+        sat = self._sat_vec(p_arr)
+        x = np.clip((h_arr - sat.h_l) / (sat.h_v - sat.h_l), 0.0, 1.0)
+        vg = x / sat.rho_v
+        return x, vg / (vg + (1.0 - x) / sat.rho_l)
+
+    def T_ph_vec(self, p_pa, h_jkg) -> np.ndarray:
+        """Temperature for broadcastable arrays of (p, h): T_sat inside the dome (per unique
+        p), single-phase points as ``T_ph``."""
+        p_arr, h_arr = np.broadcast_arrays(np.asarray(p_pa, dtype=float), np.asarray(h_jkg, dtype=float))
+        sat = self._sat_vec(p_arr)
+        T = np.array(sat.T_sat, dtype=float)
+        vapour = h_arr >= sat.h_v
+        single = (h_arr <= sat.h_l) | vapour
+        for i in np.flatnonzero(single).tolist():
+            T.flat[i] = self._T_ph_single(float(p_arr.flat[i]), float(h_arr.flat[i]), bool(vapour.flat[i]))
+        return T
+
+    def thermo_ph_vec(self, p_pa, h_jkg) -> ThermoBundle:
+        """:meth:`thermo_ph` for broadcastable arrays of (p, h) (a bundle of arrays).
+
+        Dome states are evaluated on arrays from the saturation states (per unique p)
+        and the closed-form saturation entropies; single-phase points one T-solve each.
+        """
+        p_arr, h_arr = np.broadcast_arrays(np.asarray(p_pa, dtype=float), np.asarray(h_jkg, dtype=float))
+        sat = self._sat_vec(p_arr)
+        x = np.clip((h_arr - sat.h_l) / (sat.h_v - sat.h_l), 0.0, 1.0)
+        vg = x / sat.rho_v
+        v = vg + (1.0 - x) / sat.rho_l
+        alpha = vg / v
+        rho = 1.0 / v
+        T = np.array(sat.T_sat, dtype=float)
+        _, _, _, s_l, s_v = saturation_lines(p_arr)
+        s = s_l + x * (s_v - s_l)
+
+        vapour = h_arr >= sat.h_v
+        single = (h_arr <= sat.h_l) | vapour
+        for i in np.flatnonzero(single | np.isnan(s)).tolist():
+            p, h = float(p_arr.flat[i]), float(h_arr.flat[i])
+            if single.flat[i]:
+                T.flat[i], rho.flat[i], s.flat[i] = self._thermo_single(p, h, bool(vapour.flat[i]))
+                alpha.flat[i] = x.flat[i]
+            else:
+                s_li, s_vi = self._sat_s_l_v(p)
+                s.flat[i] = s_li + x.flat[i] * (s_vi - s_li)
+        return ThermoBundle(T, x, alpha, s, rho)
+
+    def h_px_vec(self, p_pa, x) -> np.ndarray:
+        """Enthalpy for broadcastable arrays of (p, x); saturation states looked up per unique p."""
+        p_arr, x_arr = np.broadcast_arrays(np.asarray(p_pa, dtype=float), np.asarray(x, dtype=float))
+        p_unique, inv = np.unique(p_arr, return_inverse=True)
+        hl_hv = np.array([self.sat_h_l_v(float(p)) for p in p_unique], dtype=float).reshape(-1, 2)
+        h_l = hl_hv[inv, 0].reshape(p_arr.shape)
+        h_v = hl_hv[inv, 1].reshape(p_arr.shape)
+        x_c = np.clip(x_arr, 0.0, 1.0)
+        return (1.0 - x_c) * h_l + x_c * h_v
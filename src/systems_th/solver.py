@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
+import functools
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
 
 import numpy as np
 
-from .equation import Equation
+from .jacobian import JacobianPattern
+from .linsolve import LinearSolver
 
 
 @dataclass
@@ -17,6 +19,39 @@ class SolveOptions:
     damping: bool = True
     verbose: bool = True
     print_worst: int = 5       # show worst residuals when verbose
+    log_to_list: bool = False  # verbose lines go to SolveResult.log_lines instead of stdout
+    linear_solver: str = "auto"  # "auto" (sparse LU if square), "sparse", "gmres" or "lstsq"
+    preconditioner: str = "ilu"  # for linear_solver="gmres": "ilu" or "amg" (needs pyamg)
+    method: str = "newton"     # "newton", or SciPy root finders "hybr" / "lm"
+    column_scaling: bool = True  # scale Newton columns by initial variable magnitudes
+    jacobian_refresh: int = 1  # rebuild J every k iterations; Broyden updates in between
+    refresh_ratio: float = 0.5  # ...or sooner, once a step cuts |F| by less than this (inf: never)
+
+
+@dataclass
+class SolverWorkspace:
+    """Work arrays of :func:`newton_solve`, allocated by ``Network.prepare`` and reused
+    across iterations so the Newton loop and the FD Jacobian do not allocate per step.
+
+    Residual-sized: ``f0``, ``f_prev``, ``rhs`` and the FD base-state copies ``raw0``,
+    ``basis0``. Free-variable-sized: ``x0``, ``x_prev``, ``x_trial``.
+    """
+
+    f0: np.ndarray
+    f_prev: np.ndarray
+    rhs: np.ndarray
+    raw0: np.ndarray
+    basis0: np.ndarray
+    x0: np.ndarray
+    x_prev: np.ndarray
+    x_trial: np.ndarray
+
+    @classmethod
+    def allocate(cls, n_eq: int, n_free: int) -> "SolverWorkspace":
+        return cls(
+            *(np.empty(n_eq, dtype=float) for _ in range(5)),
+            *(np.empty(n_free, dtype=float) for _ in range(3)),
+        )
 
 
 @dataclass
@@ -25,81 +60,179 @@ class SolveResult:
     iterations: int
     residual_norm: float
     message: str
+    # Verbose output when SolveOptions.log_to_list is set (printed otherwise)
+    log_lines: List[str] = field(default_factory=list)
+
+
+def _logged(solve: Callable[..., SolveResult]) -> Callable[..., SolveResult]:
+    """Give ``solve(network, options, emit)`` its verbose-output sink: ``print``, or
+    with ``log_to_list`` a list that is attached to the result as ``log_lines``."""
+
+    @functools.wraps(solve)
+    def wrapper(network, options: SolveOptions) -> SolveResult:
+        lines: List[str] = []
+        result = solve(network, options, lines.append if options.log_to_list else print)
+        result.log_lines = lines
+        return result
+
+    return wrapper
+
+
+def _pack_free(network, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Free-variable values from the network state array (after ``prepare``)."""
+    return np.take(network._x, network._free_idx, out=out)
+
+
+def _unpack_free(
+    network, x: np.ndarray, lo: np.ndarray, hi: np.ndarray, out: Optional[np.ndarray] = None,
+) -> None:
+    """Write free-variable values clipped into ``[lo, hi]`` (one vectorized pass).
+
+    ``out`` (not ``x``) receives the clipped copy when given.
+    """
+    network._x[network._free_idx] = np.clip(x, lo, hi, out=out)
+
+
+def _residual_vector(network, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Copy of the scaled residuals (into ``out`` when given)."""
+    f = network.evaluate_residuals()
+    if out is None:
+        return f.copy()
+    np.copyto(out, f)
+    return out
+
+
+def _assemble_jacobian(network, f0: np.ndarray, fd_eps: float) -> JacobianPattern:
+    """Jacobian of the scaled residuals, assembled into the network's CSR pattern.
+
+    Components providing ``jacobian_entries`` write analytic values into fixed slots (all
+    components gathered, then one scatter over the precomputed slots); the rows of the
+    remaining components are finite-differenced, perturbing only the columns they touch.
+    Structurally orthogonal columns (``pat.fd_groups``) are perturbed together and each
+    group re-evaluates only the components depending on it; all other residual slices
+    keep their base values.
+    """
+    pat = network._jac
+    data = pat.data
+    props = network._eval_props
+
+    if pat.analytic:
+        parts = []
+        for comp, keep, _ in pat.analytic:
+            entries = comp.jacobian_entries(props)
+            vals = np.fromiter((e[2] for e in entries), dtype=float, count=len(entries))
+            parts.append(vals[keep])
+        # Entries sharing a slot are summed
+        data[:] = np.bincount(pat.analytic_slots, weights=np.concatenate(parts), minlength=data.size)
+    else:
+        data[:] = 0.0
+
+    if pat.fd_components:
+        raw0, basis0 = network._work.raw0, network._work.basis0
+        np.copyto(raw0, network._raw)
+        np.copyto(basis0, network._basis)
+        # Perturb the state array in place (bounds clipped as Variable.clip)
+        x, lo, hi = network._x, network._lo, network._hi
+        free_idx = network._free_idx
+        for cols, comps in pat.fd_groups:
+            base = []
+            for j, _, _ in cols:
+                i = free_idx[j]
+                x0 = x[i]
+                step = fd_eps * max(1.0, abs(x0))
+                x[i] = min(max(x0 + step, lo[i]), hi[i])
+                base.append((i, x0, step))
+
+            f1 = network.evaluate_residuals(comps)
+            for (_, slots, rows), (i, x0, step) in zip(cols, base):
+                data[slots] = (f1[rows] - f0[rows]) / step
+                x[i] = x0
+        # Perturbed slices back to the base state
+        np.copyto(network._raw, raw0)
+        np.copyto(network._basis, basis0)
+        np.copyto(network._residual, f0)
+
+    return pat
+
+
+def _dense_step(J: np.ndarray, rhs: np.ndarray, col_scale: Optional[np.ndarray]) -> np.ndarray:
+    A = J if col_scale is None else J * col_scale
+    dy = None
+    if A.shape[0] == A.shape[1]:
+        try:
+            dy = np.linalg.solve(A, rhs)
+        except np.linalg.LinAlgError:
+            dy = None
+    if dy is None:
+        dy, *_ = np.linalg.lstsq(A, rhs, rcond=None)
+    return dy if col_scale is None else col_scale * dy
 
 
-def _pack_vars(vars_) -> np.ndarray:
-    return np.array([v.value for v in vars_], dtype=float)
-
-
-def _unpack_vars(vars_, x: np.ndarray) -> None:
-    for v, val in zip(vars_, x):
-        v.value = float(val)
-        v.clip()
-
-
-def _scaled_residual_vector(eqs: List[Equation]) -> np.ndarray:
-    return np.array([eq.residual / (eq.scale if eq.scale != 0 else 1.0) for eq in eqs], dtype=float)
-
-
-def _fd_jacobian(network, free_vars, f0: np.ndarray, fd_eps: float) -> np.ndarray:
-    n = len(free_vars)
-    m = len(f0)
-    J = np.zeros((m, n), dtype=float)
-
-    x0 = _pack_vars(free_vars)
-
-    for j in range(n):
-        x = x0.copy()
-        step = fd_eps * max(1.0, abs(x[j]))
-        x[j] += step
-        _unpack_vars(free_vars, x)
-
-        eqs = network.residuals()
-        f1 = _scaled_residual_vector(eqs)
-        J[:, j] = (f1 - f0) / step
-
-    _unpack_vars(free_vars, x0)
-    return J
+def _broyden_update(J: np.ndarray, s: np.ndarray, y: np.ndarray) -> None:
+    """In-place "good" Broyden rank-1 update: J += (y - J s) s^T / (s^T s)."""
+    ss = float(s @ s)
+    if ss > 0.0:
+        J += np.outer(y - J @ s, s / ss)
 
 
-def _worst_residuals(eqs: List[Equation], k: int) -> list[tuple[str, float]]:
-    vals = [(eq.name, abs(eq.residual / (eq.scale if eq.scale != 0 else 1.0))) for eq in eqs]
-    vals.sort(key=lambda t: t[1], reverse=True)
-    return vals[:k]
+def _worst_residuals(names: List[str], f: np.ndarray, k: int) -> list[tuple[str, float]]:
+    idx = np.argsort(-np.abs(f), kind="stable")[:k]
+    return [(names[i], float(abs(f[i]))) for i in idx]
 
 
-def newton_solve(network, options: SolveOptions) -> SolveResult:
+@_logged
+def newton_solve(network, options: SolveOptions, emit: Callable[[str], None]) -> SolveResult:
+    network.prepare()
     free_vars = network.free_variables()
+    lo, hi = network._lo[network._free_idx], network._hi[network._free_idx]
+    col_scale = np.maximum(1.0, np.abs(_pack_free(network))) if options.column_scaling else None
+    linsolve = LinearSolver(network._jac, options.linear_solver, col_scale, options.preconditioner)
     if options.verbose:
-        print(f"[systems-th] Unknowns: {len(free_vars)} (free variables)")
+        emit(f"[systems-th] Unknowns: {len(free_vars)} (free variables), linear solver: {linsolve.name}")
 
     if len(free_vars) == 0:
-        eqs = network.residuals()
-        f = _scaled_residual_vector(eqs)
+        f = _residual_vector(network)
         nrm = float(np.linalg.norm(f, ord=2))
         return SolveResult(converged=nrm < options.tol, iterations=0, residual_norm=nrm, message="No free variables")
 
+    work = network._work
+    f0, rhs, x0, x_trial = work.f0, work.rhs, work.x0, work.x_trial
+    # Modified Newton state (jacobian_refresh > 1): dense J between refreshes
+    broyden = options.jacobian_refresh > 1
+    J_b: Optional[np.ndarray] = None
+    since_refresh = 0
+    # work.x_prev / work.f_prev hold the previous iterate (norm nrm_prev) once have_prev is set
+    have_prev = False
+    nrm_prev = np.inf
 
     for it in range(1, options.max_iter + 1):
-        eqs0 = network.residuals()
-        f0 = _scaled_residual_vector(eqs0)
+        network.clear_property_cache()
+        _residual_vector(network, out=f0)
         nrm0 = float(np.linalg.norm(f0, ord=2))
 
         if options.verbose:
-            msg = f"[systems-th] iter {it:02d}: |F|={nrm0:.3e} eqs={len(eqs0)}"
-            print(msg)
+            emit(f"[systems-th] iter {it:02d}: |F|={nrm0:.3e} eqs={len(f0)}")
             if it == 1 or it % 10 == 0:
-                for name, val in _worst_residuals(eqs0, options.print_worst):
-                    print(f"    worst: {name} -> {val:.3e}")
+                for name, val in _worst_residuals(network.equation_names(), f0, options.print_worst):
+                    emit(f"    worst: {name} -> {val:.3e}")
 
         if nrm0 < options.tol:
             return SolveResult(True, it - 1, nrm0, "Converged (residual norm)")
 
-        J = _fd_jacobian(network, free_vars, f0, options.fd_eps)
-
-        rhs = -f0
+        refresh = (not broyden or not have_prev or since_refresh >= options.jacobian_refresh
+                   or nrm0 > options.refresh_ratio * nrm_prev)
+        np.negative(f0, out=rhs)
         try:
-            dx, *_ = np.linalg.lstsq(J, rhs, rcond=None)
+            if refresh or J_b is None:
+                pat = _assemble_jacobian(network, f0, options.fd_eps)
+                dx = linsolve.solve(rhs)
+                if broyden:
+                    J_b = pat.to_dense()
+                    since_refresh = 1
+            else:
+                _broyden_update(J_b, _pack_free(network) - work.x_prev, f0 - work.f_prev)
+                dx = _dense_step(J_b, rhs, col_scale)
+                since_refresh += 1
         except Exception as e:
             return SolveResult(False, it, nrm0, f"Linear solve failed: {e}")
 
@@ -107,27 +240,95 @@ def newton_solve(network, options: SolveOptions) -> SolveResult:
         if step_norm < options.xtol:
             return SolveResult(True, it, nrm0, "Converged (step norm)")
 
-        x0 = _pack_vars(free_vars)
+        _pack_free(network, out=x0)
 
         alpha = 1.0
         if options.damping:
             improved = False
             for _ in range(14):
-                x_trial = x0 + alpha * dx
-                _unpack_vars(free_vars, x_trial)
-                f_trial = _scaled_residual_vector(network.residuals())
-                nrm_trial = float(np.linalg.norm(f_trial, ord=2))
+                np.multiply(dx, alpha, out=x_trial)
+                np.add(x0, x_trial, out=x_trial)
+                _unpack_free(network, x_trial, lo, hi, out=x_trial)
+                f_trial = network.evaluate_residuals()
+                nrm_trial = np.linalg.norm(f_trial)
                 if nrm_trial <= nrm0:
                     improved = True
                     break
                 alpha *= 0.5
             if not improved:
-                _unpack_vars(free_vars, x0)
+                _unpack_free(network, x0, lo, hi, out=x_trial)
+                if not refresh:
+                    # Stale secant Jacobian: retry from here with a fresh one
+                    have_prev = False
+                    continue
                 return SolveResult(False, it, nrm0, "Damping failed to improve residual")
         else:
-            x_trial = x0 + dx
-            _unpack_vars(free_vars, x_trial)
+            np.add(x0, dx, out=x_trial)
+            _unpack_free(network, x_trial, lo, hi, out=x_trial)
 
-    eqs = network.residuals()
-    f = _scaled_residual_vector(eqs)
+        np.copyto(work.x_prev, x0)
+        np.copyto(work.f_prev, f0)
+        nrm_prev = nrm0
+        have_prev = True
+
+    f = network.evaluate_residuals()
     return SolveResult(False, options.max_iter, float(np.linalg.norm(f, ord=2)), "Max iterations reached")
+
+
+@_logged
+def root_solve(network, options: SolveOptions, emit: Callable[[str], None]) -> SolveResult:
+    """Solve with ``scipy.optimize.root`` (MINPACK ``hybr`` or ``lm``).
+
+    The network Jacobian is passed as ``jac``; ``hybr`` evaluates it only at the start
+    and on restarts and otherwise applies Broyden rank-1 updates. ``hybr`` needs a square
+    system; if it fails (or the system is not square) ``lm`` is tried.
+    """
+    try:
+        from scipy.optimize import root
+    except ImportError as e:  # pragma: no cover - depends on environment
+        raise ImportError(f"SciPy is required for method='{options.method}'") from e
+
+    if options.method not in ("hybr", "lm"):
+        raise ValueError(f"Unknown solve method '{options.method}'")
+
+    network.prepare()
+    free_vars = network.free_variables()
+    lo, hi = network._lo[network._free_idx], network._hi[network._free_idx]
+    n = len(free_vars)
+    if options.verbose:
+        emit(f"[systems-th] Unknowns: {n} (free variables), method: {options.method}")
+
+    if n == 0:
+        f = _residual_vector(network)
+        nrm = float(np.linalg.norm(f, ord=2))
+        return SolveResult(converged=nrm < options.tol, iterations=0, residual_norm=nrm, message="No free variables")
+
+    def F(x: np.ndarray) -> np.ndarray:
+        _unpack_free(network, x, lo, hi)
+        network.clear_property_cache()
+        return _residual_vector(network)
+
+    def jac(x: np.ndarray) -> np.ndarray:
+        f0 = F(x)
+        return _assemble_jacobian(network, f0, options.fd_eps).to_dense()
+
+    x0 = _pack_free(network)
+    m = len(network._residual)
+    methods = [options.method] if options.method == "lm" else ["hybr", "lm"]
+    if m != n:
+        methods = ["lm"]
+
+    nfev = 0
+    for method in methods:
+        # MINPACK names the evaluation budget differently per method
+        budget = {"hybr": "maxfev", "lm": "maxiter"}[method]
+        sol = root(F, x0, jac=jac, method=method, tol=options.tol, options={budget: options.max_iter * (n + 1)})
+        nfev += int(getattr(sol, "nfev", 0))
+        f = F(sol.x)
+        nrm = float(np.linalg.norm(f, ord=2))
+        if options.verbose:
+            emit(f"[systems-th] {method}: |F|={nrm:.3e} nfev={sol.nfev} ({sol.message})")
+        if nrm < options.tol:
+            return SolveResult(True, nfev, nrm, f"Converged ({method})")
+
+    return SolveResult(False, nfev, nrm, f"{methods[-1]}: {sol.message}")
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
+import numpy as np
+
 
 @dataclass
 class Variable:
@@ -18,6 +20,10 @@ class Variable:
         If True, variable is excluded from the solver unknown vector.
     lower, upper:
         Optional bounds. The solver clips trial points into bounds.
+
+    Once bound (``Network.prepare``), the value lives in the network's state array at
+    index ``idx`` and ``value`` reads/writes through it, so the solver can pack, unpack
+    and clip all unknowns with array operations.
     """
 
     name: str
@@ -26,6 +32,17 @@ class Variable:
     lower: Optional[float] = None
     upper: Optional[float] = None
 
+    idx: int = field(default=-1, init=False, repr=False, compare=False)
+    _store: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    # Value while unbound (set through the ``value`` property)
+    _value: float = field(init=False, repr=False, compare=False)
+
+    def bind(self, store: np.ndarray, idx: int) -> None:
+        """Move the value into ``store[idx]``."""
+        store[idx] = self.value
+        self._store = store
+        self.idx = idx
+
     def fix(self, value: Optional[float] = None) -> None:
         if value is not None:
             self.value = float(value)
@@ -39,3 +56,20 @@ class Variable:
             self.value = self.lower
         if self.upper is not None and self.value > self.upper:
             self.value = self.upper
+
+
+def _get_value(self: Variable) -> float:
+    store = self._store
+    return self._value if store is None else float(store[self.idx])
+
+
+def _set_value(self: Variable, value: float) -> None:
+    store = self._store
+    if store is None:
+        self._value = value
+    else:
+        store[self.idx] = value
+
+
+# Installed after the dataclass is built so ``value`` stays a regular __init__ argument
+Variable.value = property(_get_value, _set_value)  # type: ignore[assignment]
@@ -13,6 +13,7 @@ from __future__ import annotations
 import re
 import sys
 from pathlib import Path
+from typing import Any, Callable
 
 import pandas as pd
 import streamlit as st
@@ -23,16 +24,11 @@ sys.path.insert(0, str(_ROOT))                        # for network_builder / pl
 sys.path.insert(0, str(_ROOT.parent / "src"))         # for systems_th
 
 from network_builder import (
-    default_params, build_and_solve,
-    extract_states_df, compute_performance,
-)
-from plotting import (
     TOPOLOGY_DOT,
-    plot_ph_diagram, plot_ts_diagram,
-    plot_loop_profile, plot_void_quality,
-    plot_mass_flows, plot_energy_flows,
-    plot_energy_pie, plot_convergence,
+    default_params, build_and_solve, shared_props, connection_state,
+    extract_states_df, compute_performance,
 )
+# plotting (Plotly) is imported on the first figure build, see _figure
 
 # ── page setup ────────────────────────────────────────────────────────────────
 st.set_page_config(
@@ -42,6 +38,137 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+# ── cached solves ─────────────────────────────────────────────────────────────
+# Verbose solver iteration lines: "[systems-th] iter   3: |F|=1.234e-05 ..."
+_ITER_RX = re.compile(r"^\[systems-th\] iter\s+(\d+):\s+\|F\|=([\d.eE+\-]+)", re.MULTILINE)
+
+
+@st.cache_resource(show_spinner="Preparing water property tables …")
+def _water_props():
+    """One property backend (saturation table + state caches) for all sessions."""
+    return shared_props()
+
+
+class _SolveNotConverged(Exception):
+    """Raised by :func:`_cached_solve` for a failed solve so it is not cached
+    (Streamlit never caches exceptions); ``outputs`` is the usual result tuple."""
+
+    def __init__(self, outputs: tuple):
+        super().__init__(outputs[0].message)
+        self.outputs = outputs
+
+
+# Keyed on the sorted parameter items + solver settings, so re-running an unchanged
+# operating point (or rerunning the script for an unrelated widget) skips the solve.
+# Persisted to disk, so new server processes and other sessions reuse earlier solves;
+# run `streamlit cache clear` after changing the network model.
+# The warm start (underscore: not part of the key) only changes the Newton path, so
+# only converged solves are cached: a failure (e.g. from a bad warm start) is retried.
+@st.cache_data(persist="disk", max_entries=64, show_spinner="Solving network …")
+def _cached_solve(params_key: tuple, max_iter: int, tol: float, _initial_state=None):
+    """Everything the tabs show for one solve, all picklable:
+    (solve_result, states_df, states_csv, perf, log, iters, resids, state).
+
+    The live network is dropped after post-processing. The CSV download keeps full
+    precision; the states table used for display and plots is float32 (half the bytes
+    to hash, cache and serialize to the browser). ``state`` is the connection state
+    of a converged solve (None otherwise), to warm-start the next one.
+
+    A solve that does not converge raises :class:`_SolveNotConverged` carrying the
+    same tuple, so it is shown but never cached.
+    """
+    nw, result, refs, log = build_and_solve(
+        dict(params_key), max_iter=max_iter, tol=tol, props=_water_props(),
+        initial_state=_initial_state,
+    )
+    states    = extract_states_df(refs, nw.props)
+    csv       = states.to_csv(index=False).encode()
+    states_df = states.astype({c: "float32" for c in states.select_dtypes("float64").columns})
+    perf      = compute_performance(refs, dict(params_key))
+
+    # parse convergence history from captured stdout (one scan of the whole log)
+    matches = _ITER_RX.findall(log)
+    iters   = [int(i) for i, _ in matches]
+    resids  = [float(r) for _, r in matches]
+    state   = connection_state(nw) if result.converged else None
+    outputs = (result, states_df, csv, perf, log, iters, resids, state)
+    if not result.converged:
+        raise _SolveNotConverged(outputs)
+    return outputs
+
+
+# ── cached figures ────────────────────────────────────────────────────────────
+# Figure builders are pure in their (DataFrame / dict / list) inputs, which
+# st.cache_data hashes by value: reruns that only toggle a checkbox reuse the figure.
+@st.cache_data(max_entries=32, show_spinner=False)
+def _figure(builder: str, *args):
+    """``plotting.<builder>(*args)``; sessions that never plot never import Plotly."""
+    import plotting
+    return getattr(plotting, builder)(*args)
+
+
+# ── cached dashboard tables ───────────────────────────────────────────────────
+@st.cache_data(max_entries=8, show_spinner=False)
+def _dashboard_tables(perf: dict[str, float]) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Energy-balance and mass-flow tables of the Dashboard tab."""
+    MW = 1e-6
+    W_gen_loss = perf["W_net_mech"] - perf["W_electric"]
+    edf = pd.DataFrame({
+        "Quantity": [
+            "Core thermal power *", "Turbine gross output",
+            "Pump parasitic", "Net shaft power",
+            "Net electric output", "Heat rejected (condenser)",
+            "Generator losses",
+        ],
+        "Value [MW]": [
+            (perf["W_turb_gross"] + perf["Q_rejected"]) * MW,
+            perf["W_turb_gross"] * MW,
+            perf["W_pump_shaft"] * MW,
+            perf["W_net_mech"] * MW,
+            perf["W_electric"] * MW,
+            perf["Q_rejected"] * MW,
+            W_gen_loss * MW,
+        ],
+    })
+    mdf = pd.DataFrame({
+        "Stream": [
+            "Core inlet (total)", "Vapor to chimney (orifice)",
+            "Liquid return → Venturi", "Steam to turbine",
+            "SteamSep liquid return",
+            "Upper downcomer (net cycle flow)",
+        ],
+        "Flow [kg/s]": [
+            perf["m_core"],        perf["m_vap_orifice"],
+            perf["m_liq_return"],  perf["m_steam_turbine"],
+            perf["m_ssep_liq"],    perf["m_dc_upper"],
+        ],
+    })
+    return edf, mdf
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _states_html(states: pd.DataFrame) -> str:
+    """Styled connection-state table as HTML.
+
+    The gradients sample a matplotlib colormap per cell and a Styler recomputes them
+    every time it is rendered, so the rendered table is what gets cached.
+    """
+    show_cols = ["Station", "Branch", "m_kgs", "p_MPa", "T_C", "x", "alpha", "h_kJkg"]
+    fmt = {
+        "m_kgs":   "{:.2f}", "p_MPa":  "{:.4f}",
+        "T_C":     "{:.2f}", "x":      "{:.4f}",
+        "alpha":   "{:.4f}", "h_kJkg": "{:.1f}",
+    }
+    styled = (
+        states[show_cols]
+        .style
+        .format(fmt)
+        .background_gradient(subset=["T_C"], cmap="RdYlBu_r")
+        .background_gradient(subset=["alpha"], cmap="Blues")
+    )
+    return f'<div style="max-height:430px; overflow:auto">{styled.to_html()}</div>'
+
+
 # ── session-state initialisation ──────────────────────────────────────────────
 if "params"  not in st.session_state:
     st.session_state.params  = default_params()
@@ -53,76 +180,139 @@ if "iters"   not in st.session_state:
     st.session_state.iters   = []
 if "resids"  not in st.session_state:
     st.session_state.resids  = []
+if "last_state" not in st.session_state:
+    st.session_state.last_state = None   # last converged connection state (warm start)
+
+p = st.session_state.params   # applied parameters (updated on Run Simulation)
+
+# ── widget → parameter mapping ────────────────────────────────────────────────
+# Widgets only hold a draft in st.session_state[key]; it is converted to SI and
+# copied into the parameters when Run Simulation is pressed.
+_WIDGET_PARAMS: dict[str, tuple[str, Callable[[Any], Any]]] = {
+    # sidebar
+    "p_reactor_MPa": ("p_reactor",      lambda v: v * 1e6),
+    "p_cond_kPa":    ("p_cond",         lambda v: v * 1e3),
+    "Q_core_MW":     ("Q_core",         lambda v: v * 1e6),
+    "m_core_kgs":    ("m_core",         float),
+    # core channel
+    "cL":    ("core_L",         float),
+    "cdz":   ("core_dz",        float),
+    "cD":    ("core_D",         float),
+    "cA":    ("core_A",         float),
+    "cK":    ("core_K",         float),
+    "cKb":   ("core_K_bundle",  float),
+    "cKg":   ("core_K_grid",    float),
+    "cNg":   ("core_n_grids",   int),
+    "c2ph":  ("core_two_phase", str),
+    # orifice plate
+    "nh":    ("n_holes",        int),
+    "Dh":    ("D_hole",         lambda v: v * 1e-3),
+    "Cd":    ("Cd_plate",       float),
+    "pc_ft": ("post_core_ft",   float),
+    # separators
+    "oxv":   ("orif_x_vap",     float),
+    "oxl":   ("orif_x_liq",     float),
+    "sdp":   ("ssep_dp",        lambda v: v * 1e3),
+    "sxv":   ("ssep_x_vap",     float),
+    "sxl":   ("ssep_x_liq",     float),
+    # downcomer / chimney
+    "dcD":   ("dc_D",           float),
+    "dcLu":  ("dc_L_upper",     float),
+    "dcKu":  ("dc_K_upper",     float),
+    "dcLl":  ("dc_L_lower",     float),
+    "dcKl":  ("dc_K_lower",     float),
+    "chL":   ("chim_L",         float),
+    "chD":   ("chim_D",         float),
+    "chK":   ("chim_K",         float),
+    # steam cycle
+    "teta":  ("turb_eta",       float),
+    "peta":  ("pump_eta",       float),
+    "fwT":   ("heater_T_K",     lambda v: v + 273.15),
+    "geta":  ("eta_gen",        float),
+}
+
+
+def _params_from_widgets(base: dict[str, Any]) -> dict[str, Any]:
+    """Copy of ``base`` with the current draft of every rendered widget (SI units)."""
+    params = dict(base)
+    for key, (name, to_si) in _WIDGET_PARAMS.items():
+        if key in st.session_state:
+            params[name] = to_si(st.session_state[key])
+    return params
 
-p = st.session_state.params   # mutable shorthand
 
 # ══════════════════════════════════════════════════════════════════════════════
 #  SIDEBAR – operating point + solver controls
 # ══════════════════════════════════════════════════════════════════════════════
-with st.sidebar:
-    st.markdown("## ⚛️ systems-TH")
-    st.caption("Steady-state BWR-like loop · IAPWS-97")
-    st.divider()
-
+@st.fragment
+def _render_inputs() -> None:
+    """Operating-point and solver widgets.
+
+    A fragment, so editing one of these drafts reruns only this block instead of the
+    whole page (with the ~30 Configuration widgets); Run Simulation, outside of it,
+    triggers the full pass that applies them.
+    """
+    p = st.session_state.params
     st.subheader("🎛️ Operating Point")
-    p["p_reactor"] = st.number_input(
+    st.number_input(
         "Reactor pressure (MPa)", 1.0, 22.0,
-        value=round(p["p_reactor"] / 1e6, 3), step=0.1, format="%.2f",
-    ) * 1e6
-    p["p_cond"] = st.number_input(
+        value=round(p["p_reactor"] / 1e6, 3), step=0.1, format="%.2f", key="p_reactor_MPa",
+    )
+    st.number_input(
         "Condenser pressure (kPa)", 10.0, 500.0,
-        value=round(p["p_cond"] / 1e3, 2), step=5.0, format="%.1f",
-    ) * 1e3
-    p["Q_core"] = st.number_input(
+        value=round(p["p_cond"] / 1e3, 2), step=5.0, format="%.1f", key="p_cond_kPa",
+    )
+    st.number_input(
         "Core thermal power (MW)", 10.0, 5000.0,
-        value=round(p["Q_core"] / 1e6, 1), step=10.0, format="%.1f",
-    ) * 1e6
-    p["m_core"] = st.number_input(
+        value=round(p["Q_core"] / 1e6, 1), step=10.0, format="%.1f", key="Q_core_MW",
+    )
+    st.number_input(
         "Core inlet flow (kg/s)", 50.0, 10000.0,
-        value=float(p["m_core"]), step=50.0, format="%.0f",
+        value=p["m_core"], step=50.0, format="%.0f", key="m_core_kgs",
     )
 
     st.divider()
     st.subheader("⚙️ Solver")
-    max_iter = st.slider("Max iterations", 10, 150, 50)
-    tol = st.select_slider(
+    st.slider("Max iterations", 10, 150, 50, key="max_iter")
+    st.select_slider(
         "Convergence tolerance",
         options=[1e-4, 1e-5, 1e-6, 1e-7, 1e-8],
         value=1e-7,
         format_func=lambda x: f"{x:.0e}",
+        key="tol",
     )
 
+
+with st.sidebar:
+    st.markdown("## ⚛️ systems-TH")
+    st.caption("Steady-state BWR-like loop · IAPWS-97")
+    st.divider()
+    _render_inputs()
+
     st.divider()
     run_clicked = st.button("🚀 Run Simulation", type="primary", use_container_width=True)
+    status = st.empty()   # solve status, filled in after a run in this same pass
 
-    if st.session_state.results is not None:
-        res = st.session_state.results["solve_result"]
-        if res.converged:
-            st.success(f"✅ Converged  ({res.iterations} iters, |F|={res.residual_norm:.2e})")
-        else:
-            st.warning(f"⚠️ {res.message}")
+max_iter = st.session_state.max_iter
+tol      = st.session_state.tol
 
 # ── run simulation ────────────────────────────────────────────────────────────
 if run_clicked:
     with st.spinner("Solving network …"):
         try:
-            nw, result, refs, log = build_and_solve(p, max_iter=max_iter, tol=tol)
-            props     = nw.props
-            states_df = extract_states_df(refs, props)
-            perf      = compute_performance(refs, p)
-
-            # parse convergence history from captured stdout
-            iters, resids = [], []
-            for line in log.splitlines():
-                m = re.match(r"\[systems-th\] iter\s+(\d+):\s+\|F\|=([\d.eE+\-]+)", line)
-                if m:
-                    iters.append(int(m.group(1)))
-                    resids.append(float(m.group(2)))
+            p = st.session_state.params = _params_from_widgets(p)
+            params_key = tuple(sorted(p.items()))
+            try:
+                outputs = _cached_solve(params_key, max_iter, tol, st.session_state.last_state)
+            except _SolveNotConverged as exc:
+                outputs = exc.outputs   # shown below, not cached: the next Run re-solves
+            result, states_df, states_csv, perf, log, iters, resids, state = outputs
+            if state is not None:
+                st.session_state.last_state = state
 
             st.session_state.results = dict(
                 solve_result=result,
-                refs=refs, nw=nw, props=props,
-                states_df=states_df, perf=perf,
+                states_df=states_df, states_csv=states_csv, perf=perf,
             )
             st.session_state.log    = log
             st.session_state.iters  = iters
@@ -130,7 +320,13 @@ if run_clicked:
         except Exception as exc:
             st.error(f"Simulation failed: {exc}")
             st.session_state.results = None
-    st.rerun()
+
+if st.session_state.results is not None:
+    res = st.session_state.results["solve_result"]
+    if res.converged:
+        status.success(f"✅ Converged  ({res.iterations} iters, |F|={res.residual_norm:.2e})")
+    else:
+        status.warning(f"⚠️ {res.message}")
 
 # ══════════════════════════════════════════════════════════════════════════════
 #  MAIN TABS
@@ -145,7 +341,10 @@ tab_cfg, tab_dash, tab_plots, tab_log = st.tabs([
 # ─────────────────────────────────────────────────────────────────────────────
 #  TAB 1 – Configuration
 # ─────────────────────────────────────────────────────────────────────────────
-with tab_cfg:
+@st.fragment
+def _render_config() -> None:
+    """Configuration tab: geometry/loss widgets (drafts applied on Run)."""
+    p = st.session_state.params
     st.header("Network Configuration")
 
     with st.expander("🗺️ Loop Topology", expanded=True):
@@ -157,82 +356,88 @@ with tab_cfg:
         # ── Core channel ──────────────────────────────────────────────────────
         with st.expander("🌡️ Core Channel", expanded=True):
             c1, c2 = st.columns(2)
-            p["core_L"]  = c1.number_input("Length L (m)",        value=float(p["core_L"]),  step=0.5,  key="cL")
-            p["core_dz"] = c2.number_input("Height dz (m)",       value=float(p["core_dz"]), step=0.5,  key="cdz")
-            p["core_D"]  = c1.number_input("Hydr. diameter (m)",  value=float(p["core_D"]),  step=0.005, format="%.4f", key="cD")
-            p["core_A"]  = c2.number_input("Flow area (m²)",      value=float(p["core_A"]),  step=0.01,  key="cA")
-            p["core_K"]  = c1.number_input("K form loss",         value=float(p["core_K"]),  step=0.5,  key="cK")
-            p["core_K_bundle"] = c2.number_input("K bundle",      value=float(p["core_K_bundle"]), step=1.0, key="cKb")
-            p["core_K_grid"]   = c1.number_input("K spacer grid", value=float(p["core_K_grid"]),   step=0.5, key="cKg")
-            p["core_n_grids"]  = int(c2.number_input("# grids",   value=int(p["core_n_grids"]),    step=1,   key="cNg"))
-            p["core_two_phase"] = st.selectbox(
+            c1.number_input("Length L (m)",        value=p["core_L"],  step=0.5,  key="cL")
+            c2.number_input("Height dz (m)",       value=p["core_dz"], step=0.5,  key="cdz")
+            c1.number_input("Hydr. diameter (m)",  value=p["core_D"],  step=0.005, format="%.4f", key="cD")
+            c2.number_input("Flow area (m²)",      value=p["core_A"],  step=0.01,  key="cA")
+            c1.number_input("K form loss",         value=p["core_K"],  step=0.5,  key="cK")
+            c2.number_input("K bundle",      value=p["core_K_bundle"], step=1.0, key="cKb")
+            c1.number_input("K spacer grid", value=p["core_K_grid"],   step=0.5, key="cKg")
+            c2.number_input("# grids",   value=p["core_n_grids"],    step=1,   key="cNg")
+            st.selectbox(
                 "Two-phase friction model",
                 ["homogeneous", "chisholm"],
                 index=0 if p["core_two_phase"] == "homogeneous" else 1,
+                key="c2ph",
             )
 
         # ── Orifice plate ─────────────────────────────────────────────────────
         with st.expander("🕳️ Orifice / Mixing Plate"):
             import math
             c1, c2 = st.columns(2)
-            p["n_holes"]      = int(c1.number_input("# holes", value=int(p["n_holes"]), step=5, key="nh"))
-            p["D_hole"]       = c2.number_input("Hole ⌀ (mm)", value=float(p["D_hole"]*1e3), step=1.0, key="Dh") * 1e-3
-            p["Cd_plate"]     = st.slider("Discharge coeff. Cd", 0.50, 0.85, float(p["Cd_plate"]), step=0.01)
-            p["post_core_ft"] = st.number_input("Core-to-plate distance (ft)", value=float(p["post_core_ft"]), step=0.5, key="pc_ft")
-            A_open = p["n_holes"] * math.pi * p["D_hole"]**2 / 4.0
+            n_holes  = c1.number_input("# holes", value=p["n_holes"], step=5, key="nh")
+            D_hole_mm = c2.number_input("Hole ⌀ (mm)", value=p["D_hole"]*1e3, step=1.0, key="Dh")
+            st.slider("Discharge coeff. Cd", 0.50, 0.85, p["Cd_plate"], step=0.01, key="Cd")
+            st.number_input("Core-to-plate distance (ft)", value=p["post_core_ft"], step=0.5, key="pc_ft")
+            A_open = n_holes * math.pi * (D_hole_mm * 1e-3)**2 / 4.0
             st.info(f"Open area: **{A_open*1e4:.2f} cm²**  |  "
-                    f"Constriction ratio A_holes/A_core: **{A_open/p['core_A']:.3f}**")
+                    f"Constriction ratio A_holes/A_core: **{A_open/st.session_state.cA:.3f}**")
 
         # ── Separators ────────────────────────────────────────────────────────
         with st.expander("🌀 Separators"):
             st.markdown("**OrificePhase** (primary phase splitter)")
             c1, c2 = st.columns(2)
-            p["orif_x_vap"] = c1.slider("Vapor outlet quality",  0.980, 1.000, float(p["orif_x_vap"]), step=0.001, key="oxv")
-            p["orif_x_liq"] = c2.slider("Liquid outlet quality", 0.000, 0.020, float(p["orif_x_liq"]), step=0.001, key="oxl")
+            c1.slider("Vapor outlet quality",  0.980, 1.000, p["orif_x_vap"], step=0.001, key="oxv")
+            c2.slider("Liquid outlet quality", 0.000, 0.020, p["orif_x_liq"], step=0.001, key="oxl")
 
             st.markdown("**SteamSep** (chimney exit / turbine feed)")
             c1, c2 = st.columns(2)
-            p["ssep_dp"]    = c1.number_input("Δp (kPa)", value=float(p["ssep_dp"]/1e3), step=10.0, key="sdp") * 1e3
-            p["ssep_x_vap"] = c2.slider("Vapor outlet quality",  0.980, 1.000, float(p["ssep_x_vap"]), step=0.001, key="sxv")
-            p["ssep_x_liq"] = c1.slider("Liquid outlet quality", 0.000, 0.020, float(p["ssep_x_liq"]), step=0.001, key="sxl")
+            c1.number_input("Δp (kPa)", value=p["ssep_dp"]/1e3, step=10.0, key="sdp")
+            c2.slider("Vapor outlet quality",  0.980, 1.000, p["ssep_x_vap"], step=0.001, key="sxv")
+            c1.slider("Liquid outlet quality", 0.000, 0.020, p["ssep_x_liq"], step=0.001, key="sxl")
 
     with col_right:
         # ── Downcomer / venturi ───────────────────────────────────────────────
         with st.expander("⬇️ Downcomer & Venturi", expanded=True):
-            p["dc_D"] = st.number_input("Diameter (m)", value=float(p["dc_D"]), step=0.05, key="dcD")
+            st.number_input("Diameter (m)", value=p["dc_D"], step=0.05, key="dcD")
             c1, c2 = st.columns(2)
-            p["dc_L_upper"] = c1.number_input("Upper length (m)",  value=float(p["dc_L_upper"]), step=0.5, key="dcLu")
-            p["dc_K_upper"] = c2.number_input("Upper K",           value=float(p["dc_K_upper"]), step=0.1, key="dcKu")
-            p["dc_L_lower"] = c1.number_input("Lower length (m)",  value=float(p["dc_L_lower"]), step=0.5, key="dcLl")
-            p["dc_K_lower"] = c2.number_input("Lower K",           value=float(p["dc_K_lower"]), step=0.1, key="dcKl")
-            st.info(f"Total downcomer: **{p['dc_L_upper']+p['dc_L_lower']:.1f} m**")
+            dc_L_upper = c1.number_input("Upper length (m)",  value=p["dc_L_upper"], step=0.5, key="dcLu")
+            c2.number_input("Upper K",           value=p["dc_K_upper"], step=0.1, key="dcKu")
+            dc_L_lower = c1.number_input("Lower length (m)",  value=p["dc_L_lower"], step=0.5, key="dcLl")
+            c2.number_input("Lower K",           value=p["dc_K_lower"], step=0.1, key="dcKl")
+            st.info(f"Total downcomer: **{dc_L_upper+dc_L_lower:.1f} m**")
 
         # ── Chimney ───────────────────────────────────────────────────────────
         with st.expander("🏭 Chimney"):
             c1, c2 = st.columns(2)
-            p["chim_L"] = c1.number_input("Length (m)",   value=float(p["chim_L"]), step=0.5, key="chL")
-            p["chim_D"] = c2.number_input("Diameter (m)", value=float(p["chim_D"]), step=0.05, key="chD")
-            p["chim_K"] = st.number_input("K form loss",  value=float(p["chim_K"]), step=0.1,  key="chK")
+            c1.number_input("Length (m)",   value=p["chim_L"], step=0.5, key="chL")
+            c2.number_input("Diameter (m)", value=p["chim_D"], step=0.05, key="chD")
+            st.number_input("K form loss",  value=p["chim_K"], step=0.1,  key="chK")
 
         # ── Steam cycle ───────────────────────────────────────────────────────
         with st.expander("⚡ Steam Cycle"):
-            p["turb_eta"]  = st.slider("Turbine isentropic η", 0.60, 1.00, float(p["turb_eta"]), step=0.01)
-            p["pump_eta"]  = st.slider("Pump efficiency η",     0.50, 1.00, float(p["pump_eta"]), step=0.01)
-            p["heater_T_K"] = st.number_input(
+            st.slider("Turbine isentropic η", 0.60, 1.00, p["turb_eta"], step=0.01, key="teta")
+            st.slider("Pump efficiency η",     0.50, 1.00, p["pump_eta"], step=0.01, key="peta")
+            st.number_input(
                 "Feedwater heater outlet T (°C)",
-                value=float(p["heater_T_K"] - 273.15), step=1.0, key="fwT",
-            ) + 273.15
-            p["eta_gen"] = st.slider("Generator efficiency η", 0.90, 1.00, float(p["eta_gen"]), step=0.005)
+                value=p["heater_T_K"] - 273.15, step=1.0, key="fwT",
+            )
+            st.slider("Generator efficiency η", 0.90, 1.00, p["eta_gen"], step=0.005, key="geta")
 
     st.caption(
-        "ℹ️ Geometry changes take effect on the next **Run Simulation**. "
-        "Operating-point sliders in the sidebar update immediately."
+        "ℹ️ Changes here and in the sidebar take effect on the next **Run Simulation**."
     )
 
+
+with tab_cfg:
+    _render_config()
+
 # ─────────────────────────────────────────────────────────────────────────────
 #  TAB 2 – Dashboard
 # ─────────────────────────────────────────────────────────────────────────────
-with tab_dash:
+@st.fragment
+def _render_dashboard() -> None:
+    """Dashboard tab: KPIs, balance tables, state table and CSV download."""
     if st.session_state.results is None:
         st.info("▶️ Press **Run Simulation** in the sidebar to compute results.")
     else:
@@ -258,46 +463,15 @@ with tab_dash:
 
         # ── Energy + flow tables ───────────────────────────────────────────────
         col_a, col_b = st.columns(2, gap="large")
+        edf, mdf = _dashboard_tables(perf)
 
         with col_a:
             st.subheader("⚡ Energy Balance")
-            MW = 1e-6
-            W_gen_loss = perf["W_net_mech"] - perf["W_electric"]
-            edf = pd.DataFrame({
-                "Quantity": [
-                    "Core thermal power *", "Turbine gross output",
-                    "Pump parasitic", "Net shaft power",
-                    "Net electric output", "Heat rejected (condenser)",
-                    "Generator losses",
-                ],
-                "Value [MW]": [
-                    (perf["W_turb_gross"] + perf["Q_rejected"]) * MW,
-                    perf["W_turb_gross"] * MW,
-                    perf["W_pump_shaft"] * MW,
-                    perf["W_net_mech"] * MW,
-                    perf["W_electric"] * MW,
-                    perf["Q_rejected"] * MW,
-                    W_gen_loss * MW,
-                ],
-            })
             st.dataframe(edf.style.format({"Value [MW]": "{:.3f}"}), use_container_width=True, hide_index=True)
             st.caption("* Approximated as W_turbine + Q_condenser")
 
         with col_b:
             st.subheader("🌊 Mass Flow Distribution")
-            mdf = pd.DataFrame({
-                "Stream": [
-                    "Core inlet (total)", "Vapor to chimney (orifice)",
-                    "Liquid return → Venturi", "Steam to turbine",
-                    "SteamSep liquid return",
-                    "Upper downcomer (net cycle flow)",
-                ],
-                "Flow [kg/s]": [
-                    perf["m_core"],        perf["m_vap_orifice"],
-                    perf["m_liq_return"],  perf["m_steam_turbine"],
-                    perf["m_ssep_liq"],    perf["m_dc_upper"],
-                ],
-            })
             st.dataframe(mdf.style.format({"Flow [kg/s]": "{:.2f}"}), use_container_width=True, hide_index=True)
 
         st.divider()
@@ -305,36 +479,28 @@ with tab_dash:
         # ── Energy pie ────────────────────────────────────────────────────────
         col_pie, col_tbl = st.columns([1, 2], gap="large")
         with col_pie:
-            st.plotly_chart(plot_energy_pie(perf), use_container_width=True)
+            st.plotly_chart(_figure("plot_energy_pie", perf), use_container_width=True)
 
         with col_tbl:
             st.subheader("Connection State Table")
-            show_cols = ["Station", "Branch", "m_kgs", "p_MPa", "T_C", "x", "alpha", "h_kJkg"]
-            fmt = {
-                "m_kgs":   "{:.2f}", "p_MPa":  "{:.4f}",
-                "T_C":     "{:.2f}", "x":      "{:.4f}",
-                "alpha":   "{:.4f}", "h_kJkg": "{:.1f}",
-            }
-            styled = (
-                states[show_cols]
-                .style
-                .format(fmt)
-                .background_gradient(subset=["T_C"], cmap="RdYlBu_r")
-                .background_gradient(subset=["alpha"], cmap="Blues")
-            )
-            st.dataframe(styled, use_container_width=True, height=430)
+            st.markdown(_states_html(states), unsafe_allow_html=True)
 
         st.divider()
-        csv = states.to_csv(index=False).encode()
         st.download_button(
             "⬇️ Download full state table (CSV)",
-            data=csv, file_name="systems_th_states.csv", mime="text/csv",
+            data=r["states_csv"], file_name="systems_th_states.csv", mime="text/csv",
         )
 
+
+with tab_dash:
+    _render_dashboard()
+
 # ─────────────────────────────────────────────────────────────────────────────
 #  TAB 3 – Plots
 # ─────────────────────────────────────────────────────────────────────────────
-with tab_plots:
+@st.fragment
+def _render_plots() -> None:
+    """Plots tab: plot selection checkboxes and the selected figures."""
     if st.session_state.results is None:
         st.info("▶️ Press **Run Simulation** in the sidebar to generate plots.")
     else:
@@ -350,6 +516,15 @@ with tab_plots:
             "🌊 Mass Flow Distribution":            "mass",
             "⚡ Energy Flow Balance":               "energy",
         }
+        # key -> (plotting builder, its input)
+        PLOT_BUILDERS = {
+            "loop":   ("plot_loop_profile", states),
+            "qvoid":  ("plot_void_quality", states),
+            "ph":     ("plot_ph_diagram",   states),
+            "ts":     ("plot_ts_diagram",   states),
+            "mass":   ("plot_mass_flows",   perf),
+            "energy": ("plot_energy_flows", perf),
+        }
 
         # Allow multiple simultaneous plots with checkboxes
         st.subheader("Select plots to display")
@@ -360,31 +535,25 @@ with tab_plots:
 
         st.divider()
 
-        if checks["loop"]:
-            st.plotly_chart(plot_loop_profile(states), use_container_width=True)
-
-        if checks["qvoid"]:
-            st.plotly_chart(plot_void_quality(states), use_container_width=True)
+        # Build every selected figure first, then emit them together in one container
+        figs = [_figure(*PLOT_BUILDERS[key]) for key, on in checks.items() if on]
+        with st.container():
+            for fig in figs:
+                st.plotly_chart(fig, use_container_width=True)
 
-        if checks["ph"]:
-            st.plotly_chart(plot_ph_diagram(states), use_container_width=True)
-
-        if checks["ts"]:
-            st.plotly_chart(plot_ts_diagram(states), use_container_width=True)
-
-        if checks["mass"]:
-            st.plotly_chart(plot_mass_flows(perf), use_container_width=True)
+        if not figs:
+            st.info("Check at least one plot above.")
 
-        if checks["energy"]:
-            st.plotly_chart(plot_energy_flows(perf), use_container_width=True)
 
-        if not any(checks.values()):
-            st.info("Check at least one plot above.")
+with tab_plots:
+    _render_plots()
 
 # ─────────────────────────────────────────────────────────────────────────────
 #  TAB 4 – Solver Log
 # ─────────────────────────────────────────────────────────────────────────────
-with tab_log:
+@st.fragment
+def _render_log() -> None:
+    """Solver Log tab: convergence plot and raw solver output."""
     if not st.session_state.log:
         st.info("No solver log yet. Run a simulation first.")
     else:
@@ -392,10 +561,14 @@ with tab_log:
         resids = st.session_state.resids
 
         if iters:
-            st.plotly_chart(plot_convergence(iters, resids), use_container_width=True)
+            st.plotly_chart(_figure("plot_convergence", iters, resids), use_container_width=True)
         else:
             st.warning("Could not parse convergence history from log.")
 
         st.divider()
         with st.expander("📄 Raw solver output", expanded=False):
             st.text(st.session_state.log)
+
+
+with tab_log:
+    _render_log()
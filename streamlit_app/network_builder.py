@@ -7,8 +7,6 @@ dictionary and exposes helpers for extracting post-solve state data.
 
 from __future__ import annotations
 
-import contextlib
-import io
 import math
 import sys
 from pathlib import Path
@@ -28,7 +26,7 @@ from systems_th.components import (
     Turbine, Condenser, Pump, Heater, Mixer,
 )
 from systems_th.solver import SolveOptions, SolveResult
-from systems_th.props import WaterIAPWS
+from systems_th.props import WaterIAPWS, WaterProps, is_valid_ph
 
 # ── station sequence (label, connection key, branch) ──────────────────────────
 STATION_SEQUENCE: list[tuple[str, str, str]] = [
@@ -50,8 +48,46 @@ STATION_SEQUENCE: list[tuple[str, str, str]] = [
 ]
 
 
+# ── Network topology (graphviz dot string) ────────────────────────────────────
+TOPOLOGY_DOT = """\
+digraph {
+    rankdir=LR;
+    node [shape=box, style="filled,rounded", fontsize=10, fontname=Helvetica];
+    edge [fontsize=9];
+
+    SteamMixer   [label="Steam\\nMixer",      fillcolor="#aec7e8"]
+    DC_up        [label="Downcomer\\nupper",  fillcolor="#aec7e8"]
+    Venturi      [label="Venturi\\n(jet pump)",fillcolor="#98df8a", shape=ellipse]
+    DC_low       [label="Downcomer\\nlower",  fillcolor="#aec7e8"]
+    Core         [label="Core\\nChannel",     fillcolor="#ff9896", shape=box3d]
+    PostCore     [label="Post-core\\n(3 ft)", fillcolor="#c7c7c7"]
+    Orifice      [label="Orifice\\nPlate",    fillcolor="#c5b0d5", shape=diamond]
+    OrifPhase    [label="Orifice\\nSeparator",fillcolor="#c5b0d5"]
+    Chimney      [label="Chimney",            fillcolor="#aec7e8"]
+    SteamSep     [label="Steam\\nSeparator",  fillcolor="#c5b0d5"]
+    Turbine      [label="Turbine",            fillcolor="#ffbb78", shape=trapezium]
+    Condenser    [label="Condenser",          fillcolor="#dbdb8d"]
+    Pump         [label="Pump",               fillcolor="#9edae5", shape=invtrapezium]
+    Heater       [label="Feedwater\\nHeater", fillcolor="#f7b6d2"]
+
+    SteamMixer -> DC_up -> Venturi -> DC_low -> Core
+    Core -> PostCore -> Orifice -> OrifPhase
+    OrifPhase -> Chimney        [label="vapor ↑"                      color="#d62728"]
+    OrifPhase -> Venturi        [label="liquid return" style=dashed   color="#2ca02c"]
+    Chimney   -> SteamSep
+    SteamSep  -> Turbine        [label="steam"                        color="#d62728"]
+    SteamSep  -> SteamMixer     [label="sep. liquid"  style=dashed    color="#2ca02c"]
+    Turbine   -> Condenser -> Pump -> Heater -> SteamMixer
+}
+"""
+
+
 def default_params() -> dict[str, Any]:
-    """Return default operating/geometry parameter dictionary."""
+    """Return default operating/geometry parameter dictionary.
+
+    Values are plain ``float`` (``int`` for counts, ``str`` for model names), the types
+    the GUI widgets take directly; keep that when adding entries.
+    """
     return {
         # Operating conditions
         "p_reactor":    7.0e6,   # Pa
@@ -103,14 +139,35 @@ def default_params() -> dict[str, Any]:
     }
 
 
+def shared_props() -> WaterIAPWS:
+    """Property backend meant to be shared by every solve of a long-running process.
+
+    Saturation queries are interpolated from the process-wide 4096-point table
+    (built once, ~2.5 s), and the IAPWS97 state caches stay warm between runs, so
+    repeated solves around similar operating points mostly hit cached states.
+    """
+    return WaterIAPWS(sat_table=True)
+
+
 def build_and_solve(
     params: dict[str, Any],
     max_iter: int = 50,
     tol: float = 1e-7,
+    props: WaterProps | None = None,
+    initial_state: dict[str, tuple[float, float, float]] | None = None,
 ) -> tuple[Network, SolveResult, dict[str, Any], str]:
     """
     Construct the network, solve it, and return
     (network, solve_result, connection_refs_dict, solver_log_string).
+
+    ``props`` is the property backend; pass one long-lived instance (see
+    :func:`shared_props`) to reuse its state caches across solves. Default: a fresh
+    exact ``WaterIAPWS``.
+
+    ``initial_state`` (from :func:`connection_state` of an earlier solve) replaces
+    the built-in m/p/h guesses of the connections it names; boundary conditions are
+    applied afterwards and still win. A nearby converged operating point typically
+    needs only a few Newton iterations.
     """
     p = params
     p_reactor = p["p_reactor"]
@@ -122,7 +179,7 @@ def build_and_solve(
     m_vap   = m_core * 0.15   # initial steam-fraction guess
     m_liq   = m_core - m_vap
 
-    nw = Network()
+    nw = Network() if props is None else Network(props=props)
 
     steam_mixer = Mixer("SteamMixer")
 
@@ -240,18 +297,22 @@ def build_and_solve(
                               "c_heat_mix",
                               m_guess=m_ssep_vap, p_guess=p_reactor, h_guess=1.20e6)
 
+    if initial_state:
+        for name, (m, p_, h) in initial_state.items():
+            conn = nw.connections.get(name)
+            if conn is not None:
+                conn.m.value, conn.p.value, conn.h.value = m, p_, h
+
     # ── boundary conditions ───────────────────────────────────────────────────
     c_cond_pump.p.fix(p_cond)
     c_pump_heat.p.fix(p_reactor)
     c_vent_dclow.m.fix(m_core)
     core.set_power(Q_core)
 
-    # ── solve (capture stdout for the log) ────────────────────────────────────
-    opts = SolveOptions(max_iter=max_iter, tol=tol, verbose=True)
-    buf  = io.StringIO()
-    with contextlib.redirect_stdout(buf):
-        result = nw.solve(opts)
-    log = buf.getvalue()
+    # ── solve (verbose lines collected for the log) ───────────────────────────
+    opts   = SolveOptions(max_iter=max_iter, tol=tol, verbose=True, log_to_list=True)
+    result = nw.solve(opts)
+    log    = "".join(line + "\n" for line in result.log_lines)
 
     refs: dict[str, Any] = dict(
         c_mix_dcup=c_mix_dcup,   c_vent_dclow=c_vent_dclow,
@@ -269,31 +330,52 @@ def build_and_solve(
     return nw, result, refs, log
 
 
+def connection_state(nw: Network) -> dict[str, tuple[float, float, float]]:
+    """(m, p, h) of every connection by name, for ``build_and_solve(initial_state=...)``."""
+    return {
+        name: (c.m.value, c.p.value, c.h.value) for name, c in nw.connections.items()
+    }
+
+
 def extract_states_df(refs: dict[str, Any], props: WaterIAPWS) -> pd.DataFrame:
-    """Return a DataFrame with full thermodynamic state at every station."""
-    rows = []
-    for label, key, branch in STATION_SEQUENCE:
-        if key not in refs:
-            continue
-        conn = refs[key]
-        p_pa = conn.p.value
-        h_jkg = conn.h.value
-        m_kgs = conn.m.value
-        T_K   = props.T_ph(p_pa, h_jkg)
-        x     = props.quality_ph(p_pa, h_jkg)
-        alpha = props.void_fraction_ph(p_pa, h_jkg)
+    """Return a DataFrame with full thermodynamic state at every station.
+
+    Station states are gathered into arrays once; T, x, alpha, s and rho then come
+    from one fused ``thermo_ph_vec`` call when the backend has it (one T-solve per
+    single-phase station), from scalar calls per station otherwise. The table is
+    built column-wise.
+    """
+    stations = [(label, refs[key], branch) for label, key, branch in STATION_SEQUENCE if key in refs]
+    n = len(stations)
+    m = np.fromiter((c.m.value for _, c, _ in stations), dtype=float, count=n)
+    p = np.fromiter((c.p.value for _, c, _ in stations), dtype=float, count=n)
+    h = np.fromiter((c.h.value for _, c, _ in stations), dtype=float, count=n)
+
+    def each(fn) -> np.ndarray:
+        return np.array([fn(pi, hi) for pi, hi in zip(p.tolist(), h.tolist())], dtype=float)
+
+    def s_or_nan(p_pa: float, h_jkg: float) -> float:
+        if not is_valid_ph(p_pa, h_jkg):
+            return float("nan")
         try:
-            s_jkgK = props.s_ph(p_pa, h_jkg)
-        except Exception:
-            s_jkgK = float("nan")
-        rho = props.rho_ph(p_pa, h_jkg)
-        rows.append(dict(
-            Station=label, Branch=branch,
-            m_kgs=m_kgs, p_MPa=p_pa / 1e6, h_kJkg=h_jkg / 1e3,
-            T_C=T_K - 273.15, x=x, alpha=alpha,
-            s_kJkgK=s_jkgK / 1e3, rho_kgm3=rho,
-        ))
-    return pd.DataFrame(rows)
+            return props.s_ph(p_pa, h_jkg)
+        except Exception:  # inside the envelope, but the backend still rejects it
+            return float("nan")
+
+    thermo = getattr(props, "thermo_ph_vec", None)
+    if thermo is not None:
+        T, x, alpha, s, rho = thermo(p, h)
+    else:
+        T, x, alpha = each(props.T_ph), each(props.quality_ph), each(props.void_fraction_ph)
+        s, rho = each(s_or_nan), each(props.rho_ph)
+    return pd.DataFrame(dict(
+        Station=[st[0] for st in stations], Branch=[st[2] for st in stations],
+        m_kgs=m, p_MPa=p / 1e6, h_kJkg=h / 1e3,
+        T_C=T - 273.15,
+        x=x, alpha=alpha,
+        s_kJkgK=s / 1e3,
+        rho_kgm3=rho,
+    ))
 
 
 def compute_performance(refs: dict[str, Any], params: dict[str, Any]) -> dict[str, float]:
@@ -8,6 +8,7 @@ All functions accept post-solve data and return go.Figure objects.
 from __future__ import annotations
 
 from functools import lru_cache
+from pathlib import Path
 
 import numpy as np
 import pandas as pd
@@ -25,77 +26,135 @@ _ORANGE = "#ff7f0e"
 _GRAY   = "rgba(150,150,150,0.5)"
 
 
-# ── saturation dome (cached for the process lifetime) ────────────────────────
+# ── saturation dome (cached on disk and for the process lifetime) ────────────
+# 80 pressures from near triple point to critical point [MPa]
+_DOME_P_MPA = np.concatenate([
+    np.linspace(0.001, 1.0, 30),
+    np.linspace(1.0, 22.0, 50),
+])
+_DOME_CACHE = Path(__file__).resolve().parent / ".sat_dome.npz"
+
+
 @lru_cache(maxsize=1)
 def _saturation_dome() -> dict | None:
     """
     Return liquid / vapour saturation arrays for P-h and T-s diagrams.
-    Returns None if iapws is not installed.
+    Returns None if neither systems_th nor iapws can be imported (and no dome was
+    cached yet).
     Values are in *plot units*: P [MPa], h [kJ/kg], T [°C], s [kJ/kg·K].
+    The arrays are shared by every session and figure, so they are read-only.
+    ``ph_x``/``ph_y`` and ``ts_x``/``ts_y`` are the closed dome outlines (liquid line
+    up, vapour line back down) ready for the diagram traces.
+
+    The first process to compute the dome saves it to ``.sat_dome.npz`` next to this
+    module (if writable); later processes load it instead of re-running IAPWS97.
+    """
+    dome = _load_dome()
+    if dome is None:
+        dome = _compute_dome()
+        if dome is None:
+            return None
+        try:
+            np.savez(_DOME_CACHE, **dome)
+        except OSError:
+            pass
+
+    def outline(liq, vap, y):
+        return (np.concatenate([liq, vap[::-1], liq[:1]]),
+                np.concatenate([y, y[::-1], y[:1]]))
+
+    dome["ph_x"], dome["ph_y"] = outline(dome["h_f"], dome["h_g"], dome["p_MPa"])
+    dome["ts_x"], dome["ts_y"] = outline(dome["s_f"], dome["s_g"], dome["T_C"])
+    for arr in dome.values():
+        arr.flags.writeable = False
+    return dome
+
+
+def _load_dome() -> dict | None:
+    try:
+        with np.load(_DOME_CACHE) as f:
+            dome = {k: f[k] for k in f.files}
+    except (OSError, ValueError):
+        return None
+    # Stale if the sample grid changed
+    if not np.array_equal(dome.get("p_MPa"), _DOME_P_MPA):
+        return None
+    return dome
+
+
+def _compute_dome() -> dict | None:
     """
+    Closed-form IF97 saturation lines on the whole grid at once; only the points
+    above 16.53 MPa (bordering region 3) go through IAPWS97 objects.
+    """
+    try:
+        from systems_th.props import saturation_lines
+    except ImportError:
+        saturation_lines = None
     try:
         from iapws import IAPWS97  # type: ignore
     except ImportError:
+        IAPWS97 = None
+    if saturation_lines is None and IAPWS97 is None:
         return None
 
-    # Sample 80 pressures from near triple point to critical point
-    p_mpa = np.concatenate([
-        np.linspace(0.001, 1.0, 30),
-        np.linspace(1.0, 22.0, 50),
-    ])
-    h_f, h_g, T_sat, s_f, s_g = [], [], [], [], []
-    for p in p_mpa:
-        try:
-            wl = IAPWS97(P=p, x=0.0)
-            wv = IAPWS97(P=p, x=1.0)
-            h_f.append(wl.h);  h_g.append(wv.h)
-            T_sat.append(wl.T - 273.15)
-            s_f.append(wl.s);  s_g.append(wv.s)
-        except Exception:
-            h_f.append(np.nan); h_g.append(np.nan)
-            T_sat.append(np.nan)
-            s_f.append(np.nan); s_g.append(np.nan)
-
-    return dict(
-        p_MPa=p_mpa,
-        h_f=np.array(h_f), h_g=np.array(h_g),
-        T_C=np.array(T_sat),
-        s_f=np.array(s_f),  s_g=np.array(s_g),
-    )
+    p_mpa = _DOME_P_MPA
+    if saturation_lines is not None:
+        T, h_l, h_v, s_l, s_v = saturation_lines(p_mpa * 1e6)
+        # SI → plot units
+        T_sat, h_f, h_g, s_f, s_g = T - 273.15, h_l * 1e-3, h_v * 1e-3, s_l * 1e-3, s_v * 1e-3
+    else:
+        T_sat, h_f, h_g, s_f, s_g = (np.full(p_mpa.shape, np.nan) for _ in range(5))
 
+    # The saturation line ends at the critical point (22.064 MPa)
+    todo = np.flatnonzero(np.isnan(T_sat) & (p_mpa < 22.064))
+    if IAPWS97 is not None:
+        for i in todo:
+            wl = IAPWS97(P=p_mpa[i], x=0.0)
+            wv = IAPWS97(P=p_mpa[i], x=1.0)
+            h_f[i], h_g[i] = wl.h, wv.h
+            T_sat[i] = wl.T - 273.15
+            s_f[i], s_g[i] = wl.s, wv.s
 
-def _dome_trace_ph(sat: dict) -> go.Scatter:
-    h = np.concatenate([sat["h_f"], sat["h_g"][::-1], [sat["h_f"][0]]])
-    p = np.concatenate([sat["p_MPa"], sat["p_MPa"][::-1], [sat["p_MPa"][0]]])
-    return go.Scatter(
-        x=h, y=p, mode="lines",
-        line=dict(color="gray", width=1, dash="dot"),
-        name="Sat. dome", showlegend=True,
-        hoverinfo="skip",
-    )
+    return dict(p_MPa=p_mpa.copy(), h_f=h_f, h_g=h_g, T_C=T_sat, s_f=s_f, s_g=s_g)
 
 
-def _dome_trace_ts(sat: dict) -> go.Scatter:
-    s = np.concatenate([sat["s_f"], sat["s_g"][::-1], [sat["s_f"][0]]])
-    T = np.concatenate([sat["T_C"], sat["T_C"][::-1], [sat["T_C"][0]]])
+def _dome_trace(x: np.ndarray, y: np.ndarray) -> go.Scatter:
     return go.Scatter(
-        x=s, y=T, mode="lines",
+        x=x, y=y, mode="lines",
         line=dict(color="gray", width=1, dash="dot"),
         name="Sat. dome", showlegend=True,
         hoverinfo="skip",
     )
 
 
+def _branch_columns(states_df: pd.DataFrame, cols: list[str]):
+    """
+    Yield ``(branch, {col: array})`` per branch present in *states_df*, in
+    BRANCH_COLOR order. Columns are pulled out as NumPy arrays once and sliced with
+    a boolean mask per branch (the branch set is small and closed, so this is much
+    cheaper than a pandas groupby).
+    """
+    branch_arr = states_df["Branch"].to_numpy()
+    arrays = {c: states_df[c].to_numpy() for c in cols}
+    branches = list(BRANCH_COLOR) + sorted(set(branch_arr) - BRANCH_COLOR.keys())
+    for branch in branches:
+        mask = branch_arr == branch
+        if mask.any():
+            yield branch, {c: a[mask] for c, a in arrays.items()}
+
+
 # ── P-h diagram ───────────────────────────────────────────────────────────────
 def plot_ph_diagram(states_df: pd.DataFrame) -> go.Figure:
     fig = go.Figure()
 
     sat = _saturation_dome()
     if sat is not None:
-        fig.add_trace(_dome_trace_ph(sat))
+        fig.add_trace(_dome_trace(sat["ph_x"], sat["ph_y"]))
 
-    for branch, grp in states_df.groupby("Branch"):
-        cd = np.stack([grp["T_C"], grp["x"], grp["m_kgs"], grp["alpha"]], axis=-1)
+    cols = ["Station", "h_kJkg", "p_MPa", "T_C", "x", "m_kgs", "alpha"]
+    for branch, grp in _branch_columns(states_df, cols):
+        cd = np.column_stack([grp["T_C"], grp["x"], grp["m_kgs"], grp["alpha"]])
         fig.add_trace(go.Scatter(
             x=grp["h_kJkg"], y=grp["p_MPa"],
             mode="markers+text",
@@ -134,11 +193,12 @@ def plot_ts_diagram(states_df: pd.DataFrame) -> go.Figure:
 
     sat = _saturation_dome()
     if sat is not None:
-        fig.add_trace(_dome_trace_ts(sat))
+        fig.add_trace(_dome_trace(sat["ts_x"], sat["ts_y"]))
 
-    for branch, grp in states_df.groupby("Branch"):
-        grp = grp.dropna(subset=["s_kJkgK"])
-        cd = np.stack([grp["p_MPa"], grp["x"], grp["m_kgs"]], axis=-1)
+    s_all = states_df["s_kJkgK"].to_numpy()
+    cols = ["Station", "s_kJkgK", "T_C", "p_MPa", "x", "m_kgs"]
+    for branch, grp in _branch_columns(states_df[~np.isnan(s_all)], cols):
+        cd = np.column_stack([grp["p_MPa"], grp["x"], grp["m_kgs"]])
         fig.add_trace(go.Scatter(
             x=grp["s_kJkgK"], y=grp["T_C"],
             mode="markers+text",
@@ -176,12 +236,11 @@ _LOOP_ORDER = [
     "Turbine inlet", "Turbine outlet",
     "Condenser outlet", "Pump outlet", "Heater outlet", "Mixer → DC upper",
 ]
+_LOOP_CAT = pd.CategoricalDtype(_LOOP_ORDER, ordered=True)
 
 def plot_loop_profile(states_df: pd.DataFrame) -> go.Figure:
-    order_map = {s: i for i, s in enumerate(_LOOP_ORDER)}
     df = (states_df[states_df["Station"].isin(_LOOP_ORDER)]
-          .assign(_ord=lambda d: d["Station"].map(order_map))
-          .sort_values("_ord"))
+          .sort_values("Station", key=lambda st: st.astype(_LOOP_CAT)))
 
     fig = make_subplots(specs=[[{"secondary_y": True}]])
 
@@ -215,12 +274,11 @@ _PRIMARY_ORDER = [
     "Core inlet", "Core outlet", "Post-core", "Orifice plate out",
     "Chimney inlet", "Chimney outlet",
 ]
+_PRIMARY_CAT = pd.CategoricalDtype(_PRIMARY_ORDER, ordered=True)
 
 def plot_void_quality(states_df: pd.DataFrame) -> go.Figure:
-    order_map = {s: i for i, s in enumerate(_PRIMARY_ORDER)}
     df = (states_df[states_df["Station"].isin(_PRIMARY_ORDER)]
-          .assign(_ord=lambda d: d["Station"].map(order_map))
-          .sort_values("_ord"))
+          .sort_values("Station", key=lambda st: st.astype(_PRIMARY_CAT)))
 
     fig = go.Figure()
     fig.add_trace(go.Bar(
@@ -348,37 +406,3 @@ def plot_convergence(iterations: list[int], residuals: list[float]) -> go.Figure
         height=360, template="plotly_white",
     )
     return fig
-
-
-# ── Network topology (graphviz dot string) ────────────────────────────────────
-TOPOLOGY_DOT = """\
-digraph {
-    rankdir=LR;
-    node [shape=box, style="filled,rounded", fontsize=10, fontname=Helvetica];
-    edge [fontsize=9];
-
-    SteamMixer   [label="Steam\\nMixer",      fillcolor="#aec7e8"]
-    DC_up        [label="Downcomer\\nupper",  fillcolor="#aec7e8"]
-    Venturi      [label="Venturi\\n(jet pump)",fillcolor="#98df8a", shape=ellipse]
-    DC_low       [label="Downcomer\\nlower",  fillcolor="#aec7e8"]
-    Core         [label="Core\\nChannel",     fillcolor="#ff9896", shape=box3d]
-    PostCore     [label="Post-core\\n(3 ft)", fillcolor="#c7c7c7"]
-    Orifice      [label="Orifice\\nPlate",    fillcolor="#c5b0d5", shape=diamond]
-    OrifPhase    [label="Orifice\\nSeparator",fillcolor="#c5b0d5"]
-    Chimney      [label="Chimney",            fillcolor="#aec7e8"]
-    SteamSep     [label="Steam\\nSeparator",  fillcolor="#c5b0d5"]
-    Turbine      [label="Turbine",            fillcolor="#ffbb78", shape=trapezium]
-    Condenser    [label="Condenser",          fillcolor="#dbdb8d"]
-    Pump         [label="Pump",               fillcolor="#9edae5", shape=invtrapezium]
-    Heater       [label="Feedwater\\nHeater", fillcolor="#f7b6d2"]
-
-    SteamMixer -> DC_up -> Venturi -> DC_low -> Core
-    Core -> PostCore -> Orifice -> OrifPhase
-    OrifPhase -> Chimney        [label="vapor ↑"                      color="#d62728"]
-    OrifPhase -> Venturi        [label="liquid return" style=dashed   color="#2ca02c"]
-    Chimney   -> SteamSep
-    SteamSep  -> Turbine        [label="steam"                        color="#d62728"]
-    SteamSep  -> SteamMixer     [label="sep. liquid"  style=dashed    color="#2ca02c"]
-    Turbine   -> Condenser -> Pump -> Heater -> SteamMixer
-}
-"""
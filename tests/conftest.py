@@ -0,0 +1,18 @@
+import pytest
+
+
+@pytest.fixture(scope="session")
+def _sat_table_cache_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp("systems_th_cache")
+
+
+@pytest.fixture(autouse=True)
+def _isolated_sat_tables(_sat_table_cache_dir, monkeypatch):
+    # Persist saturation tables to a per-session directory instead of ~/.cache/systems_th,
+    # and start every test without the process-wide tables of the previous ones
+    monkeypatch.setenv("SYSTEMS_TH_CACHE_DIR", str(_sat_table_cache_dir))
+    try:
+        from systems_th.props import saturation
+    except ImportError:  # iapws missing; the tests that need it skip themselves
+        return
+    monkeypatch.setattr(saturation, "_TABLES", {})
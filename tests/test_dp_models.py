@@ -32,3 +32,82 @@ def test_chisholm_runs():
     dp_c = dp_pipe(m, p_in, h_mid, p_out, h_out, props, L=5.0, D=0.05, eps=1e-5, A=0.002, two_phase_friction="chisholm").total
     assert dp_h > 0
     assert dp_c > 0
+
+
+def test_haaland_matches_log10_form():
+    import math
+
+    from systems_th.correlations.friction import haaland_friction_factor
+
+    for Re in (5e3, 1e5, 1e7):
+        for eps_rel in (0.0, 1e-5, 1e-3):
+            ref = (-1.8 * math.log10((eps_rel / 3.7) ** 1.11 + 6.9 / Re)) ** -2
+            assert haaland_friction_factor(Re, eps_rel) == pytest.approx(ref, rel=1e-12)
+    assert haaland_friction_factor(1000.0, 1e-4) == pytest.approx(0.064)
+    # No fastmath: a NaN state (e.g. outside the property envelope) must propagate
+    assert math.isnan(haaland_friction_factor(math.nan, 1e-4))
+
+
+def test_haaland_derivative_matches_finite_difference():
+    from systems_th.correlations.friction import haaland_friction_factor_rough, haaland_friction_factor_rough_grad
+
+    rough = (1e-4 / 3.7) ** 1.11
+    for Re in (1e3, -1e3, 5e3, 1e5, -1e5):
+        f, df = haaland_friction_factor_rough_grad(Re, rough)
+        step = 1e-6 * abs(Re)
+        fd = (haaland_friction_factor_rough(Re + step, rough) - haaland_friction_factor_rough(Re - step, rough)) / (2 * step)
+        assert f == haaland_friction_factor_rough(Re, rough)
+        assert df == pytest.approx(fd, rel=1e-6)
+
+
+def test_dp_pipe_property_overrides_match_internal_calls():
+    props = WaterIAPWS()
+    p_in, p_out = 7e6, 6.9e6
+    h_in, h_out = 1.2e6, 1.4e6
+    ref = dp_pipe(80.0, p_in, h_in, p_out, h_out, props, L=3.0, D=0.1, eps=1e-5, K=2.0, dz=1.0)
+    st = props.state_ph(0.5 * (p_in + p_out), 0.5 * (h_in + h_out))
+    got = dp_pipe(
+        80.0, p_in, h_in, p_out, h_out, props, L=3.0, D=0.1, eps=1e-5, K=2.0, dz=1.0,
+        rho_avg=st.rho, mu_avg=st.mu, rho_in=props.rho_ph(p_in, h_in), rho_out=props.rho_ph(p_out, h_out),
+    )
+    assert got == ref
+    assert got.total == sum(got) and got._fields == ("dp_fric", "dp_form", "dp_grav", "dp_acc")
+
+
+@pytest.mark.parametrize("model", ["homogeneous", "chisholm"])
+def test_dp_pipe_vec_matches_scalar_segments(model):
+    import numpy as np
+
+    from systems_th.correlations import dp_pipe_vec
+
+    props = WaterIAPWS()
+    h_in = np.array([1.0e6, 1.25e6, 1.5e6, 2.9e6])
+    h_out = h_in + 5e4
+    p_in = np.array([7e6, 7e6, 6.9e6, 6.8e6])
+    dz = np.array([0.0, 1.0, 2.0, -1.0])
+    vec = dp_pipe_vec(80.0, p_in, h_in, p_in - 1e5, h_out, props, L=2.0, D=0.1, eps=1e-5, K=1.5, dz=dz,
+                      two_phase_friction=model)
+    for i in range(len(h_in)):
+        ref = dp_pipe(80.0, p_in[i], h_in[i], p_in[i] - 1e5, h_out[i], props, L=2.0, D=0.1, eps=1e-5,
+                      K=1.5, dz=dz[i], two_phase_friction=model)
+        for term in ("dp_fric", "dp_form", "dp_grav", "dp_acc"):
+            assert getattr(vec, term)[i] == pytest.approx(getattr(ref, term), rel=1e-12, abs=1e-9)
+    assert vec.total.shape == h_in.shape
+
+
+def test_chisholm_multiplier_matches_reference_form():
+    from systems_th.correlations.pressure_drop import _chisholm_C, _phi_l2_chisholm
+
+    assert [_chisholm_C(a, b) for a, b in ((1e3, 1e3), (1e3, 1e5), (1e5, 1e3), (1e5, 1e5))] == [5.0, 12.0, 12.0, 20.0]
+    x, rho_l, rho_v, mu_l, mu_v = 0.2, 740.0, 36.5, 9.1e-5, 1.9e-5
+    X_tt = ((1.0 - x) / x) ** 0.9 * (rho_v / rho_l) ** 0.5 * (mu_l / mu_v) ** 0.1
+    ref = 1.0 + 20.0 / X_tt + 1.0 / X_tt ** 2
+    assert _phi_l2_chisholm(x, rho_l, rho_v, mu_l, mu_v, 1e5, 1e5) == pytest.approx(ref, rel=1e-13)
+    import numpy as np
+
+    from systems_th.correlations.pressure_drop import _phi_l2_chisholm_vec
+
+    xs = np.array([0.0, 0.2, 0.7, 1.0])
+    got = _phi_l2_chisholm_vec(xs, rho_l, rho_v, mu_l, mu_v, np.array([1e3, 1e5, 1e5, 1e3]), 1e5)
+    ref = [_phi_l2_chisholm(float(v), rho_l, rho_v, mu_l, mu_v, Re, 1e5) for v, Re in zip(xs, (1e3, 1e5, 1e5, 1e3))]
+    np.testing.assert_allclose(got, ref, rtol=1e-13)
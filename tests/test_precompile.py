@@ -0,0 +1,17 @@
+from systems_th._precompile import precompile
+
+
+def test_precompile_calls_every_kernel():
+    timings = precompile()
+    assert {"_pipe_residuals", "_pipe_dp", "haaland_friction_factor"} <= set(timings)
+
+
+def test_jit_can_be_disabled_by_environment():
+    import os
+    import subprocess
+    import sys
+
+    env = dict(os.environ, SYSTEMS_TH_JIT="0")
+    code = "from systems_th import _jit; print(_jit.HAVE_NUMBA, _jit.njit('f8(f8)')(abs)(-2.0))"
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.split() == ["False", "2.0"]
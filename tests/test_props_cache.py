@@ -0,0 +1,126 @@
+import pytest
+pytest.importorskip("iapws")
+
+from systems_th.props import WaterIAPWS
+
+
+def test_state_cache_is_per_instance_and_bounded():
+    w = WaterIAPWS(state_cache_size=4)
+    rho = w.rho_ph(7e6, 1.2e6)
+    assert w.rho_ph(7e6, 1.2e6) == rho
+    assert len(w._ph) == 1 and not WaterIAPWS()._ph
+
+    for i in range(6):
+        w.s_ph(7e6, 1.0e6 + 1e3 * i)
+    assert 0 < len(w._ph) <= 4
+
+    w.clear()
+    assert not (w._px or w._ph or w._ps or w._pT)
+    assert w.rho_ph(7e6, 1.2e6) == rho
+
+
+@pytest.mark.parametrize("sat_table", [False, True])
+def test_sat_all_bundles_the_saturation_accessors(sat_table):
+    w = WaterIAPWS(sat_table=sat_table, sat_table_points=64)
+    p = 7e6
+    sat = w.sat_all(p)
+    assert w.sat_all(p) is sat
+    assert w.sat_h_l_v(p) == (sat.h_l, sat.h_v)
+    assert w.sat_rho_l_v(p) == (sat.rho_l, sat.rho_v)
+    assert w.sat_mu_l_v(p) == (sat.mu_l, sat.mu_v)
+    assert w.T_sat_p(p) == sat.T_sat and w.sigma_sat_p(p) == sat.sigma
+
+    exact = WaterIAPWS().sat_all(p)
+    assert sat == pytest.approx(exact, rel=1e-3)
+    assert exact.T_sat == pytest.approx(558.98, abs=0.05)
+
+
+@pytest.mark.parametrize("h", [1.0e6, 1.8e6, 3.0e6])
+def test_state_ph_matches_the_single_property_accessors(h):
+    w = WaterIAPWS()
+    p = 7e6
+    st = w.state_ph(p, h)
+    assert st.rho == w.rho_ph(p, h)
+    assert st.mu == w.mu_ph(p, h)
+    assert st.k == w.k_ph(p, h)
+    assert st.cp == w.cp_ph(p, h)
+    assert st.x == w.quality_ph(p, h)
+    assert st.alpha == w.void_fraction_ph(p, h)
+
+
+def test_batched_state_queries_match_scalar_accessors():
+    import numpy as np
+
+    w = WaterIAPWS()
+    p = np.array([7e6, 7e6, 7e6, 1e5, 1e5])
+    h = np.array([1.0e6, 1.8e6, 3.0e6, 4.0e5, 2.2e6])
+    x, alpha = w.quality_void_ph_vec(p, h)
+    T = w.T_ph_vec(p, h)
+    for i in range(len(p)):
+        assert x[i] == pytest.approx(w.quality_ph(p[i], h[i]), rel=1e-14, abs=1e-15)
+        assert alpha[i] == pytest.approx(w.void_fraction_ph(p[i], h[i]), rel=1e-14, abs=1e-15)
+        assert T[i] == w.T_ph(p[i], h[i])
+
+
+@pytest.mark.parametrize("p, h", [(7e6, 1.0e6), (1e4, 1.5e5), (7e6, 3.0e6), (1e5, 3.5e6), (20e6, 1.7e6)])
+def test_T_ph_kernels_match_iapws(p, h):
+    from iapws import IAPWS97
+
+    # The last point is in region 3, which falls back to iapws
+    assert WaterIAPWS().T_ph(p, h) == pytest.approx(IAPWS97(P=p * 1e-6, h=h * 1e-3).T, rel=1e-10)
+
+
+def test_saturation_lines_match_iapws():
+    import numpy as np
+    from iapws import IAPWS97
+
+    from systems_th.props import saturation_lines
+
+    p = np.array([1e4, 1e5, 7e6, 16e6, 20e6])
+    T, h_l, h_v, s_l, s_v = saturation_lines(p)
+    for i in range(4):
+        wl, wv = IAPWS97(P=p[i] * 1e-6, x=0.0), IAPWS97(P=p[i] * 1e-6, x=1.0)
+        assert (T[i], h_l[i], h_v[i], s_l[i], s_v[i]) == pytest.approx(
+            (wl.T, wl.h * 1e3, wv.h * 1e3, wl.s * 1e3, wv.s * 1e3), rel=1e-10
+        )
+    # Borders region 3 above 16.53 MPa
+    assert np.isnan(T[4]) and np.isnan(h_v[4])
+
+
+def test_sat_h_l_v_builds_no_iapws97_states_and_matches_iapws():
+    from iapws import IAPWS97
+
+    w = WaterIAPWS()
+    for p in (1e4, 7e6, 16e6):
+        h_l, h_v = w.sat_h_l_v(p)
+        assert w.h_px(p, 0.25) == pytest.approx(0.75 * h_l + 0.25 * h_v, rel=1e-14)
+        wl, wv = IAPWS97(P=p * 1e-6, x=0.0), IAPWS97(P=p * 1e-6, x=1.0)
+        assert (h_l, h_v) == pytest.approx((wl.h * 1e3, wv.h * 1e3), rel=1e-10)
+    assert not (w._px or w._sat)
+    # Region 3 border: falls back to sat_all, and the kernel miss is cached too
+    assert w.sat_h_l_v(20e6) == (w.sat_all(20e6).h_l, w.sat_all(20e6).h_v)
+    assert 20e6 in w._sat_h and w._sat_h[20e6] is None
+
+
+def test_thermo_ph_fuses_the_single_accessors():
+    import numpy as np
+
+    w = WaterIAPWS()
+    p = np.array([7e6, 7e6, 7e6, 1e5, 20e6])
+    h = np.array([1.0e6, 1.8e6, 3.0e6, 2.2e6, 1.7e6])
+    vec = w.thermo_ph_vec(p, h)
+    for i in range(len(p)):
+        st = w.thermo_ph(p[i], h[i])
+        assert st == pytest.approx(tuple(a[i] for a in vec), rel=1e-13)
+        assert (st.T, st.x, st.alpha) == (w.T_ph(p[i], h[i]), w.quality_ph(p[i], h[i]), w.void_fraction_ph(p[i], h[i]))
+        assert st.rho == pytest.approx(w.rho_ph(p[i], h[i]), rel=1e-9)
+        assert st.s == pytest.approx(w.s_ph(p[i], h[i]), rel=1e-9)
+
+
+def test_is_valid_ph_bounds_the_if97_envelope():
+    from systems_th.props import is_valid_ph
+
+    assert is_valid_ph(7e6, 1.2e6) and is_valid_ph(1e5, 3.5e6) and is_valid_ph(20e6, 1.7e6)
+    assert not is_valid_ph(100.0, 1e6)      # below the triple-point pressure
+    assert not is_valid_ph(7e6, -1e5)       # colder than 273.15 K
+    assert not is_valid_ph(7e6, 5e6)        # hotter than 1073.15 K
@@ -0,0 +1,541 @@
+import numpy as np
+import pytest
+pytest.importorskip("iapws")
+
+from systems_th import Network
+from systems_th.components import AreaChange, Mixer, OrificePlate, Condenser, Source, Sink
+
+
+def _build():
+    nw = Network()
+    src_a = Source("SrcA", m_dot=60.0, p=7e6, h=1.2e6)
+    src_b = Source("SrcB", m_dot=40.0, h=1.0e6)
+    mix = Mixer("Mixer")
+    area = AreaChange("Area", A_in=0.05, A_out=0.1, K=0.5, dz=1.0)
+    orif = OrificePlate("Orifice", Cd=0.61, A=0.02)
+    cond = Condenser("Condenser", p_out=1e5, x_out=0.0)
+    sink = Sink("Sink")  # outlet pressure already set by the condenser; keeps the system square
+    for c in [src_a, src_b, mix, area, orif, cond, sink]:
+        nw.add_component(c)
+    nw.connect(src_a, "out", mix, "a", "c_a", m_guess=60.0, p_guess=7e6, h_guess=1.2e6)
+    nw.connect(src_b, "out", mix, "b", "c_b", m_guess=40.0, p_guess=7e6, h_guess=1.0e6)
+    nw.connect(mix, "out", area, "in", "c_mix", m_guess=100.0, p_guess=7e6, h_guess=1.1e6)
+    nw.connect(area, "out", orif, "in", "c_area", m_guess=100.0, p_guess=6.9e6, h_guess=1.1e6)
+    nw.connect(orif, "out", cond, "in", "c_orif", m_guess=100.0, p_guess=6.5e6, h_guess=1.1e6)
+    nw.connect(cond, "out", sink, "in", "c_cond", m_guess=100.0, p_guess=1e5, h_guess=4e5)
+    return nw
+
+
+def test_residual_buffer_matches_equations():
+    nw = _build()
+    nw.prepare()
+    f = nw.evaluate_residuals().copy()
+    eqs = [eq for comp in nw.components for eq in comp.equations(nw.props)]
+    ref = np.array([eq.residual / eq.scale for eq in eqs])
+    assert f.shape == ref.shape
+    np.testing.assert_allclose(f, ref, rtol=1e-12, atol=1e-14)
+    # Network.residuals keeps the component contract: unscaled residual plus its scale
+    got = nw.residuals()
+    np.testing.assert_allclose([eq.residual for eq in got], [eq.residual for eq in eqs], rtol=1e-12)
+    np.testing.assert_allclose([eq.scale for eq in got], [eq.scale for eq in eqs], rtol=1e-12)
+    np.testing.assert_allclose([eq.residual / eq.scale for eq in got], ref, rtol=1e-12, atol=1e-14)
+
+
+def _component(nw, name):
+    return next(c for c in nw.components if c.name == name)
+
+
+def test_equations_pick_up_edited_parameters():
+    nw, ref = _build(), _build()
+    nw.prepare()
+    orif = _component(nw, "Orifice")
+    before = [eq.residual for eq in orif.equations(nw.props)]
+    orif.Cd = 0.4
+    _component(ref, "Orifice").Cd = 0.4
+    ref.prepare()
+    got = [eq.residual for eq in orif.equations(nw.props)]
+    assert got != before
+    assert got == pytest.approx([eq.residual for eq in _component(ref, "Orifice").equations(ref.props)])
+
+
+def test_residuals_pick_up_edited_parameters():
+    nw, ref = _build(), _build()
+    nw.residuals()
+    _component(nw, "Orifice").Cd = 0.4
+    _component(ref, "Orifice").Cd = 0.4
+    got = [eq.residual for eq in nw.residuals()]
+    assert got == pytest.approx([eq.residual for eq in ref.residuals()], rel=1e-12)
+
+
+def test_condenser_fixed_outlet_enthalpy_follows_p_out():
+    nw, ref = _build(), _build()
+    nw.prepare()
+    nw.evaluate_residuals()
+    # Edited without re-preparing: the folded h_px(p_out, x_out) must not go stale
+    _component(nw, "Condenser").p_out = 2e5
+    _component(ref, "Condenser").p_out = 2e5
+    ref.prepare()
+    np.testing.assert_allclose(nw.evaluate_residuals(), ref.evaluate_residuals(), rtol=1e-12)
+
+
+def _jacobian(nw, f0):
+    # Dense view of the assembled CSR Jacobian
+    from systems_th.solver import _assemble_jacobian
+
+    return _assemble_jacobian(nw, f0, 1e-6).to_dense()
+
+
+def test_analytic_jacobian_matches_finite_difference():
+    from systems_th.solver import SolveOptions
+
+    # Analytic rows freeze the residual scales, so compare at the solution (residual -> 0)
+    nw = _build()
+    assert nw.solve(SolveOptions(verbose=False)).converged
+    nw.prepare()
+    free = nw.free_variables()
+    f0 = nw.evaluate_residuals().copy()
+    J = _jacobian(nw, f0)
+    np.testing.assert_allclose(J, _fd_dense(nw, free, f0), rtol=1e-3, atol=1e-6)
+
+
+def test_jacobian_pattern_is_csr_over_free_variables():
+    nw = _build()
+    nw.prepare()
+    pat = nw._jac
+    n_eq, n_var = len(nw._residual), len(nw.free_variables())
+    assert pat.shape == (n_eq, n_var)
+    assert pat.indptr.shape == (n_eq + 1,) and pat.indptr[-1] == pat.nnz
+    assert 0 < pat.nnz < n_eq * n_var
+    for r in range(n_eq):
+        cols = pat.indices[pat.indptr[r]:pat.indptr[r + 1]]
+        assert np.all(np.diff(cols) > 0)
+
+
+def test_sparse_lu_matches_lstsq():
+    pytest.importorskip("scipy")
+    from systems_th import SolveOptions
+
+    from systems_th.linsolve import LinearSolver
+
+    states = []
+    for method in ("sparse", "lstsq", "gmres"):
+        nw = _build()
+        nw.prepare()
+        expected = {"lstsq": ("lstsq",), "gmres": ("gmres",)}.get(method, ("splu", "umfpack"))
+        assert LinearSolver(nw._jac, method).name in expected
+        res = nw.solve(SolveOptions(verbose=False, linear_solver=method))
+        assert res.converged
+        states.append(np.array([v.value for v in nw.all_variables()]))
+    np.testing.assert_allclose(states[0], states[1], rtol=1e-8)
+    np.testing.assert_allclose(states[2], states[1], rtol=1e-8)
+
+
+def test_gmres_amg_preconditioner_is_optional():
+    pytest.importorskip("scipy")
+    from systems_th import SolveOptions
+    from systems_th.linsolve import HAVE_PYAMG, LinearSolver
+
+    nw = _build()
+    nw.prepare()
+    with pytest.raises(ValueError):
+        LinearSolver(nw._jac, "gmres", preconditioner="jacobi")
+    if not HAVE_PYAMG:
+        with pytest.raises(ImportError):
+            LinearSolver(nw._jac, "gmres", preconditioner="amg")
+        return
+    assert nw.solve(SolveOptions(verbose=False, linear_solver="gmres", preconditioner="amg")).converged
+
+
+@pytest.mark.parametrize("method", ["hybr", "lm"])
+def test_scipy_root_methods_match_newton(method):
+    pytest.importorskip("scipy")
+    from systems_th import SolveOptions
+
+    ref = _build()
+    assert ref.solve(SolveOptions(verbose=False)).converged
+    nw = _build()
+    res = nw.solve(SolveOptions(verbose=False, method=method))
+    assert res.converged
+    np.testing.assert_allclose(
+        [v.value for v in nw.all_variables()], [v.value for v in ref.all_variables()], rtol=1e-6
+    )
+
+
+def test_column_scaling_does_not_change_solution():
+    from systems_th import SolveOptions
+
+    states = []
+    for scaled in (True, False):
+        nw = _build()
+        assert nw.solve(SolveOptions(verbose=False, column_scaling=scaled)).converged
+        states.append(np.array([v.value for v in nw.all_variables()]))
+    np.testing.assert_allclose(states[0], states[1], rtol=1e-8)
+
+
+def test_fused_residuals_match_component_writes():
+    nw = _build()
+    nw.prepare()
+    fused = nw.evaluate_residuals().copy()
+    per_comp = nw.evaluate_residuals(nw.components).copy()
+    np.testing.assert_allclose(fused, per_comp, rtol=1e-14, atol=1e-15)
+
+
+def test_broyden_refresh_converges_to_newton_solution():
+    from systems_th import SolveOptions
+
+    ref = _build()
+    assert ref.solve(SolveOptions(verbose=False)).converged
+    nw = _build()
+    res = nw.solve(SolveOptions(verbose=False, jacobian_refresh=5, max_iter=100))
+    assert res.converged
+    np.testing.assert_allclose(
+        [v.value for v in nw.all_variables()], [v.value for v in ref.all_variables()], rtol=1e-6
+    )
+
+
+def test_refresh_ratio_zero_refreshes_every_iteration():
+    from systems_th import SolveOptions
+
+    ref = _build().solve(SolveOptions(verbose=False))
+    res = _build().solve(SolveOptions(verbose=False, jacobian_refresh=5, refresh_ratio=0.0))
+    assert res.converged and res.iterations == ref.iterations
+    assert res.residual_norm == pytest.approx(ref.residual_norm, rel=1e-6, abs=1e-14)
+
+
+def test_equation_names_are_cached_and_ordered():
+    nw = _build()
+    nw.prepare()
+    names = nw.equation_names()
+    assert names == [eq.name for eq in nw.residuals()]
+    assert len(names) == len(nw._residual)
+    mix = nw.components[2]
+    assert mix.describe_equations() is mix.describe_equations()
+    assert mix.describe_equations()[:2] == ("Mixer.p_eq_a", "Mixer.p_eq_b")
+
+
+def _fd_dense(nw, free, f0):
+    # Perturbs the free variables through the state array, as the solver does
+    from systems_th.solver import _pack_free, _unpack_free
+
+    lo, hi = nw._lo[nw._free_idx], nw._hi[nw._free_idx]
+    x0 = _pack_free(nw)
+    J_fd = np.zeros((len(f0), len(free)))
+    for j in range(len(free)):
+        x = x0.copy()
+        step = 1e-6 * max(1.0, abs(x[j]))
+        x[j] += step
+        _unpack_free(nw, x, lo, hi)
+        J_fd[:, j] = (nw.evaluate_residuals() - f0) / step
+    _unpack_free(nw, x0, lo, hi)
+    return J_fd
+
+
+def _assert_jacobian_matches_fd(nw):
+    # Prepares nw, checks that every row is analytic and matches finite differences;
+    # returns the scaled residuals the comparison was made at
+    nw.prepare()
+    assert not nw._jac.fd_components
+    free = nw.free_variables()
+    f0 = nw.evaluate_residuals().copy()
+    J = _jacobian(nw, f0)
+    np.testing.assert_allclose(J, _fd_dense(nw, free, f0), rtol=1e-3, atol=1e-7)
+    return f0
+
+
+def test_fd_columns_reevaluate_only_dependent_components():
+    from systems_th.components import Heater
+
+    class FDHeater(Heater):
+        def jacobian_entries(self, props):
+            return None  # keep these rows on the finite-difference path
+
+    nw = Network()
+    src = Source("Src", m_dot=50.0, p=7e6, h=1.2e6)
+    h1 = FDHeater("H1", dp=1e4, h_out=1.25e6)
+    h2 = FDHeater("H2", dp=2e4, T_out=560.0)
+    sink = Sink("Sink")
+    for c in [src, h1, h2, sink]:
+        nw.add_component(c)
+    nw.connect(src, "out", h1, "in", "c1", m_guess=50.0, p_guess=7e6, h_guess=1.2e6)
+    nw.connect(h1, "out", h2, "in", "c2", m_guess=50.0, p_guess=6.9e6, h_guess=1.2e6)
+    nw.connect(h2, "out", sink, "in", "c3", m_guess=50.0, p_guess=6.8e6, h_guess=1.22e6)
+    nw.prepare()
+    pat = nw._jac
+    assert len(pat.fd_components) == 2
+    assert any(len(comps) < len(pat.fd_components) for _, _, _, comps in pat.fd_columns)
+    # c1 and c3 columns touch only H1 resp. H2, so they pair up and share evaluations
+    assert len(pat.fd_groups) < len(pat.fd_columns)
+    assert sorted(j for cols, _ in pat.fd_groups for j, _, _ in cols) == [j for j, *_ in pat.fd_columns]
+    for _, comps in pat.fd_groups:
+        assert len({id(c) for c in comps}) == len(comps)
+
+    free = nw.free_variables()
+    f0 = nw.evaluate_residuals().copy()
+    J = _jacobian(nw, f0)
+    np.testing.assert_array_equal(nw._residual, f0)
+    np.testing.assert_allclose(J, _fd_dense(nw, free, f0), rtol=1e-9, atol=1e-12)
+
+
+def test_pipe_and_separator_jacobians_match_finite_difference():
+    from systems_th.components import Pipe, Separator
+
+    # Away from the solution: these rows also differentiate their state-dependent scales
+    nw = Network()
+    src = Source("Src", m_dot=50.0, p=7e6, h=1.5e6)
+    pipe = Pipe("Pipe", L=5.0, D=0.2, dz=2.0, Q=2e6, K=1.0)
+    sep = Separator("Sep", dp=5e4)
+    sv, sl = Sink("SinkV"), Sink("SinkL")
+    for c in [src, pipe, sep, sv, sl]:
+        nw.add_component(c)
+    nw.connect(src, "out", pipe, "in", "c1", m_guess=50.0, p_guess=7e6, h_guess=1.5e6)
+    nw.connect(pipe, "out", sep, "in", "c2", m_guess=45.0, p_guess=6.8e6, h_guess=1.6e6)
+    nw.connect(sep, "vap", sv, "in", "c_v", m_guess=10.0, p_guess=6.7e6, h_guess=2.7e6)
+    nw.connect(sep, "liq", sl, "in", "c_l", m_guess=30.0, p_guess=6.7e6, h_guess=1.2e6)
+    assert np.abs(_assert_jacobian_matches_fd(nw)).max() > 1e-2
+
+
+@pytest.mark.parametrize("fixed_outlet", [True, False])
+def test_pump_heater_turbine_jacobians_match_finite_difference(fixed_outlet):
+    from systems_th.components import Heater, Pump, Turbine
+
+    # Away from the solution, as for Pipe/Separator: the rows differentiate their scales
+    nw = Network()
+    src = Source("Src", m_dot=20.0, p=1e5, h=4e5)
+    if fixed_outlet:
+        pump = Pump("Pump", eta=0.8, p_out=7e6)
+        heater = Heater("Heater", dp=5e4, T_out=600.0)
+        turb = Turbine("Turbine", eta_is=0.85, p_out=2e5)
+    else:
+        pump = Pump("Pump", eta=0.8, dp=6.9e6)
+        heater = Heater("Heater", dp=5e4, h_out=2.9e6)
+        turb = Turbine("Turbine", eta_is=0.85, pr=0.05)
+    sink = Sink("Sink")
+    for c in [src, pump, heater, turb, sink]:
+        nw.add_component(c)
+    nw.connect(src, "out", pump, "in", "c1", m_guess=20.0, p_guess=1.2e5, h_guess=4.1e5)
+    nw.connect(pump, "out", heater, "in", "c2", m_guess=19.0, p_guess=6.8e6, h_guess=4.2e5)
+    nw.connect(heater, "out", turb, "in", "c3", m_guess=21.0, p_guess=6.5e6, h_guess=3.0e6)
+    nw.connect(turb, "out", sink, "in", "c4", m_guess=20.5, p_guess=3e5, h_guess=2.4e6)
+    assert np.abs(_assert_jacobian_matches_fd(nw)).max() > 1e-2
+
+
+def test_variables_share_network_state_array():
+    from systems_th.solver import _pack_free, _unpack_free
+
+    nw = _build()
+    c = nw.connections["c_area"]
+    fixed = nw.connections["c_b"].p
+    fixed.fix(7e6)
+    nw.prepare()
+    assert c.p.value == nw._x[c.p.idx] == 6.9e6
+    c.p.value = 6.8e6
+    assert nw._x[c.p.idx] == 6.8e6
+
+    free = nw.free_variables()
+    lo, hi = nw._lo[nw._free_idx], nw._hi[nw._free_idx]
+    x = _pack_free(nw)
+    np.testing.assert_array_equal(x, [v.value for v in free])
+    x[:] = -1.0
+    _unpack_free(nw, x, lo, hi)
+    assert all(v.value == v.lower for v in free)
+    assert fixed.value == 7e6  # fixed variables are not unpacked
+
+
+def test_core_channel_jacobian_matches_finite_difference():
+    from systems_th.components import CoreChannel
+
+    nw = Network()
+    src = Source("Src", m_dot=50.0, p=7e6, h=1.1e6)
+    core = CoreChannel("Core", L=2.0, D=0.05, A=0.1, K=2.0, dz=2.0, K_bundle=10.0)
+    core.set_exit_void_fraction(0.4, Q_guess_w=2e7)
+    sink = Sink("Sink")
+    for c in [src, core, sink]:
+        nw.add_component(c)
+    nw.connect(src, "out", core, "in", "c1", m_guess=50.0, p_guess=7e6, h_guess=1.1e6)
+    nw.connect(core, "out", sink, "in", "c2", m_guess=48.0, p_guess=6.9e6, h_guess=1.4e6)
+    _assert_jacobian_matches_fd(nw)
+    assert core.Q_var in nw.free_variables()
+
+
+def test_residual_scales_come_from_floors_and_bases():
+    nw = _build()
+    nw.prepare()
+    f = nw.evaluate_residuals()
+    np.testing.assert_array_equal(f, nw._raw / np.fmax(nw._floor, np.abs(nw._basis)))
+
+    mix = nw.components[2]
+    incs = list(mix.inlets.values())
+    e_sum = sum(c.m.value * c.h.value for c in incs)
+    energy = mix._offset + len(incs) + 1
+    assert nw._floor[energy] == 1e6 and nw._basis[energy] == pytest.approx(e_sum)
+    src_a = nw.components[0]
+    assert np.all(nw._basis[src_a._offset:src_a._offset + 3] == 0.0)  # constant scales
+
+
+def test_pipe_reads_ports_from_state_array_once_bound():
+    from systems_th.components import Pipe
+    from systems_th.components.pipe import _read_ports
+
+    nw = Network()
+    src = Source("Src", m_dot=50.0, p=7e6, h=1.2e6)
+    pipe = Pipe("Pipe", L=5.0, D=0.2)
+    sink = Sink("Sink")
+    for c in [src, pipe, sink]:
+        nw.add_component(c)
+    nw.connect(src, "out", pipe, "in", "c1", m_guess=50.0, p_guess=7e6, h_guess=1.2e6)
+    c2 = nw.connect(pipe, "out", sink, "in", "c2", m_guess=49.0, p_guess=6.9e6, h_guess=1.21e6)
+    assert pipe._port_idx is None
+    expected = [50.0, 7e6, 1.2e6, 49.0, 6.9e6, 1.21e6]
+    assert _read_ports(pipe) == expected
+
+    nw.prepare()
+    assert pipe._state is nw._x
+    assert _read_ports(pipe) == expected
+    c2.p.value = 6.8e6
+    assert _read_ports(pipe)[4] == 6.8e6
+
+
+def test_core_channel_array_matches_scalar_channels():
+    from systems_th.components import CoreChannel, CoreChannelArray
+
+    geom = dict(L=[2.0, 3.0, 4.0], D=[0.05, 0.06, 0.08], A=[0.1, 0.12, 0.3], K=2.0, K_bundle=10.0, dz=[2.0, 3.0, 4.0])
+    Q = [1e7, 2e7, 3e7]
+    states = [(50.0, 7e6, 1.1e6, 49.0, 6.9e6, 1.3e6), (40.0, 7e6, 1.2e6, 41.0, 6.95e6, 1.7e6),
+              (30.0, 7e6, 1.0e6, 30.0, 6.8e6, 2.1e6)]
+
+    def build(arr: bool):
+        nw = Network()
+        comps = [CoreChannelArray("Core", n=3, Q=Q, **geom)] if arr else [
+            CoreChannel("Core%d" % i, **{k: (v[i] if isinstance(v, list) else v) for k, v in geom.items()})
+            for i in range(3)
+        ]
+        if not arr:
+            for c, q in zip(comps, Q):
+                c.set_power(q)
+        for c in comps:
+            nw.add_component(c)
+        for i, (m, p, h, m2, p2, h2) in enumerate(states):
+            core = comps[0 if arr else i]
+            src, sink = Source("Src%d" % i, m_dot=m, p=p, h=h), Sink("Sink%d" % i)
+            nw.add_component(src)
+            nw.add_component(sink)
+            nw.connect(src, "out", core, "in%d" % i if arr else "in", "a%d" % i, m_guess=m, p_guess=p, h_guess=h)
+            nw.connect(core, "out%d" % i if arr else "out", sink, "in", "b%d" % i, m_guess=m2, p_guess=p2, h_guess=h2)
+        nw.prepare()
+        return nw, comps
+
+    nw_arr, (core,) = build(True)
+    nw_ref, refs = build(False)
+    assert core._port_idx.shape == (3, 6)
+    assert core.describe_equations()[3:6] == ("Core.mass1", "Core.energy1", "Core.dp1")
+    nw_arr.evaluate_residuals()
+    nw_ref.evaluate_residuals()
+    got = nw_arr._raw[core._offset:core._offset + 9]
+    ref = np.concatenate([nw_ref._raw[c._offset:c._offset + 3] for c in refs])
+    np.testing.assert_allclose(got, ref, rtol=1e-10, atol=1e-6)
+    # Channel rows only depend on their own ports
+    for row, var in core.sparsity(nw_arr.props):
+        inc, out = core._ports(row // 3)
+        assert any(var is v for v in (inc.m, inc.p, inc.h, out.m, out.p, out.h))
+
+
+@pytest.mark.parametrize("friction", ["homogeneous", "chisholm"])
+def test_core_channel_array_jacobian_matches_finite_difference(friction):
+    from systems_th.components import CoreChannelArray
+
+    nw = Network()
+    core = CoreChannelArray("Core", n=2, L=[2.0, 3.0], D=0.05, A=[0.1, 0.12], K=2.0, dz=2.0, Q=[1e7, 2e7],
+                            two_phase_friction=friction)
+    nw.add_component(core)
+    for i, (m, h) in enumerate([(50.0, 1.1e6), (40.0, 1.2e6)]):
+        src, sink = Source("Src%d" % i, m_dot=m, p=7e6, h=h), Sink("Sink%d" % i)
+        nw.add_component(src)
+        nw.add_component(sink)
+        nw.connect(src, "out", core, "in%d" % i, "a%d" % i, m_guess=m, p_guess=7e6, h_guess=h)
+        nw.connect(core, "out%d" % i, sink, "in", "b%d" % i, m_guess=m - 1.0, p_guess=6.9e6, h_guess=h + 3e5)
+    _assert_jacobian_matches_fd(nw)
+
+
+def test_turbine_pump_heater_are_fused():
+    from systems_th.codegen import residual_source
+    from systems_th.components import Heater, Pump, Turbine
+
+    nw = Network()
+    src = Source("Src", m_dot=50.0, p=7e6, h=2.8e6)
+    turb = Turbine("Turbine", eta_is=0.85, pr=0.5)
+    pump = Pump("Pump", dp=2e5, eta=0.8)
+    h1 = Heater("H1", dp=1e4, T_out=560.0)
+    h2 = Heater("H2", h_out=1.25e6)
+    sink = Sink("Sink")
+    for c in [src, turb, pump, h1, h2, sink]:
+        nw.add_component(c)
+    nw.connect(src, "out", turb, "in", "c1", m_guess=50.0, p_guess=7e6, h_guess=2.8e6)
+    nw.connect(turb, "out", pump, "in", "c2", m_guess=50.0, p_guess=3.5e6, h_guess=2.6e6)
+    nw.connect(pump, "out", h1, "in", "c3", m_guess=50.0, p_guess=3.7e6, h_guess=2.6e6)
+    nw.connect(h1, "out", h2, "in", "c4", m_guess=50.0, p_guess=3.69e6, h_guess=2.9e6)
+    nw.connect(h2, "out", sink, "in", "c5", m_guess=50.0, p_guess=3.69e6, h_guess=1.25e6)
+    nw.prepare()
+
+    _, namespace = residual_source(nw.components, nw._x)
+    assert not any(getattr(obj, "__name__", "") == "write_residuals" for obj in namespace.values())
+    fused = nw.evaluate_residuals().copy()
+    per_comp = nw.evaluate_residuals(nw.components).copy()
+    np.testing.assert_array_equal(fused, per_comp)
+
+
+@pytest.mark.parametrize("friction", ["homogeneous", "chisholm"])
+def test_pipe_and_core_fused_residuals_match_writes(friction):
+    from systems_th.codegen import residual_source
+    from systems_th.components import CoreChannel, Pipe
+
+    nw = Network()
+    src = Source("Src", m_dot=50.0, p=7e6, h=1.1e6)
+    pipe = Pipe("Pipe", L=5.0, D=0.2, dz=2.0, Q=2e6, K=1.0, two_phase_friction=friction, include_acceleration=False)
+    core = CoreChannel("Core", L=2.0, D=0.05, A=0.1, K=2.0, dz=2.0, two_phase_friction=friction)
+    core.set_exit_void_fraction(0.4, Q_guess_w=2e7)
+    core2 = CoreChannel("Core2", L=2.0, D=0.05, A=0.1, two_phase_friction=friction)
+    core2.set_power(1e6)
+    sink = Sink("Sink")
+    for c in [src, pipe, core, core2, sink]:
+        nw.add_component(c)
+    nw.connect(src, "out", pipe, "in", "c1", m_guess=50.0, p_guess=7e6, h_guess=1.1e6)
+    nw.connect(pipe, "out", core, "in", "c2", m_guess=49.0, p_guess=6.95e6, h_guess=1.15e6)
+    nw.connect(core, "out", core2, "in", "c3", m_guess=48.0, p_guess=6.9e6, h_guess=1.4e6)
+    nw.connect(core2, "out", sink, "in", "c4", m_guess=48.0, p_guess=6.85e6, h_guess=1.42e6)
+    nw.prepare()
+
+    src_code, namespace = residual_source(nw.components, nw._x)
+    assert not any(getattr(obj, "__name__", "") == "write_residuals" for obj in namespace.values())
+    assert ("state_ph(p_out, h_out)" in src_code) and src_code.count("alpha") == 1
+    fused = nw.evaluate_residuals().copy()
+    per_comp = nw.evaluate_residuals(nw.components).copy()
+    np.testing.assert_array_equal(fused, per_comp)
+
+
+def test_pipe_include_gravity_matches_dp_pipe():
+    from systems_th.components import Pipe
+    from systems_th.correlations.pressure_drop import dp_pipe
+
+    nw = Network()
+    src = Source("Src", m_dot=50.0, p=7e6, h=1.2e6)
+    pipe = Pipe("Pipe", L=5.0, D=0.2, dz=3.0, K=1.5, include_gravity=False)
+    sink = Sink("Sink")
+    for c in [src, pipe, sink]:
+        nw.add_component(c)
+    nw.connect(src, "out", pipe, "in", "c1", m_guess=50.0, p_guess=7e6, h_guess=1.2e6)
+    nw.connect(pipe, "out", sink, "in", "c2", m_guess=50.0, p_guess=6.9e6, h_guess=1.2e6)
+    nw.prepare()
+    res, basis = np.empty(3), np.zeros(3)
+    pipe.write_residuals(nw.props, res, basis)
+    dp = dp_pipe(50.0, 7e6, 1.2e6, 6.9e6, 1.2e6, nw.props, 5.0, 0.2, 1e-5, K=1.5, dz=3.0, include_gravity=False)
+    assert dp.dp_grav == 0.0
+    np.testing.assert_allclose(res[2], 1e5 - dp.total, rtol=1e-9)
+
+
+def test_solver_log_to_list_collects_verbose_lines(capsys):
+    from systems_th import SolveOptions
+
+    res = _build().solve(SolveOptions(verbose=True, log_to_list=True))
+    assert res.converged
+    assert capsys.readouterr().out == ""
+    assert any(line.startswith("[systems-th] iter 01:") for line in res.log_lines)
@@ -0,0 +1,60 @@
+import pytest
+pytest.importorskip("iapws")
+
+from systems_th.props import WaterIAPWS
+
+
+@pytest.fixture(scope="module")
+def tab():
+    return WaterIAPWS(sat_table=True, sat_table_points=512)
+
+
+def test_sat_table_matches_iapws(tab):
+    w = WaterIAPWS()
+    for p in (2e4, 1e5, 1.3e6, 7e6, 1.2e7):
+        for name in ("sat_h_l_v", "sat_rho_l_v", "sat_mu_l_v", "sat_k_l_v", "sat_cp_l_v"):
+            assert getattr(tab, name)(p) == pytest.approx(getattr(w, name)(p), rel=2e-4)
+        assert tab.T_sat_p(p) == pytest.approx(w.T_sat_p(p), rel=1e-5)
+        assert tab.sigma_sat_p(p) == pytest.approx(w.sigma_sat_p(p), rel=2e-4)
+
+
+def test_sat_table_exact_on_grid_and_outside(tab):
+    from systems_th.props.saturation import saturation_table
+
+    w = WaterIAPWS()
+    p_node = float(saturation_table(512).p[100])
+    # grid nodes reproduce the backend (up to its rounding of P to 1e-8 MPa)
+    assert tab.sat_h_l_v(p_node) == pytest.approx(w.sat_h_l_v(p_node), rel=1e-6)
+    assert tab.sat_h_l_v(21.5e6) == w.sat_h_l_v(21.5e6)
+
+
+def test_sat_lookup_kernel_matches_bundle(tab):
+    import numpy as np
+
+    from systems_th.props.saturation import SAT_FIELDS, sat_lookup, saturation_table
+
+    table = saturation_table(512)
+    out = np.zeros(len(SAT_FIELDS))
+    for p in (2e4, 1.3e6, 7e6):
+        assert sat_lookup(*table.arrays, p, out)
+        assert tuple(out) == pytest.approx(tuple(table.bundle(p)), rel=1e-14)
+    assert not sat_lookup(*table.arrays, 25e6, out)
+
+
+def test_saturation_table_is_persisted_to_the_cache_dir(tmp_path, monkeypatch):
+    import numpy as np
+
+    from systems_th.props import saturation
+
+    monkeypatch.setenv("SYSTEMS_TH_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(saturation, "_TABLES", {})
+    built = saturation.saturation_table(64)
+    assert len(list(tmp_path.glob("sat_table_64_*.npz"))) == 1
+
+    def no_build(*args, **kwargs):
+        raise AssertionError("table should come from the cache")
+
+    monkeypatch.setattr(saturation, "_TABLES", {})
+    monkeypatch.setattr(saturation.SaturationTable, "build", no_build)
+    loaded = saturation.saturation_table(64)
+    np.testing.assert_array_equal(loaded.arrays[1], built.arrays[1])
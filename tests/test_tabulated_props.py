@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+pytest.importorskip("iapws")
+pytest.importorskip("scipy")
+
+from systems_th.props import TabulatedWater, WaterIAPWS
+
+
+@pytest.fixture(scope="module")
+def tab():
+    return TabulatedWater(WaterIAPWS(), p_range=(1e6, 8e6), h_range=(3e5, 3.2e6), n_p=40, n_h=30)
+
+
+def test_tabulated_rho_matches_iapws(tab):
+    w = WaterIAPWS()
+    # compressed liquid, two-phase, superheated
+    for p, h in [(7e6, 8e5), (5e6, 1.5e6), (2e6, 2.0e6), (3e6, 3.1e6)]:
+        assert tab.rho_ph(p, h) == pytest.approx(w.rho_ph(p, h), rel=1e-4)
+
+
+def test_tabulated_h_px_matches_iapws(tab):
+    w = WaterIAPWS()
+    for p in (1.5e6, 4e6, 7.5e6):
+        for x in (0.0, 0.3, 1.0):
+            assert tab.h_px(p, x) == pytest.approx(w.h_px(p, x), rel=1e-5)
+
+
+def test_tabulated_outside_envelope_uses_backend(tab):
+    w = WaterIAPWS()
+    assert tab.rho_ph(2e7, 1e6) == w.rho_ph(2e7, 1e6)
+    assert tab.T_sat_p(5e6) == w.T_sat_p(5e6)
+
+
+def test_tabulated_partials_match_finite_difference(tab):
+    p, h = 7e6, 8e5
+    rho, dp, dh = tab.rho_ph_partials(p, h)
+    assert rho == pytest.approx(tab.rho_ph(p, h))
+    eps_p, eps_h = 1e2, 1e1
+    np.testing.assert_allclose(dp, (tab.rho_ph(p + eps_p, h) - tab.rho_ph(p - eps_p, h)) / (2 * eps_p), rtol=1e-4)
+    np.testing.assert_allclose(dh, (tab.rho_ph(p, h + eps_h) - tab.rho_ph(p, h - eps_h)) / (2 * eps_h), rtol=1e-4)
+
+
+def test_tabulated_state_matches_iapws(tab):
+    w = WaterIAPWS()
+    for p, h in [(7e6, 8e5), (5e6, 1.5e6), (2e6, 2.0e6), (3e6, 3.1e6)]:
+        got, ref = tab.state_ph(p, h), w.state_ph(p, h)
+        np.testing.assert_allclose(got, ref, rtol=1e-3, atol=1e-9)
+        assert tab.mu_ph(p, h) == got.mu
+        assert tab.quality_ph(p, h) == pytest.approx(w.quality_ph(p, h), abs=1e-6)
+        assert tab.void_fraction_ph(p, h) == pytest.approx(w.void_fraction_ph(p, h), abs=1e-5)
+    assert tab.state_ph(2e7, 1e6) == w.state_ph(2e7, 1e6)
+
+
+def test_tabulated_rho_vec_matches_scalar(tab):
+    p = np.array([[7e6, 5e6, 2e6, 3e6, 2e7]])
+    h = np.array([[8e5, 1.5e6, 2.0e6, 3.1e6, 1e6]])
+    got = tab.rho_ph_vec(p, h)
+    assert got.shape == p.shape
+    np.testing.assert_allclose(got[0], [tab.rho_ph(a, b) for a, b in zip(p[0], h[0])], rtol=1e-14)
+    assert tab.rho_ph_vec(7e6, 8e5) == pytest.approx(tab.rho_ph(7e6, 8e5), rel=1e-14)